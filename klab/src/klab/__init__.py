@@ -0,0 +1 @@
+from klab.sampler import sample
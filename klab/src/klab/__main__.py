@@ -0,0 +1,126 @@
+"""
+    | teleorithm |
+
+    $ python -m klab compare BASE HEAD
+    $ klab compare .klab/runs/one.json .klab/runs/two.json
+    $ klab importtime vbwise.load --baseline .klab/import-vbwise.json
+    $ klab report -o build/bench.html
+
+    exit status 1 when something got significantly slower
+        importtime -> the total import only, per module rows never fail
+    or a sweep fits a worse complexity model
+    or a counted block runs more python instructions
+"""
+import argparse
+import json
+import sys
+
+from klab import counting
+from klab import importtime
+from klab import report
+from klab import store
+from klab import sweep
+
+
+def compare(args):
+    base = store.find_run(args.base, args.dir)
+    head = store.find_run(args.head, args.dir)
+
+    rows = store.compare(base, head, args.alpha, args.threshold)
+    store.print_comparison(rows)
+
+    curves = sweep.compare_sweeps(base, head, args.tolerance, args.margin)
+    if curves:
+        print()
+        sweep.print_sweep_comparison(curves)
+
+    counts = counting.compare_counts(base, head)
+    if counts:
+        print()
+        counting.print_count_comparison(counts)
+
+    worse = [r for r in curves + counts if r['verdict'] == 'regression']
+    return 1 if store.regressed(rows) or worse else 0
+
+
+def import_time(args):
+    found = importtime.profile(args.module, args.repeat)
+    importtime.print_tree(found['tree'], args.limit)
+    run = importtime.to_run(found)
+
+    if args.save:
+        with open(args.save, 'wt') as w:
+            json.dump(run, w, indent=2)
+
+    if not args.baseline:
+        return 0
+
+    base = store.load_run(args.baseline)
+    print()
+    rows = store.compare(base, run, args.alpha, args.threshold)
+    store.print_comparison(rows)
+
+    changes = importtime.diff(base['imports'], run['imports'], args.threshold)
+    if changes:
+        print()
+        importtime.print_diff(changes)
+
+    # per module rows -> fastest of repeats, no test -> where to look only
+    return 1 if store.regressed(rows) else 0
+
+
+def write_report(args):
+    runs = report.load_runs(args.dir)
+    if not runs:
+        raise FileNotFoundError('no stored runs in', str(args.dir))
+    path = report.write_report(runs, args.output, args.title)
+    print(f'{len(runs)} runs -> {path}')
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='klab', description='tools for measuring code performance'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('compare', help='flag regressions between runs')
+    p.add_argument('base', help='run json or git ref')
+    p.add_argument('head', help='run json or git ref')
+    p.add_argument('--dir', default=store.STORE_DIR, help='stored runs')
+    p.add_argument('--alpha', type=float, default=0.05)
+    p.add_argument('--threshold', type=float, default=0.05,
+                   help='ignore median changes smaller than this fraction')
+    p.add_argument('--tolerance', type=float, default=0.25,
+                   help='sweep exponent growth allowed')
+    p.add_argument('--margin', type=float, default=3.0,
+                   help='residual ratio before a new best model counts')
+    p.set_defaults(func=compare)
+
+    p = commands.add_parser('importtime', help='profile importing a module')
+    p.add_argument('module', help='(eg) vbwise.load')
+    p.add_argument('--repeat', type=int, default=5)
+    p.add_argument('--limit', type=int, default=40, help='rows of tree')
+    p.add_argument('--save', help='write this run as json')
+    p.add_argument('--baseline', help='run json to diff against')
+    p.add_argument('--alpha', type=float, default=0.05)
+    p.add_argument('--threshold', type=float, default=0.2,
+                   help='relative growth worth flagging')
+    p.set_defaults(func=import_time)
+
+    p = commands.add_parser('report', help='stored runs as one html file')
+    p.add_argument('--dir', default=store.STORE_DIR, help='stored runs')
+    p.add_argument('-o', '--output', default='klab-report.html')
+    p.add_argument('--title', default='klab report')
+    p.set_defaults(func=write_report)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except (FileNotFoundError, ImportError) as e:
+        print(*e.args, file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
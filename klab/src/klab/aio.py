@@ -0,0 +1,237 @@
+"""
+    | teleorithm |
+
+    how long did this coroutine take -> not counting everybody else's turn
+
+    USAGE
+    ---------
+    async def refresh():
+        async with ameasure():
+            await fetch_items()
+            render(items)
+
+             212.4      time by python (ms)
+              31.2      time in task (ms)
+              29.9      cpu in task (ms)
+                84      task steps
+               512      loop iterations
+             1,040      callbacks
+              0.03      callback p50 (ms)
+              4.10      callback p99 (ms)
+                 1      slow callbacks
+                        112.3 ms  Task-7 pump_tk
+
+    OR
+
+    r = {}
+    async with ameasure(r):
+        pass
+    r -> {'t_python_ms': ..., 't_task_ms': ..., 'loop_iterations': ..., ...}
+    ---------
+    time by python -> wall time of the block, includes other tasks
+    time in task   -> only the steps of the task running the block
+                      (and tasks it creates inside, they copy its context)
+
+    every asyncio.Handle runs through Handle._run in its own context
+    -> Handle._run wrapped while any block is open, each callback timed
+    -> a ContextVar set inside the block marks the callbacks that are ours
+    loop._run_once wrapped on the running loop -> iterations counted
+
+    slow callbacks -> same idea as loop.set_debug(True) and
+    loop.slow_callback_duration, without turning on all of debug mode
+
+    entering the block yields once -> await sleep(0)
+    pure python event loops only (asyncio default) -> not uvloop
+    one loop at a time
+"""
+import sys
+from asyncio import events, get_running_loop, sleep, Task
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from time import perf_counter, process_time
+
+from klab.latency import Histogram
+
+
+_current = ContextVar('klab_aio', default=())
+_active = []
+_step = [0.0, 0.0]  # wall and cpu start of the callback running now
+_original_run = events.Handle._run
+
+
+def _describe(handle):
+    # task steps -> name the task and its coroutine, not the step wrapper
+    task = getattr(handle._callback, '__self__', None)
+    if isinstance(task, Task):
+        coro = task.get_coro()
+        return f'{task.get_name()} {getattr(coro, "__qualname__", coro)}'
+    return repr(handle)
+
+
+def _timed_run(handle):
+    start = _step[0] = perf_counter()
+    cpu = _step[1] = process_time()
+    try:
+        return _original_run(handle)
+    finally:
+        took = perf_counter() - start
+        cpu_took = process_time() - cpu
+        mine = handle._context.get(_current, ())
+        for state in _active:
+            state['callbacks'] += 1
+            state['histogram'].record(took * 1e9)
+            if state in mine:
+                state['t_task_ms'] += took * 1000
+                state['t_task_cpu_ms'] += cpu_took * 1000
+                state['task_steps'] += 1
+            if took * 1000 >= state['slow_ms']:
+                state['slow'].append({'callback': _describe(handle),
+                                      'ms': took * 1000})
+
+
+def _install(loop):
+    events.Handle._run = _timed_run
+
+    run_once = loop._run_once
+
+    def counted():
+        for state in _active:
+            state['loop_iterations'] += 1
+        return run_once()
+
+    loop._run_once = counted
+
+
+def _uninstall(loop):
+    events.Handle._run = _original_run
+    loop.__dict__.pop('_run_once', None)
+
+
+def print_record(r, stream=None):
+    """
+        r
+            : dict
+            : filled by ameasure
+    """
+    stream = stream or sys.stdout
+    print(f'{r["t_python_ms"]:>18,.1f}      time by python (ms)', file=stream)
+    print(f'{r["t_task_ms"]:>18,.1f}      time in task (ms)', file=stream)
+    print(f'{r["t_task_cpu_ms"]:>18,.1f}      cpu in task (ms)', file=stream)
+    print(f'{r["task_steps"]:>18,}      task steps', file=stream)
+    print(f'{r["loop_iterations"]:>18,}      loop iterations', file=stream)
+    print(f'{r["callbacks"]:>18,}      callbacks', file=stream)
+    print(f'{r["callback_p50_ms"]:>18,.2f}      callback p50 (ms)', file=stream)
+    print(f'{r["callback_p99_ms"]:>18,.2f}      callback p99 (ms)', file=stream)
+    if r['slow']:
+        print(f'{len(r["slow"]):>18,}      slow callbacks', file=stream)
+        for s in sorted(r['slow'], key=lambda s: s['ms'], reverse=True)[:10]:
+            print(f'{"":>18}      {s["ms"]:,.1f} ms  {s["callback"]}',
+                  file=stream)
+
+
+@asynccontextmanager
+async def ameasure(record=None, slow_ms=None):
+    """
+        record
+            : dict
+            : numbers added up, 'slow' extended, callback percentiles replaced
+            : if None results are printed instead
+
+        slow_ms
+            : float
+            : callbacks at least this long are listed
+            : default -> loop.slow_callback_duration, 100 ms
+
+        raises
+            ! RuntimeError outside a running event loop
+    """
+    loop = get_running_loop()
+    if slow_ms is None:
+        slow_ms = loop.slow_callback_duration * 1000
+
+    state = {
+        't_task_ms': 0.0,
+        't_task_cpu_ms': 0.0,
+        'task_steps': 0,
+        'loop_iterations': 0,
+        'callbacks': 0,
+        'histogram': Histogram(),
+        'slow': [],
+        'slow_ms': slow_ms,
+    }
+    if not _active:
+        _install(loop)
+    _active.append(state)
+    # yield once -> the block starts in a fresh, timed callback
+    await sleep(0)
+    token = _current.set(_current.get() + (state,))
+
+    try:
+        start = perf_counter()
+        yield  # code runs here
+    finally:
+        end = perf_counter()
+        # the callback leaving the block is still running -> its share by hand
+        state['t_task_ms'] += (end - _step[0]) * 1000
+        state['t_task_cpu_ms'] += (process_time() - _step[1]) * 1000
+        state['task_steps'] += 1
+        _current.reset(token)
+        _active.remove(state)
+        if not _active:
+            _uninstall(loop)
+
+        h = state['histogram']
+        found = {
+            't_python_ms': (end - start) * 1000,
+            't_task_ms': state['t_task_ms'],
+            't_task_cpu_ms': state['t_task_cpu_ms'],
+            'task_steps': state['task_steps'],
+            'loop_iterations': state['loop_iterations'],
+            'callbacks': state['callbacks'],
+            'callback_p50_ms': h.percentile(50) / 1e6,
+            'callback_p99_ms': h.percentile(99) / 1e6,
+            'slow': state['slow'],
+        }
+        if record is None:
+            print_record(found)
+        else:
+            for key in ('t_python_ms', 't_task_ms', 't_task_cpu_ms',
+                        'task_steps', 'loop_iterations', 'callbacks'):
+                record[key] = record.get(key, 0) + found[key]
+            record['callback_p50_ms'] = found['callback_p50_ms']
+            record['callback_p99_ms'] = found['callback_p99_ms']
+            record.setdefault('slow', []).extend(found['slow'])
+
+
+if __name__ == '__main__':
+    import asyncio
+    import time
+
+    def spin(ms):
+        end = perf_counter() + ms / 1000
+        while perf_counter() < end:
+            pass
+
+    async def neighbour():
+        # another task hogging the loop -> counted in wall time, not ours
+        for _ in range(5):
+            time.sleep(0.03)
+            await asyncio.sleep(0)
+        time.sleep(0.12)  # one slow callback
+
+    async def refresh(r):
+        async with ameasure(r, slow_ms=100):
+            for _ in range(10):
+                spin(2)
+                await asyncio.sleep(0)
+
+    async def main():
+        r = {}
+        await asyncio.gather(refresh(r), neighbour())
+        print_record(r)
+        assert r['t_python_ms'] > 150
+        assert 18 < r['t_task_ms'] < 40
+        assert r['slow'] and r['slow'][0]['ms'] >= 100
+        assert events.Handle._run is _original_run
+
+    asyncio.run(main())
@@ -0,0 +1,238 @@
+"""
+    | teleorithm |
+
+    how many python instructions? -> same answer every run
+
+    USAGE
+    ---------
+    with count():
+        load.gnml_string(source)
+
+           412,733      python instructions
+            98,120      lines
+             9,817      calls
+
+      instructions      lines    calls   function
+           118,204     27,330    2,104   visit (nodes.py:196)
+            ...
+
+    OR
+
+    r = {}
+    with count(r):
+        pass
+    store.add_counts(run, 'gnml_string', r)  # klab compare -> exact diff
+    ---------
+    sys.monitoring (python 3.12+) -> no perf, no perf_event_paranoid
+    INSTRUCTION, LINE and PY_START events counted per code object
+    wall time on a shared runner wobbles, these counts do not
+
+    same code path -> same counts, so pin PYTHONHASHSEED when
+    set or dict-of-str iteration order decides the path
+    slow while active -> a callback per bytecode, not for timing
+"""
+import contextlib
+import sys
+from collections import defaultdict
+from os.path import basename
+
+
+def _monitoring():
+    try:
+        return sys.monitoring
+    except AttributeError:
+        raise RuntimeError('instruction counting needs python 3.12+')
+
+
+def _claim(mon):
+    """ first free tool id, profiler slot preferred """
+    for tool in (mon.PROFILER_ID, 3, 4):
+        try:
+            mon.use_tool_id(tool, 'klab.counting')
+        except ValueError:
+            continue
+        return tool
+    raise RuntimeError('no free sys.monitoring tool id')
+
+
+def _label(code):
+    return f'{code.co_qualname} ({basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def summarize(per_code):
+    """
+        per_code
+            : dict
+            : code object -> [instructions, lines, calls]
+
+        returns
+            > dict
+            > 'function (file.py:line)' -> {'instructions', 'lines', 'calls'}
+    """
+    functions = {}
+    for code, (inst, lines, calls) in per_code.items():
+        # counting must not count itself
+        if code is _own_code or code.co_filename == contextlib.__file__:
+            continue
+        f = functions.setdefault(
+            _label(code), {'instructions': 0, 'lines': 0, 'calls': 0}
+        )
+        f['instructions'] += inst
+        f['lines'] += lines
+        f['calls'] += calls
+    return functions
+
+
+def totals(functions):
+    """
+        returns
+            > dict
+            > {'instructions', 'lines', 'calls'} summed over functions
+    """
+    out = {'instructions': 0, 'lines': 0, 'calls': 0}
+    for f in functions.values():
+        for key in out:
+            out[key] += f[key]
+    return out
+
+
+def print_counts(functions, n=20, stream=None):
+    """
+        functions
+            : dict
+            : from summarize
+    """
+    stream = stream or sys.stdout
+    t = totals(functions)
+    print(f'{t["instructions"]:>18,}      python instructions', file=stream)
+    print(f'{t["lines"]:>18,}      lines', file=stream)
+    print(f'{t["calls"]:>18,}      calls', file=stream)
+    print(file=stream)
+    print(f'{"instructions":>14}  {"lines":>9}  {"calls":>7}   function',
+          file=stream)
+    rows = sorted(functions.items(), key=lambda kv: kv[1]['instructions'],
+                  reverse=True)[:n]
+    for label, f in rows:
+        print(f'{f["instructions"]:>14,}  {f["lines"]:>9,}  {f["calls"]:>7,}'
+              f'   {label}', file=stream)
+
+
+@contextlib.contextmanager
+def count(record=None, n=20):
+    """
+        record
+            : dict
+            : gets 'functions' and 'instructions', 'lines', 'calls' added up
+            : if None results are printed instead
+
+        n
+            : int
+            : rows of the per function table when printing
+
+        raises
+            ! RuntimeError before python 3.12 or with no free tool id
+    """
+    mon = _monitoring()
+    E = mon.events
+    tool = _claim(mon)
+
+    per_code = defaultdict(lambda: [0, 0, 0])
+
+    def on_instruction(code, offset):
+        per_code[code][0] += 1
+
+    def on_line(code, line_number):
+        per_code[code][1] += 1
+
+    def on_start(code, offset):
+        per_code[code][2] += 1
+
+    callbacks = {
+        E.INSTRUCTION: on_instruction,
+        E.LINE: on_line,
+        E.PY_START: on_start,
+    }
+    for event, fn in callbacks.items():
+        mon.register_callback(tool, event, fn)
+    mon.set_events(tool, E.INSTRUCTION | E.LINE | E.PY_START)
+
+    try:
+        yield  # code runs here
+    finally:
+        mon.set_events(tool, E.NO_EVENTS)
+        for event in callbacks:
+            mon.register_callback(tool, event, None)
+        mon.free_tool_id(tool)
+
+        functions = summarize(per_code)
+        if record is None:
+            print_counts(functions, n)
+        else:
+            seen = record.setdefault('functions', {})
+            for label, f in functions.items():
+                s = seen.setdefault(
+                    label, {'instructions': 0, 'lines': 0, 'calls': 0}
+                )
+                for key in s:
+                    s[key] += f[key]
+            for key, value in totals(functions).items():
+                record[key] = record.get(key, 0) + value
+
+
+_own_code = count.__wrapped__.__code__
+
+
+def compare_counts(base, head):
+    """
+        base, head
+            : dict
+            : run records from klab.store -> their 'counts'
+
+        returns
+            > list[dict]
+            > {'name', 'base', 'head', 'change', 'verdict'} on instructions
+            > exact -> any growth is a regression
+    """
+    b_counts = base.get('counts', {})
+    h_counts = head.get('counts', {})
+    rows = []
+    for name in sorted(set(b_counts) & set(h_counts)):
+        b = b_counts[name]['instructions']
+        h = h_counts[name]['instructions']
+        verdict = 'same'
+        if h > b:
+            verdict = 'regression'
+        elif h < b:
+            verdict = 'improvement'
+        change = (h - b) / b if b else 0.0
+        rows.append(dict(name=name, base=b, head=h, change=change,
+                         verdict=verdict))
+    return rows
+
+
+def print_count_comparison(rows, stream=None):
+    """
+        rows
+            : list[dict]
+            : from compare_counts
+    """
+    stream = stream or sys.stdout
+    for r in rows:
+        flag = '' if r['verdict'] == 'same' else r['verdict'].upper()
+        print(f'{r["name"]}    {r["base"]:,} -> {r["head"]:,} instructions'
+              f'   {r["change"]:+.2%}   {flag}', file=stream)
+
+
+if __name__ == '__main__':
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    first, second = {}, {}
+    with count(first):
+        fib(15)
+    with count(second):
+        fib(15)
+
+    print_counts(first['functions'])
+    assert first == second  # deterministic
+    assert first['calls'] == 1973  # fib(15) -> 1973 calls
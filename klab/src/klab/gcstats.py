@@ -0,0 +1,198 @@
+"""
+    | teleorithm |
+
+    is the cyclic garbage collector stealing frames?
+
+    USAGE
+    ---------
+    with gc_stats():
+        app.update_state_and_refresh(new_state, ['items'])
+
+             212.4      time by python (ms)
+              18.9      gc pause total (ms)  8.9%
+                41      collections  gen0 37  gen1 3  gen2 1
+              0.21      pause p50 (ms)
+              0.48      pause p90 (ms)
+             11.02      pause p99 (ms)
+             11.02      pause max (ms)
+            25,310      objects collected
+           289,443      tracked objects, net growth (est)
+         1,362,740      net growth per second (est)
+
+    OR
+
+    r = {}
+    with gc_stats(r):
+        pass
+    r -> {'t_python_ms': ..., 'net_tracked': ..., 'pauses': [
+        {'generation': 0, 'ms': 0.21, 'collected': 0, 'uncollectable': 0},
+        ...
+    ]}
+    ---------
+    pauses come from gc.callbacks -> 'start' and 'stop' around each collection
+
+    net growth -> gc-tracked containers (dicts, lists, instances ...)
+    allocated minus freed, the count that triggers a gen0 collection
+    estimated as collections * threshold0 + change in gc.get_count()[0]
+    -> an approximation of the pressure on the collector
+       assumes every collection fired with the gen0 count at threshold0
+       an explicit gc.collect() resets it sooner -> counted as threshold0
+       anyway, so blocks that call gc.collect() overcount
+    -> not an allocation count, code that allocates and frees in step
+       shows ~0 -> tracemalloc or klab.leaks for how much is allocated
+"""
+import gc
+from contextlib import contextmanager
+from math import ceil
+from time import perf_counter, perf_counter_ns
+
+
+def percentile(values, p):
+    """
+        values
+            : list[float]
+
+        p
+            : float
+            : 0 to 100
+
+        returns
+            > float
+            > nearest rank, 0.0 for no values
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = ceil(p / 100 * len(ordered)) - 1
+    return ordered[max(0, min(len(ordered) - 1, rank))]
+
+
+def summary(record):
+    """
+        record
+            : dict
+            : filled by gc_stats
+
+        returns
+            > dict
+            > pause percentiles, pause share of block time, net growth rate
+    """
+    ms = [p['ms'] for p in record['pauses']]
+    total = sum(ms)
+    t = record['t_python_ms']
+    per_gen = [0, 0, 0]
+    for p in record['pauses']:
+        per_gen[p['generation']] += 1
+    return {
+        't_python_ms': t,
+        'pause_total_ms': total,
+        'pause_share': total / t if t else 0.0,
+        'collections': len(ms),
+        'per_generation': per_gen,
+        'p50_ms': percentile(ms, 50),
+        'p90_ms': percentile(ms, 90),
+        'p99_ms': percentile(ms, 99),
+        'max_ms': max(ms, default=0.0),
+        'collected': sum(p['collected'] for p in record['pauses']),
+        'uncollectable': sum(p['uncollectable'] for p in record['pauses']),
+        'net_tracked': record['net_tracked'],
+        'net_tracked_per_s': record['net_tracked'] / t * 1000 if t else 0.0,
+    }
+
+
+def print_summary(s):
+    """
+        s
+            : dict
+            : from summary
+    """
+    gens = '  '.join(f'gen{i} {n}' for i, n in enumerate(s['per_generation']))
+    print(f'{s["t_python_ms"]:>18,.1f}      time by python (ms)')
+    print(f'{s["pause_total_ms"]:>18,.1f}      gc pause total (ms)'
+          f'  {s["pause_share"]:.1%}')
+    print(f'{s["collections"]:>18,}      collections  {gens}')
+    print(f'{s["p50_ms"]:>18,.2f}      pause p50 (ms)')
+    print(f'{s["p90_ms"]:>18,.2f}      pause p90 (ms)')
+    print(f'{s["p99_ms"]:>18,.2f}      pause p99 (ms)')
+    print(f'{s["max_ms"]:>18,.2f}      pause max (ms)')
+    print(f'{s["collected"]:>18,}      objects collected')
+    if s['uncollectable']:
+        print(f'{s["uncollectable"]:>18,}      uncollectable')
+    print(f'{s["net_tracked"]:>18,}      tracked objects, net growth (est)')
+    print(f'{s["net_tracked_per_s"]:>18,.0f}      net growth per second (est)')
+
+
+@contextmanager
+def gc_stats(record=None):
+    """
+        record
+            : dict
+            : 'pauses' extended, 't_python_ms' and 'net_tracked' added up
+            : if None a summary is printed instead
+
+        time spent inside the block is reported next to gc pauses
+        so pause share is pause ms / block ms
+    """
+    pauses = []
+    started = [0]
+
+    def on_gc(phase, info):
+        if phase == 'start':
+            started[0] = perf_counter_ns()
+        else:
+            pauses.append({
+                'generation': info['generation'],
+                'ms': (perf_counter_ns() - started[0]) / 1e6,
+                'collected': info['collected'],
+                'uncollectable': info['uncollectable'],
+            })
+
+    threshold0 = gc.get_threshold()[0]
+    count0 = gc.get_count()[0]
+    gc.callbacks.append(on_gc)
+    try:
+        start = perf_counter()
+        yield  # code runs here
+    finally:
+        end = perf_counter()
+        gc.callbacks.remove(on_gc)
+
+        # any collection resets the gen0 count -> each assumed to fire at
+        # threshold0, gc.collect() included -> an estimate, not a count
+        gen0_runs = len(pauses)
+        net_tracked = max(gen0_runs * threshold0 + gc.get_count()[0] - count0, 0)
+        t_python_ms = (end - start) * 1000
+
+        if record is None:
+            print_summary(summary({
+                't_python_ms': t_python_ms,
+                'net_tracked': net_tracked,
+                'pauses': pauses,
+            }))
+        else:
+            record.setdefault('pauses', []).extend(pauses)
+            record['t_python_ms'] = record.get('t_python_ms', 0) + t_python_ms
+            record['net_tracked'] = record.get('net_tracked', 0) + net_tracked
+
+
+if __name__ == '__main__':
+    def widget_tree(depth):
+        # cyclic like a Tk widget with .master and .children
+        node = {'props': {'config': {}, 'grid': {}, 'pack': {}}, 'parts': {}}
+        if depth:
+            for i in range(4):
+                part = widget_tree(depth - 1)
+                part['master'] = node
+                node['parts'][i] = part
+        return node
+
+    with gc_stats():
+        for _ in range(50):
+            widget_tree(5)
+
+    r = {}
+    with gc_stats(r):
+        for _ in range(50):
+            widget_tree(5)
+    s = summary(r)
+    assert s['collections'] > 0 and s['net_tracked'] > 0
@@ -0,0 +1,269 @@
+"""
+    | teleorithm |
+
+    what does it cost to import this?
+
+    USAGE
+    ---------
+    $ python -m klab importtime vbwise.load --save .klab/import-vbwise.json
+    $ python -m klab importtime vbwise.load --baseline .klab/import-vbwise.json
+
+      cumulative ms   self ms   module
+             48.210     0.402   vbwise.load
+             31.877     0.512     vbwise.tkmlgrammar
+             30.104     1.307       vbwise.igrammar
+             28.640     2.018         parsimonious.grammar
+                ...
+
+    OR
+
+    found = profile('vbwise.load', repeat=5)
+    print_tree(found['tree'])
+    ---------
+    python -X importtime writes one stderr line per module, children first
+
+    import time: self [us] | cumulative | imported package
+    import time:       123 |        456 |   encodings
+
+    fresh interpreter per repeat, fastest of the repeats kept per module
+    saved as a klab.store run -> 'import/<module>' samples
+    so klab compare catches import regressions like runtime ones
+    diff per module -> fastest of repeats, no significance test
+        identical code flags a dozen modules by noise alone
+        -> a hint where the time went, only the total's welch test fails
+"""
+import sys
+from subprocess import run as _run, PIPE
+
+from klab import store
+
+
+def parse(text):
+    """
+        text
+            : str
+            : stderr of python -X importtime
+
+        returns
+            > list[dict]
+            > root imports in order ->
+            > {'name', 'self_us', 'cumulative_us', 'children': [...]}
+    """
+    pending = []  # (depth, node) still looking for a parent
+    for line in text.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        name = name.rstrip()
+        stripped = name.lstrip(' ')
+        depth = (len(name) - len(stripped) - 1) // 2
+
+        node = {
+            'name': stripped,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'children': [],
+        }
+        # deeper entries printed just before this one are its children
+        while pending and pending[-1][0] > depth:
+            node['children'].insert(0, pending.pop()[1])
+        pending.append((depth, node))
+
+    return [node for _, node in pending]
+
+
+def _merge_fastest(a, b):
+    """ keep the fastest timing per module name -> in place on a """
+    for name, t in b.items():
+        if name in a:
+            a[name]['self_us'] = min(a[name]['self_us'], t['self_us'])
+            a[name]['cumulative_us'] = min(a[name]['cumulative_us'],
+                                           t['cumulative_us'])
+        else:
+            a[name] = dict(t)
+
+
+def flatten(roots):
+    """
+        roots
+            : list[dict]
+            : from parse
+
+        returns
+            > dict
+            > name -> {'self_us', 'cumulative_us'}
+
+        a name can show up twice -> (eg) parsimonious.grammar
+        wraps the import of parsimonious that imports parsimonious.grammar
+        self times add up, outermost cumulative wins
+    """
+    flat = {}
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        seen = flat.setdefault(node['name'], {'self_us': 0, 'cumulative_us': 0})
+        seen['self_us'] += node['self_us']
+        seen['cumulative_us'] = max(seen['cumulative_us'], node['cumulative_us'])
+        stack.extend(node['children'])
+    return flat
+
+
+def _importtime(python, code):
+    out = _run([python, '-X', 'importtime', '-c', code],
+               stdout=PIPE, stderr=PIPE, text=True)
+    if out.returncode != 0:
+        raise ImportError(out.stderr.strip().splitlines()[-1], code)
+    return parse(out.stderr)
+
+
+def profile(module, repeat=5, python=sys.executable):
+    """
+        module
+            : str
+            : (eg) 'vbwise.load'
+
+        repeat
+            : int
+            : fresh interpreters timed, after one untimed warm-up for .pyc
+
+        returns
+            > dict
+            > {'module', 'tree', 'totals_ms', 'imports'}
+            > tree -> roots of the fastest run
+            > totals_ms -> cost of the import statement, one per repeat
+            > imports -> fastest self and cumulative per module name
+
+        raises
+            ! ImportError
+
+        interpreter startup imports (site, encodings ...) are left out
+    """
+    startup = {r['name'] for r in _importtime(python, 'pass')}
+
+    runs = []
+    for i in range(repeat + 1):
+        roots = _importtime(python, f'import {module}')
+        if i > 0:
+            runs.append([r for r in roots if r['name'] not in startup])
+
+    totals = [sum(r['cumulative_us'] for r in roots) / 1000 for roots in runs]
+    best = {}
+    for roots in runs:
+        _merge_fastest(best, flatten(roots))
+
+    return {
+        'module': module,
+        'tree': runs[totals.index(min(totals))],
+        'totals_ms': totals,
+        'imports': best,
+    }
+
+
+def to_run(found):
+    """
+        found
+            : dict
+            : from profile
+
+        returns
+            > dict
+            > klab.store run -> 'import/<module>' samples in ms
+            > plus 'imports' -> fastest flat timings per module
+    """
+    run = store.new_run()
+    store.add_samples(run, f'import/{found["module"]}', found['totals_ms'])
+    run['imports'] = found['imports']
+    return run
+
+
+def print_tree(roots, limit=40, min_us=100, stream=None):
+    """
+        roots
+            : list[dict]
+            : from parse
+
+        limit
+            : int
+            : rows printed
+
+        min_us
+            : int
+            : subtrees cheaper than this are left out
+    """
+    stream = stream or sys.stdout
+    print(f'{"cumulative ms":>15}  {"self ms":>8}   module', file=stream)
+
+    rows = 0
+    stack = [(0, r) for r in sorted(roots, key=lambda r: r['cumulative_us'])]
+    while stack and rows < limit:
+        depth, node = stack.pop()
+        if node['cumulative_us'] < min_us:
+            continue
+        print(f'{node["cumulative_us"] / 1000:>15.3f}'
+              f'  {node["self_us"] / 1000:>8.3f}'
+              f'   {"  " * depth}{node["name"]}', file=stream)
+        rows += 1
+        children = sorted(node['children'], key=lambda c: c['cumulative_us'])
+        stack.extend((depth + 1, c) for c in children)
+
+
+def diff(base, head, threshold=0.2, min_us=500):
+    """
+        base, head
+            : dict
+            : flat timings -> (eg) run['imports']
+
+        threshold
+            : float
+            : relative growth of cumulative time worth flagging
+
+        min_us
+            : int
+            : growth smaller than this in absolute terms is noise
+
+        returns
+            > list[dict]
+            > {'name', 'base_us', 'head_us', 'verdict'} sorted by growth
+            > verdict in 'slower', 'faster', 'added', 'removed'
+            > one sample a side -> not a significance test, see store.compare
+    """
+    rows = []
+    for name in set(base) | set(head):
+        b = base.get(name, {}).get('cumulative_us')
+        h = head.get(name, {}).get('cumulative_us')
+        if b is None:
+            verdict = 'added'
+        elif h is None:
+            verdict = 'removed'
+        elif h - b > min_us and h > b * (1 + threshold):
+            verdict = 'slower'
+        elif b - h > min_us and b > h * (1 + threshold):
+            verdict = 'faster'
+        else:
+            continue
+        if verdict in ('added', 'removed') and (b or h) < min_us:
+            continue
+        rows.append(dict(name=name, base_us=b, head_us=h, verdict=verdict))
+
+    return sorted(rows, key=lambda r: (r['head_us'] or 0) - (r['base_us'] or 0),
+                  reverse=True)
+
+
+def print_diff(rows, stream=None):
+    """
+        rows
+            : list[dict]
+            : from diff
+    """
+    stream = stream or sys.stdout
+    print(f'{"base ms":>10}  {"head ms":>10}   module', file=stream)
+    for r in rows:
+        b = f'{r["base_us"] / 1000:>10.3f}' if r['base_us'] is not None else f'{"-":>10}'
+        h = f'{r["head_us"] / 1000:>10.3f}' if r['head_us'] is not None else f'{"-":>10}'
+        print(f'{b}  {h}   {r["name"]}   {r["verdict"].upper()}', file=stream)
+
+
+if __name__ == '__main__':
+    found = profile('json', repeat=3)
+    print_tree(found['tree'], min_us=0)
+    assert 'json' in found['imports']
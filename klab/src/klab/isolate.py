@@ -0,0 +1,184 @@
+"""
+    | teleorithm |
+
+    one benchmark case -> one fresh python process -> one pinned core
+
+    ru_maxrss only ever grows inside a process
+    so peak memory is honest only for the first block of a script
+    fresh interpreter per case -> every case starts from the same floor
+
+    USAGE
+    ---------
+    cases = {
+        'insert/algo_ll': (insert_algo_ll, 1_000_000),
+        'insert/deque_ll': (insert_deque_ll, 1_000_000),
+    }
+    for r in isolated(cases, repeat=3):
+        print(r)  # streamed back as each process finishes
+
+    {'name': 'insert/deque_ll', 'core': 2, 'pid': 4242,
+     't_python_ms': 151.3, 'peak_mem_MiB': 21, 'error': None}
+    ---------
+    case functions must be importable -> defined at module level
+    scripts need the if __name__ == '__main__' guard -> spawn re-imports them
+
+    cases run in parallel, one per spare core
+    spare -> usable cores minus one left for the parent
+"""
+import gc
+import multiprocessing as mp
+import os
+import traceback
+from queue import Empty
+from resource import getrusage, RUSAGE_SELF
+from time import perf_counter
+
+from klab import store
+
+
+def spare_cores():
+    """
+        returns
+            > list[int]
+            > cores this process may use, minus one kept for the parent
+    """
+    try:
+        cores = sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = list(range(os.cpu_count() or 1))
+
+    return cores[1:] if len(cores) > 1 else cores
+
+
+def _child(name, fn, args, core, results):
+    """ runs inside the fresh process """
+    try:
+        os.sched_setaffinity(0, {core})
+    except (AttributeError, OSError):
+        pass  # not linux -> unpinned but still isolated
+
+    record = {'name': name, 'core': core, 'pid': os.getpid(),
+              't_python_ms': None, 'peak_mem_MiB': None, 'error': None}
+    try:
+        gc.collect()
+        start = perf_counter()
+        fn(*args)
+        end = perf_counter()
+    except BaseException:
+        record['error'] = traceback.format_exc()
+    else:
+        stats = getrusage(RUSAGE_SELF)
+        record['t_python_ms'] = (end - start) * 1000
+        # maxrss -> kilobytes, see man 2 getrusage
+        record['peak_mem_MiB'] = int(stats.ru_maxrss / 1024)
+
+    results.put(record)
+
+
+def isolated(cases, repeat=1, cores=None):
+    """
+        cases
+            : dict
+            : name -> callable or (callable, *args)
+
+        repeat
+            : int
+            : fresh process per repetition
+
+        cores
+            : list[int]
+            : defaults to spare_cores()
+
+        yields
+            -> dict
+            -> {'name', 'core', 'pid', 't_python_ms', 'peak_mem_MiB', 'error'}
+            -> in order of completion, not submission
+    """
+    ctx = mp.get_context('spawn')
+    results = ctx.Queue()
+    free = list(cores or spare_cores())
+
+    pending = []
+    for _ in range(repeat):
+        for name, case in cases.items():
+            fn, *args = case if isinstance(case, tuple) else (case,)
+            pending.append((name, fn, args))
+    pending.reverse()  # pop from the end in submission order
+
+    running = {}  # core -> (process, name)
+    while pending or running:
+        while pending and free:
+            core = free.pop()
+            name, fn, args = pending.pop()
+            p = ctx.Process(target=_child, args=(name, fn, args, core, results))
+            p.start()
+            running[core] = (p, name)
+
+        try:
+            record = results.get(timeout=0.1)
+        except Empty:
+            # a child that died hard never reports -> report for it
+            for core, (p, name) in list(running.items()):
+                if not p.is_alive() and p.exitcode != 0:
+                    p.join()
+                    del running[core]
+                    free.append(core)
+                    yield {'name': name, 'core': core, 'pid': p.pid,
+                           't_python_ms': None, 'peak_mem_MiB': None,
+                           'error': f'exit code {p.exitcode}'}
+            continue
+
+        p, _ = running.pop(record['core'])
+        p.join()
+        free.append(record['core'])
+        yield record
+
+
+def bench_isolated(run, cases, repeat=5, cores=None):
+    """
+        run
+            : dict
+            : from klab.store.new_run
+
+        cases
+            : dict
+            : as for isolated
+
+        returns
+            > list[dict]
+            > records with errors -> samples for those are left out
+
+        adds 't_python_ms' samples per case to the run
+        and 'peak_mem_MiB' samples alongside them
+    """
+    failed = []
+    for r in isolated(cases, repeat, cores):
+        if r['error']:
+            failed.append(r)
+            continue
+        store.add_samples(run, r['name'], [r['t_python_ms']])
+        entry = run['benchmarks'][r['name']]
+        entry.setdefault('peak_mem_MiB', []).append(r['peak_mem_MiB'])
+
+    return failed
+
+
+def _allocate(n):
+    blob = [0] * n
+    return len(blob)
+
+
+if __name__ == '__main__':
+    from pprint import pprint as P
+
+    cases = {
+        'small': (_allocate, 1_000),
+        'large': (_allocate, 20_000_000),  # ~150 MiB of list
+    }
+    # small runs after large in a fresh process -> peak memory stays small
+    records = sorted(isolated(cases, repeat=2), key=lambda r: r['name'])
+    P(records)
+
+    small = [r['peak_mem_MiB'] for r in records if r['name'] == 'small']
+    large = [r['peak_mem_MiB'] for r in records if r['name'] == 'large']
+    assert max(small) < min(large)
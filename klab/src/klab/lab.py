@@ -27,6 +27,14 @@
         't_perf_ms': 19.540853,
         't_python_ms': 0.01811981201171875
     }
+
+    OR -> time and memory only, perf not needed
+
+    with measure():
+        pass  # your code here
+
+               0.1      time by python (ms)
+                13      peak memory (MiB)
     ---------
     t_perf_ms offset from ~200ms sleep to hope for perf startup
 
@@ -45,7 +53,7 @@ from pprint import pprint as P
 from resource import getrusage, RUSAGE_SELF
 from signal import SIGINT
 from subprocess import Popen, PIPE, STDOUT, TimeoutExpired
-from time import sleep, time
+from time import perf_counter, sleep, time
 
 
 @contextmanager
@@ -119,6 +127,35 @@ def cpu_stats(record=None):
                 record['peak_mem_MiB'] += peak_RAM
 
 
+@contextmanager
+def measure(record=None):
+    """
+        record
+            : dict
+            : template whose values get modified
+            : if None results are printed instead
+
+        reports time and max memory -> no perf required
+    """
+    try:
+        start = perf_counter()
+        yield  # code runs here
+    finally:
+        end = perf_counter()
+        stats = getrusage(RUSAGE_SELF)
+
+        # maxrss -> kilobytes, see man 2 getrusage
+        peak_RAM = int(stats.ru_maxrss / 1024)  # mebibytes
+        t_python_ms = (end - start) * 1000
+
+        if record is None:
+            print(f'{t_python_ms:>18,.1f}      time by python (ms)')
+            print(f'{peak_RAM:>18,}      peak memory (MiB)')
+        else:
+            record['t_python_ms'] += t_python_ms
+            record['peak_mem_MiB'] += peak_RAM
+
+
 def new_template():
     return {
         't_perf_ms': -160,  # offset due to 0.2 s delay perf startup
@@ -0,0 +1,220 @@
+"""
+    | teleorithm |
+
+    does memory keep growing when the same thing runs again and again?
+
+    USAGE
+    ---------
+    found = leaks(lambda: app.update_state_and_refresh({'items': items}, ['items']))
+    print_leaks(found)
+
+               200      iterations
+           412,880      traced bytes grown
+           2,064.4      bytes per iteration  r2 0.99
+           LEAKING      -> grows linearly with iterations
+
+      bytes grown   blocks   per iter   site
+          311,200    4,000    1,556.0   wisp22.py:231
+           ...
+
+    OR in a Spec
+
+    self.no_leak(lambda: app.update_state_and_refresh(state, ['items']))
+    ---------
+    warm-up calls first -> caches, interned strings and lazy imports settle
+    gc.collect() then a tracemalloc snapshot every iterations / snapshots calls
+    least squares line through (iteration, traced bytes)
+    the curve's own points go in arrays sized before the first snapshot
+    -> the detector never shows up among the growing sites
+
+    leaking ->
+        slope above min_bytes (noise, free lists)
+        r2 above min_r2 (a straight line, not a step)
+        second half still growing (not a cache filling up)
+"""
+import gc
+import sys
+import tracemalloc
+from array import array
+from fnmatch import fnmatch
+from itertools import repeat
+from statistics import fmean
+
+
+_MACHINERY = tracemalloc.Filter(False, tracemalloc.__file__)
+
+
+def _traced(snapshot):
+    # earlier snapshots stay alive while later ones are taken -> not fn's
+    return snapshot.filter_traces([_MACHINERY])
+
+
+def trend(xs, ys):
+    """
+        xs, ys
+            : list[float]
+            : same length, at least 2 entries
+
+        returns
+            > tuple[float, float]
+            > slope, r2 of the least squares line
+    """
+    mx, my = fmean(xs), fmean(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    syy = sum((y - my) ** 2 for y in ys)
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    slope = sxy / sxx if sxx else 0.0
+    r2 = sxy * sxy / (sxx * syy) if sxx and syy else 0.0
+    return slope, r2
+
+
+def leaks(fn, iterations=200, snapshots=10, warmup=5, frames=1, top=10,
+          min_bytes=64, min_r2=0.9):
+    """
+        fn
+            : callable
+            : no arguments, run iterations times
+
+        snapshots
+            : int
+            : points on the growth curve, first one before any timed call
+
+        frames
+            : int
+            : traceback depth per allocation -> 1 is cheapest
+
+        top
+            : int
+            : growing sites kept
+
+        min_bytes
+            : float
+            : slope in bytes per iteration below this is not a leak
+
+        min_r2
+            : float
+            : how straight the line must be
+
+        returns
+            > dict
+            > {'iterations', 'at', 'bytes', 'slope', 'r2', 'leaking', 'sites'}
+            > sites -> {'site', 'size_diff', 'count_diff', 'per_iteration'}
+    """
+    for _ in range(warmup):
+        fn()
+
+    every = max(iterations // snapshots, 1)
+    batches = [every] * (iterations // every)
+    if iterations % every:
+        batches.append(iterations % every)
+    at = array('q', bytes(8 * (len(batches) + 1)))
+    sizes = array('q', bytes(8 * (len(batches) + 1)))
+    calls = enumerate(batches, 1)  # made before the first snapshot
+    fnmatch('', _MACHINERY.filename_pattern)  # pattern compiled and cached now
+
+    traced = tracemalloc.is_tracing()
+    if not traced:
+        tracemalloc.start(frames)
+    try:
+        gc.collect()
+        first = last = _traced(tracemalloc.take_snapshot())
+        sizes[0] = sum(s.size for s in first.statistics('filename'))
+        for k, batch in calls:
+            for _ in repeat(None, batch):
+                fn()
+            gc.collect()
+            last = _traced(tracemalloc.take_snapshot())
+            at[k] = at[k - 1] + batch
+            sizes[k] = sum(s.size for s in last.statistics('filename'))
+    finally:
+        if not traced:
+            tracemalloc.stop()
+    at, sizes = at.tolist(), sizes.tolist()
+
+    slope, r2 = trend(at, sizes)
+    half = len(at) // 2
+    late_slope, _ = trend(at[half:], sizes[half:])
+
+    leaking = slope > min_bytes and r2 > min_r2 and late_slope > slope / 2
+
+    sites = []
+    for diff in last.compare_to(first, 'lineno')[:top * 2]:
+        if diff.size_diff <= 0:
+            continue
+        frame = diff.traceback[0]
+        sites.append({
+            'site': f'{frame.filename}:{frame.lineno}',
+            'size_diff': diff.size_diff,
+            'count_diff': diff.count_diff,
+            'per_iteration': diff.size_diff / iterations,
+        })
+    sites = sites[:top]
+
+    return {
+        'iterations': iterations,
+        'at': at,
+        'bytes': sizes,
+        'slope': slope,
+        'r2': r2,
+        'leaking': leaking,
+        'sites': sites,
+    }
+
+
+def print_leaks(found, stream=None):
+    """
+        found
+            : dict
+            : from leaks
+    """
+    stream = stream or sys.stdout
+    grown = found['bytes'][-1] - found['bytes'][0]
+    print(f'{found["iterations"]:>18,}      iterations', file=stream)
+    print(f'{grown:>18,}      traced bytes grown', file=stream)
+    print(f'{found["slope"]:>18,.1f}      bytes per iteration'
+          f'  r2 {found["r2"]:.2f}', file=stream)
+    if found['leaking']:
+        print(f'{"LEAKING":>18}      -> grows linearly with iterations',
+              file=stream)
+    if not found['sites']:
+        return
+    print(file=stream)
+    print(f'{"bytes grown":>13}  {"blocks":>7}  {"per iter":>9}   site',
+          file=stream)
+    for s in found['sites']:
+        print(f'{s["size_diff"]:>13,}  {s["count_diff"]:>7,}'
+              f'  {s["per_iteration"]:>9,.1f}   {s["site"]}', file=stream)
+
+
+if __name__ == '__main__':
+    kept = []
+
+    def refresh_leaky():
+        # like appending to bindings_map on every refresh
+        kept.append([object() for _ in range(10)])
+
+    cache = {}
+
+    def refresh_cached():
+        # fills up to 50 keys then stays flat
+        cache[len(cache) % 50] = [object() for _ in range(10)]
+
+    def refresh_clean():
+        return [object() for _ in range(10)]
+
+    found = leaks(refresh_leaky)
+    print_leaks(found)
+    assert found['leaking']
+    line = refresh_leaky.__code__.co_firstlineno + 2
+    assert found['sites'][0]['site'].endswith(f'leaks.py:{line}')
+
+    print()
+    found = leaks(refresh_cached, warmup=0)
+    print_leaks(found)
+    assert not found['leaking']
+
+    print()
+    found = leaks(refresh_clean)
+    print_leaks(found)
+    assert not found['leaking']
+    assert not found['sites']  # nothing grows, not even the detector
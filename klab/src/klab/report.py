@@ -0,0 +1,356 @@
+"""
+    | teleorithm |
+
+    stored runs -> one html file, no server, no scripts, no network
+
+    USAGE
+    ---------
+    $ klab report                       # .klab/runs -> klab-report.html
+    $ klab report --dir ci/runs -o build/bench.html
+
+    OR
+
+    runs = load_runs('.klab/runs')
+    write_report(runs, 'klab-report.html')
+    ---------
+    trends -> median per benchmark, one point per commit (newest run wins)
+              min to max of the samples drawn as a band
+    implementations -> names split on the last '/'
+              insert/algo_ll, insert/deque_ll -> group insert, one column each
+              fastest median per group marked
+    sweeps -> measured points on log-log axes, fitted model as a curve
+
+    plots are inline svg -> archive the file as a build artifact
+"""
+from html import escape
+from math import log10
+from pathlib import Path
+from statistics import median
+
+from klab import store
+from klab import sweep
+
+
+WIDTH = 560
+HEIGHT = 220
+PAD = 44
+
+STYLE = '''
+body { font: 14px/1.4 system-ui, sans-serif; margin: 2em auto; max-width: 1200px;
+       color: #222; }
+h1, h2 { font-weight: 500; }
+h3 { font-weight: 500; margin: 1.2em 0 0.2em; font-family: monospace; }
+.grid { display: flex; flex-wrap: wrap; gap: 1.5em; }
+table { border-collapse: collapse; margin: 0.5em 0 1.5em; }
+th, td { padding: 0.25em 0.8em; text-align: right; border-bottom: 1px solid #ddd; }
+th:first-child, td:first-child { text-align: left; font-family: monospace; }
+td.best { font-weight: 600; color: #1a7f37; }
+.meta { color: #666; font-size: 12px; }
+svg text { font: 11px monospace; fill: #555; }
+'''
+
+
+def load_runs(directory=store.STORE_DIR):
+    """
+        directory
+            : str or Path
+            : stored runs from klab.store.save_run
+
+        returns
+            > list[dict]
+            > oldest first
+    """
+    runs = [store.load_run(p) for p in Path(directory).glob('*.json')]
+    return sorted(runs, key=lambda r: r['created'])
+
+
+def per_commit(runs):
+    """
+        runs
+            : list[dict]
+            : oldest first
+
+        returns
+            > list[dict]
+            > newest run of each commit, in order of each commit's first run
+    """
+    newest = {}
+    for run in runs:
+        commit = run['git']['commit'] or run['created']
+        newest[commit] = run  # later run replaces, dict keeps first position
+    return list(newest.values())
+
+
+def _label(run):
+    commit = run['git']['commit']
+    return commit[:7] if commit else run['created']
+
+
+def _scale(lo, hi, a, b, logged=False):
+    """ maps [lo, hi] onto [a, b] -> linear or log10 """
+    if logged:
+        lo, hi = log10(lo), log10(hi)
+    span = (hi - lo) or 1.0
+
+    def to(v):
+        if logged:
+            v = log10(v)
+        return a + (v - lo) / span * (b - a)
+
+    return to
+
+
+def _frame(title_y, x_labels, y_lo, y_hi):
+    """ svg opening, axes and min/max labels """
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}"'
+        f' height="{HEIGHT}" viewBox="0 0 {WIDTH} {HEIGHT}">',
+        f'<line x1="{PAD}" y1="{HEIGHT - PAD}" x2="{WIDTH - 10}"'
+        f' y2="{HEIGHT - PAD}" stroke="#999"/>',
+        f'<line x1="{PAD}" y1="10" x2="{PAD}" y2="{HEIGHT - PAD}" stroke="#999"/>',
+        f'<text x="4" y="14">{escape(title_y)}</text>',
+        f'<text x="4" y="{HEIGHT - PAD}">{y_lo:.3g}</text>',
+        f'<text x="4" y="26">{y_hi:.3g}</text>',
+    ]
+    for x, text in x_labels:
+        out.append(f'<text x="{x:.1f}" y="{HEIGHT - PAD + 16}"'
+                   f' text-anchor="middle">{escape(text)}</text>')
+    return out
+
+
+def trend_svg(points):
+    """
+        points
+            : list[tuple]
+            : (label, median, low, high) oldest first
+
+        returns
+            > str
+            > svg with a band from low to high and a line through medians
+    """
+    lows = [p[2] for p in points]
+    highs = [p[3] for p in points]
+    y_lo, y_hi = min(lows) * 0.95, max(highs) * 1.05
+    y = _scale(y_lo, y_hi, HEIGHT - PAD, 20)
+    step = (WIDTH - PAD - 30) / max(len(points) - 1, 1)
+    xs = [PAD + 10 + i * step for i in range(len(points))]
+
+    every = max(len(points) // 8, 1)  # room for about 8 commit labels
+    labels = [(x, p[0]) for i, (x, p) in enumerate(zip(xs, points))
+              if i % every == 0]
+    out = _frame('ms', labels, y_lo, y_hi)
+
+    band = [f'{x:.1f},{y(p[3]):.1f}' for x, p in zip(xs, points)]
+    band += [f'{x:.1f},{y(p[2]):.1f}' for x, p in reversed(list(zip(xs, points)))]
+    out.append(f'<polygon points="{" ".join(band)}" fill="#cde" stroke="none"/>')
+    line = ' '.join(f'{x:.1f},{y(p[1]):.1f}' for x, p in zip(xs, points))
+    out.append(f'<polyline points="{line}" fill="none" stroke="#258" stroke-width="2"/>')
+    for x, p in zip(xs, points):
+        out.append(f'<circle cx="{x:.1f}" cy="{y(p[1]):.1f}" r="3" fill="#258">'
+                   f'<title>{escape(p[0])}  {p[1]:.4g} ms</title></circle>')
+    out.append('</svg>')
+    return '\n'.join(out)
+
+
+def sweep_svg(result):
+    """
+        result
+            : dict
+            : from klab.sweep.sweep -> {'sizes', 'ms', 'fit'}
+
+        returns
+            > str
+            > svg, log-log, measured points and the fitted curve
+    """
+    sizes, ms = result['sizes'], result['ms']
+    found = result['fit']
+    model = found['model']
+    coef = found['models'][model]['coef']
+    f = sweep.MODELS[model]
+
+    # fitted curve sampled between measured sizes
+    curve_n = []
+    for a, b in zip(sizes, sizes[1:]):
+        curve_n += [a * (b / a) ** (k / 8) for k in range(8)]
+    curve_n.append(sizes[-1])
+    curve_t = [max(coef * f(n), 1e-9) for n in curve_n]
+
+    y_lo = min(min(ms), min(curve_t)) * 0.8
+    y_hi = max(max(ms), max(curve_t)) * 1.25
+    y_lo = max(y_lo, 1e-9)
+    x = _scale(sizes[0], sizes[-1], PAD + 10, WIDTH - 20, logged=True)
+    y = _scale(y_lo, y_hi, HEIGHT - PAD, 20, logged=True)
+
+    out = _frame('ms', [(x(n), f'{n:,}') for n in sizes], y_lo, y_hi)
+    line = ' '.join(f'{x(n):.1f},{y(t):.1f}' for n, t in zip(curve_n, curve_t))
+    out.append(f'<polyline points="{line}" fill="none" stroke="#c53"'
+               f' stroke-width="1.5" stroke-dasharray="4 3"/>')
+    for n, t in zip(sizes, ms):
+        out.append(f'<circle cx="{x(n):.1f}" cy="{y(t):.1f}" r="3.5" fill="#258">'
+                   f'<title>n {n:,}  {t:.4g} ms</title></circle>')
+    out.append(f'<text x="{WIDTH - 20}" y="30" text-anchor="end">'
+               f'{escape(model)}  exponent {found["exponent"]:.2f}</text>')
+    out.append('</svg>')
+    return '\n'.join(out)
+
+
+def trends(runs):
+    """
+        runs
+            : list[dict]
+            : from per_commit
+
+        returns
+            > dict
+            > benchmark name -> [(label, median, low, high), ...]
+    """
+    found = {}
+    for run in runs:
+        for name, entry in run.get('benchmarks', {}).items():
+            samples = entry['samples']
+            if samples:
+                found.setdefault(name, []).append(
+                    (_label(run), median(samples), min(samples), max(samples))
+                )
+    return found
+
+
+def implementations(run):
+    """
+        run
+            : dict
+            : usually the newest
+
+        returns
+            > dict
+            > group -> {implementation: median ms}
+            > only groups with two or more implementations
+    """
+    groups = {}
+    for name, entry in run.get('benchmarks', {}).items():
+        group, slash, impl = name.rpartition('/')
+        if slash and entry['samples']:
+            groups.setdefault(group, {})[impl] = median(entry['samples'])
+    return {g: impls for g, impls in groups.items() if len(impls) > 1}
+
+
+def _table(groups):
+    impls = sorted({i for found in groups.values() for i in found})
+    out = ['<table>', '<tr><th>median ms</th>']
+    out += [f'<th>{escape(i)}</th>' for i in impls]
+    out.append('</tr>')
+    for group, found in sorted(groups.items()):
+        best = min(found.values())
+        out.append(f'<tr><td>{escape(group)}</td>')
+        for i in impls:
+            if i not in found:
+                out.append('<td>-</td>')
+                continue
+            mark = ' class="best"' if found[i] == best else ''
+            ratio = '' if found[i] == best else f' ({found[i] / best:.2f}x)'
+            out.append(f'<td{mark}>{found[i]:.4g}{ratio}</td>')
+        out.append('</tr>')
+    out.append('</table>')
+    return '\n'.join(out)
+
+
+def render(runs, title='klab report'):
+    """
+        runs
+            : list[dict]
+            : oldest first, from load_runs
+
+        returns
+            > str
+            > whole html document
+    """
+    commits = per_commit(runs)
+    out = [
+        '<!doctype html>',
+        '<html><head><meta charset="utf-8">',
+        f'<title>{escape(title)}</title>',
+        f'<style>{STYLE}</style>',
+        '</head><body>',
+        f'<h1>{escape(title)}</h1>',
+    ]
+    if not commits:
+        out += ['<p>no stored runs</p>', '</body></html>']
+        return '\n'.join(out)
+
+    newest = commits[-1]
+    machine = newest.get('machine', {})
+    out.append(f'<p class="meta">{len(runs)} runs, {len(commits)} commits'
+               f' &middot; newest {escape(newest["created"])}'
+               f' &middot; {escape(_label(newest))}'
+               f' &middot; {escape(str(machine.get("cpu", "")))}</p>')
+
+    groups = implementations(newest)
+    if groups:
+        out.append('<h2>implementations</h2>')
+        out.append('<p class="meta">newest run, fastest per row in bold</p>')
+        out.append(_table(groups))
+
+    lines = trends(commits)
+    if lines:
+        out.append('<h2>trends</h2>')
+        out.append('<div class="grid">')
+        for name, points in sorted(lines.items()):
+            out.append(f'<div><h3>{escape(name)}</h3>{trend_svg(points)}</div>')
+        out.append('</div>')
+
+    sweeps = newest.get('sweeps', {})
+    if sweeps:
+        out.append('<h2>sweeps</h2>')
+        out.append('<p class="meta">newest run, dashed -> fitted model</p>')
+        out.append('<div class="grid">')
+        for name, result in sorted(sweeps.items()):
+            out.append(f'<div><h3>{escape(name)}</h3>{sweep_svg(result)}</div>')
+        out.append('</div>')
+
+    out.append('</body></html>')
+    return '\n'.join(out)
+
+
+def write_report(runs, path='klab-report.html', title='klab report'):
+    """
+        runs
+            : list[dict]
+
+        path
+            : str or Path
+
+        returns
+            > Path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wt', encoding='utf-8') as w:
+        w.write(render(runs, title))
+    return path
+
+
+if __name__ == '__main__':
+    from random import gauss, seed
+
+    seed(7)
+    runs = []
+    for i in range(6):
+        run = store.new_run()
+        run['created'] = f'2026-10-{10 + i:02}T12:00:00'
+        run['git'] = {'commit': f'{i:040x}', 'branch': 'main', 'dirty': False}
+        slower = 1.3 if i >= 4 else 1.0
+        store.add_samples(run, 'insert/algo_ll',
+                          [gauss(150 * slower, 4) for _ in range(7)])
+        store.add_samples(run, 'insert/deque_ll',
+                          [gauss(40, 2) for _ in range(7)])
+        runs.append(run)
+
+    sizes = sweep.geometric(500, 8_000)
+    ms = [2e-5 * n * n for n in sizes]
+    store.add_sweep(runs[-1], 'delete_key/algo_ll',
+                    {'sizes': sizes, 'ms': ms, 'fit': sweep.fit(sizes, ms)})
+
+    text = render(runs)
+    assert text.count('<svg') == 3
+    assert 'class="best">' in text
+    print(f'{len(text):,} bytes of html')
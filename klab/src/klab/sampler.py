@@ -0,0 +1,193 @@
+"""
+    | teleorithm |
+
+    where does the time go?
+
+    USAGE
+    ---------
+    import klab
+
+    with klab.sample():
+        app.build()
+
+    1,204 samples @ 997 Hz
+      self %   total %   function
+        31.2      31.2   _apply_layout (wisp22.py:170)
+        18.9      64.0   _configure_widget_recursive (wisp22.py:261)
+                  ...
+
+    OR
+
+    r = {}
+    with klab.sample(r, folded_path='build.folded'):
+        app.build()
+
+    $ flamegraph.pl build.folded > build.svg
+    ---------
+    SIGPROF every 1/hz seconds of cpu time -> python stack walked and counted
+    stacks kept as tuples of code objects, made into text only at the end
+    -> cheap enough to leave on for a whole build or load
+
+    cpu time only -> sleeping or waiting on io is not sampled
+    main thread only -> that is where python delivers signals
+"""
+import signal
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from os.path import basename
+
+
+def _label(code):
+    return f'{code.co_name} ({basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def folded(stacks):
+    """
+        stacks
+            : Counter
+            : tuple of code objects, outermost first -> samples
+
+        returns
+            > dict
+            > 'outer;inner;leaf' -> samples, as flamegraph.pl reads
+    """
+    out = Counter()
+    for stack, n in stacks.items():
+        out[';'.join(_label(c) for c in stack)] += n
+    return dict(out)
+
+
+def folded_text(lines):
+    """
+        lines
+            : dict
+            : from folded
+
+        returns
+            > str
+            > one 'a;b;c count' line per stack
+    """
+    return ''.join(f'{stack} {n}\n' for stack, n in sorted(lines.items()))
+
+
+def top(lines, n=20):
+    """
+        lines
+            : dict
+            : from folded
+
+        returns
+            > list[tuple]
+            > (function, self samples, total samples) by self, largest first
+    """
+    own = Counter()
+    total = Counter()
+    for stack, count in lines.items():
+        frames = stack.split(';')
+        own[frames[-1]] += count
+        for f in set(frames):
+            total[f] += count
+    return [(f, own[f], total[f]) for f, _ in own.most_common(n)]
+
+
+def print_top(lines, n=20, hz=None, stream=None):
+    """
+        lines
+            : dict
+            : from folded
+    """
+    stream = stream or sys.stdout
+    samples = sum(lines.values())
+    rate = f' @ {hz} Hz' if hz else ''
+    print(f'{samples:,} samples{rate}', file=stream)
+    if not samples:
+        return
+    print(f'{"self %":>8}  {"total %":>8}   function', file=stream)
+    for f, own, total in top(lines, n):
+        print(f'{own / samples * 100:>8.1f}  {total / samples * 100:>8.1f}   {f}',
+              file=stream)
+
+
+@contextmanager
+def sample(record=None, hz=997, n=20, folded_path=None):
+    """
+        record
+            : dict
+            : gets 'stacks' (folded -> samples) and 'samples' added up
+            : if None the top n table is printed instead
+
+        hz
+            : int
+            : samples per second of cpu time
+
+        folded_path
+            : str
+            : also write flamegraph-compatible folded stacks here
+
+        raises
+            ! ValueError if not called from the main thread
+    """
+    stacks = Counter()
+    # frame running the with statement -> stacks stop here
+    outer = sys._getframe(2)
+
+    def on_prof(signum, frame):
+        stack = []
+        while frame is not None and frame is not outer:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        if frame is outer:
+            stack.append(outer.f_code)
+        stack.reverse()
+        stacks[tuple(stack)] += 1
+
+    previous = signal.signal(signal.SIGPROF, on_prof)
+    signal.setitimer(signal.ITIMER_PROF, 1 / hz, 1 / hz)
+    try:
+        yield  # code runs here
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, previous)
+
+        lines = folded(stacks)
+        if folded_path:
+            with open(folded_path, 'wt') as w:
+                w.write(folded_text(lines))
+
+        if record is None:
+            print_top(lines, n, hz)
+        else:
+            seen = record.setdefault('stacks', {})
+            for stack, count in lines.items():
+                seen[stack] = seen.get(stack, 0) + count
+            record['samples'] = record.get('samples', 0) + sum(lines.values())
+
+
+if __name__ == '__main__':
+    from time import perf_counter
+
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    def busy():
+        return sum(i * i for i in range(200_000))
+
+    def work():
+        for _ in range(5):
+            busy()
+        fib(24)
+
+    start = perf_counter()
+    work()
+    plain = perf_counter() - start
+
+    r = {}
+    start = perf_counter()
+    with sample(r):
+        work()
+    sampled = perf_counter() - start
+
+    print_top(r['stacks'], 8, 997)
+    print(f'overhead {(sampled / plain - 1) * 100:.1f} %')
+    assert any('fib' in stack for stack in r['stacks'])
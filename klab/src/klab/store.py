@@ -0,0 +1,460 @@
+"""
+    | teleorithm |
+
+    benchmark runs saved as json instead of hand-typed comments
+
+    USAGE
+    ---------
+    run = new_run()
+    bench(run, 'insert/deque_ll', lambda: ll.insert('a'), repeat=7)
+    save_run(run)  # -> .klab/runs/20261019-143721-73ffd5e989.json
+
+    $ python -m klab compare main HEAD
+
+                   base (ms)    head (ms)    change         p
+    insert/deque_ll    150.2        181.7    +21.0%    0.0004   REGRESSION
+    ---------
+    a run record ->
+    {
+        'created': '2026-10-19T14:37:21',
+        'machine': {'cpu': 'Intel(R) Core(TM) i7-2600K ...', 'cores': 8, ...},
+        'git': {'commit': '73ffd5e9...', 'branch': 'master', 'dirty': False},
+        'env': {'PYTHONHASHSEED': '0', 'governor': 'performance', ...},
+        'benchmarks': {name: {'unit': 'ms', 'samples': [...]}, ...},
+        'sweeps': {name: {'sizes': [...], 'ms': [...], 'fit': {...}}, ...},
+        'counts': {name: {'instructions': 412733, 'lines': ..., ...}, ...}
+    }
+
+    BASE and HEAD are json paths or git refs -> newest run for that commit
+    exit status 1 on any significant regression -> pre-merge gate
+"""
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+from math import exp, lgamma, log, sqrt
+from pathlib import Path
+from statistics import fmean, median, variance
+from subprocess import run as _run, PIPE, DEVNULL
+from time import perf_counter
+
+
+STORE_DIR = Path('.klab') / 'runs'
+
+
+def cpu_model():
+    """
+        returns
+            > str
+            > (eg) 'Intel(R) Core(TM) i7-2600K CPU @ 3.40GHz'
+    """
+    try:
+        with open('/proc/cpuinfo', 'rt') as r:
+            for line in r:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+
+    return platform.processor() or platform.machine()
+
+
+def fingerprint():
+    """
+        returns
+            > dict
+            > enough about this machine to know when runs are comparable
+    """
+    try:
+        usable = len(os.sched_getaffinity(0))
+    except AttributeError:
+        usable = os.cpu_count()
+
+    return {
+        'cpu': cpu_model(),
+        'cores': os.cpu_count(),
+        'usable_cores': usable,
+        'machine': platform.machine(),
+        'system': platform.platform(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'build': list(platform.python_build()),
+        'compiler': platform.python_compiler(),
+    }
+
+
+def _git(*args):
+    out = _run(['git', *args], stdout=PIPE, stderr=DEVNULL, text=True)
+    if out.returncode != 0:
+        raise ValueError('git failed', args)
+    return out.stdout.strip()
+
+
+def git_info():
+    """
+        returns
+            > dict
+            > commit, branch, dirty -> None values outside a git repo
+    """
+    try:
+        return {
+            'commit': _git('rev-parse', 'HEAD'),
+            'branch': _git('rev-parse', '--abbrev-ref', 'HEAD'),
+            'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        }
+    except (OSError, ValueError):
+        return {'commit': None, 'branch': None, 'dirty': None}
+
+
+def environment():
+    """
+        returns
+            > dict
+            > PYTHON* variables plus things known to move timings
+    """
+    env = {k: v for k, v in os.environ.items() if k.startswith('PYTHON')}
+    env['executable'] = sys.executable
+
+    try:
+        path = '/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor'
+        with open(path, 'rt') as r:
+            env['governor'] = r.read().strip()
+    except OSError:
+        env['governor'] = None
+
+    try:
+        env['loadavg'] = list(os.getloadavg())
+    except OSError:
+        env['loadavg'] = None
+
+    return env
+
+
+def new_run():
+    """
+        returns
+            > dict
+            > empty run record, benchmarks get added by bench or add_samples
+    """
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'machine': fingerprint(),
+        'git': git_info(),
+        'env': environment(),
+        'benchmarks': {},
+        'sweeps': {},
+        'counts': {},
+    }
+
+
+def add_samples(run, name, samples, unit='ms'):
+    """
+        run
+            : dict
+            : from new_run
+
+        name
+            : str
+            : (eg) 'insert/algo_ll' -> group/implementation
+
+        samples
+            : list[float]
+            : one entry per repetition
+    """
+    entry = run['benchmarks'].setdefault(name, {'unit': unit, 'samples': []})
+    entry['samples'].extend(samples)
+
+
+def add_sweep(run, name, result):
+    """
+        run
+            : dict
+            : from new_run
+
+        result
+            : dict
+            : from klab.sweep.sweep
+    """
+    run.setdefault('sweeps', {})[name] = result
+
+
+def add_counts(run, name, record):
+    """
+        run
+            : dict
+            : from new_run
+
+        record
+            : dict
+            : filled by klab.counting.count -> compared exactly
+    """
+    run.setdefault('counts', {})[name] = record
+
+
+def bench(run, name, fn, repeat=7, number=1, warmup=1):
+    """
+        run
+            : dict
+            : from new_run
+
+        fn
+            : callable
+            : no arguments, timed number times per sample
+
+        returns
+            > list[float]
+            > ms per call for each of the repeat samples
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            fn()
+        end = perf_counter()
+        samples.append((end - start) * 1000 / number)
+
+    add_samples(run, name, samples)
+    return samples
+
+
+def save_run(run, directory=STORE_DIR):
+    """
+        run
+            : dict
+
+        directory
+            : str or Path
+
+        returns
+            > Path
+            > (eg) .klab/runs/20261019-143721-73ffd5e989.json
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    stamp = run['created'].replace('-', '').replace(':', '').replace('T', '-')
+    commit = (run['git']['commit'] or 'nogit')[:10]
+    path = directory / f'{stamp}-{commit}.json'
+    n = 1
+    while path.exists():  # same second, same commit
+        path = directory / f'{stamp}-{commit}-{n}.json'
+        n += 1
+
+    with open(path, 'wt') as w:
+        json.dump(run, w, indent=2)
+
+    return path
+
+
+def load_run(path):
+    """
+        path
+            : str or Path
+
+        returns
+            > dict
+    """
+    with open(path, 'rt') as r:
+        return json.load(r)
+
+
+def find_run(ref, directory=STORE_DIR):
+    """
+        ref
+            : str
+            : path to a run json or a git ref -> (eg) 'main', 'HEAD~2'
+
+        returns
+            > dict
+            > newest stored run recorded at that commit
+
+        raises
+            ! FileNotFoundError
+    """
+    if Path(ref).is_file():
+        return load_run(ref)
+
+    try:
+        commit = _git('rev-parse', '--verify', f'{ref}^{{commit}}')
+    except (OSError, ValueError):
+        raise FileNotFoundError('neither a run file nor a git ref', ref)
+
+    runs = [load_run(p) for p in sorted(Path(directory).glob('*.json'))]
+    found = [r for r in runs if r['git']['commit'] == commit]
+    if not found:
+        raise FileNotFoundError('no stored run for commit', commit)
+
+    return max(found, key=lambda r: r['created'])
+
+
+def _betacf(a, b, x):
+    # continued fraction for incomplete beta -> Numerical Recipes 6.4
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1, a - 1
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 3e-12:
+            break
+    return h
+
+
+def _betainc(a, b, x):
+    """ regularized incomplete beta I_x(a, b) """
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = exp(
+        lgamma(a + b) - lgamma(a) - lgamma(b) + a * log(x) + b * log(1 - x)
+    )
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    else:
+        return 1 - front * _betacf(b, a, 1 - x) / b
+
+
+def welch(a, b):
+    """
+        a, b
+            : list[float]
+            : samples, at least 2 each
+
+        returns
+            > float
+            > two-sided p value that a and b share a mean
+    """
+    na, nb = len(a), len(b)
+    ma, mb = fmean(a), fmean(b)
+    va, vb = variance(a) / na, variance(b) / nb
+    se2 = va + vb
+    if se2 == 0:
+        return 1.0 if ma == mb else 0.0
+
+    t = (mb - ma) / sqrt(se2)
+    df = se2 ** 2 / (va ** 2 / (na - 1) + vb ** 2 / (nb - 1))
+    return _betainc(df / 2, 0.5, df / (df + t * t))
+
+
+def compare(base, head, alpha=0.05, threshold=0.05):
+    """
+        base, head
+            : dict
+            : run records
+
+        alpha
+            : float
+            : significance level for welch's t-test
+
+        threshold
+            : float
+            : relative change of the median below which nothing is flagged
+
+        returns
+            > list[dict]
+            > one row per benchmark name ->
+            > {'name', 'base', 'head', 'change', 'p', 'verdict'}
+            > verdict in 'regression', 'improvement', 'same', 'added', 'missing'
+    """
+    b_marks = base['benchmarks']
+    h_marks = head['benchmarks']
+    rows = []
+    for name in sorted(set(b_marks) | set(h_marks)):
+        if name not in h_marks:
+            b = median(b_marks[name]['samples'])
+            rows.append(dict(name=name, base=b, head=None,
+                             change=None, p=None, verdict='missing'))
+            continue
+        if name not in b_marks:
+            h = median(h_marks[name]['samples'])
+            rows.append(dict(name=name, base=None, head=h,
+                             change=None, p=None, verdict='added'))
+            continue
+
+        xs = b_marks[name]['samples']
+        ys = h_marks[name]['samples']
+        b, h = median(xs), median(ys)
+        change = (h - b) / b if b else 0.0
+        p = welch(xs, ys) if len(xs) > 1 and len(ys) > 1 else None
+
+        verdict = 'same'
+        if p is not None and p < alpha and abs(change) > threshold:
+            verdict = 'regression' if change > 0 else 'improvement'
+
+        rows.append(dict(name=name, base=b, head=h,
+                         change=change, p=p, verdict=verdict))
+
+    return rows
+
+
+def print_comparison(rows):
+    """
+        rows
+            : list[dict]
+            : from compare
+    """
+    if not rows:
+        return
+
+    width = max([len(r['name']) for r in rows] + [9])
+    print(f'{"":<{width}}   {"base (ms)":>10}   {"head (ms)":>10}'
+          f'   {"change":>8}   {"p":>8}')
+
+    def num(x, spec):
+        return format(x, spec) if x is not None else '-'
+
+    for r in rows:
+        flag = '' if r['verdict'] == 'same' else r['verdict'].upper()
+        print(f'{r["name"]:<{width}}'
+              f'   {num(r["base"], ">10,.3f")}'
+              f'   {num(r["head"], ">10,.3f")}'
+              f'   {num(r["change"], ">+8.1%")}'
+              f'   {num(r["p"], ">8.4f")}'
+              f'   {flag}')
+
+
+def regressed(rows):
+    """
+        returns
+            > bool
+            > True if any row was flagged as a regression
+    """
+    return any(r['verdict'] == 'regression' for r in rows)
+
+
+if __name__ == '__main__':
+    from random import gauss, seed
+
+    seed(2)
+    base = new_run()
+    head = new_run()
+    add_samples(base, 'steady', [gauss(100, 2) for _ in range(10)])
+    add_samples(head, 'steady', [gauss(100, 2) for _ in range(10)])
+    add_samples(base, 'slower', [gauss(100, 2) for _ in range(10)])
+    add_samples(head, 'slower', [gauss(130, 2) for _ in range(10)])
+    add_samples(base, 'faster', [gauss(100, 2) for _ in range(10)])
+    add_samples(head, 'faster', [gauss(70, 2) for _ in range(10)])
+
+    rows = compare(base, head)
+    print_comparison(rows)
+    assert [r['verdict'] for r in rows] == ['improvement', 'regression', 'same']
@@ -0,0 +1,261 @@
+"""
+    | teleorithm |
+
+    how does time grow with n?
+
+    USAGE
+    ---------
+    result = sweep(setup, fn, geometric(1_000, 64_000))
+    print_fit(result)
+
+                 n            ms
+             1,000         0.412
+             2,000         1.610
+               ...
+            64,000      1687.544
+
+      best fit -> n^2      exponent 1.99
+
+          model          coef      residual
+              1     2.637e+01        3.4188
+          log n     3.045e+00        2.9617
+              n     2.675e-02        1.5092
+        n log n     2.569e-03        1.1207
+            n^2     4.118e-07        0.0214
+    ---------
+    setup(n) builds fresh state, untimed
+    fn(state) is timed -> best of repeat per size
+
+    a single size can look fine while the curve says quadratic
+"""
+from math import log
+from statistics import fmean
+from time import perf_counter
+
+
+MODELS = {
+    '1': lambda n: 1.0,
+    'log n': lambda n: log(n),
+    'n': lambda n: float(n),
+    'n log n': lambda n: n * log(n),
+    'n^2': lambda n: float(n) * n,
+}
+
+# position in MODELS -> order of growth
+ORDER = {name: i for i, name in enumerate(MODELS)}
+
+
+def geometric(start, stop, factor=2):
+    """
+        start, stop
+            : int
+            : stop included if reached exactly
+
+        returns
+            > list[int]
+            > (eg) geometric(1_000, 8_000) -> [1000, 2000, 4000, 8000]
+    """
+    sizes = []
+    n = start
+    while n <= stop:
+        sizes.append(int(n))
+        n *= factor
+    return sizes
+
+
+def sweep(setup, fn, sizes, repeat=5):
+    """
+        setup
+            : callable
+            : setup(n) -> state, not timed
+
+        fn
+            : callable
+            : fn(state) -> timed, gets fresh state every repeat
+
+        sizes
+            : list[int]
+
+        returns
+            > dict
+            > {'sizes': [...], 'ms': [...], 'fit': {...}}
+    """
+    ms = []
+    for n in sizes:
+        best = float('inf')
+        for _ in range(repeat):
+            state = setup(n)
+            start = perf_counter()
+            fn(state)
+            end = perf_counter()
+            best = min(best, (end - start) * 1000)
+        ms.append(best)
+
+    return {'sizes': list(sizes), 'ms': ms, 'fit': fit(sizes, ms)}
+
+
+def exponent(sizes, times):
+    """
+        returns
+            > float
+            > slope of log t against log n -> (eg) ~2.0 for quadratic
+    """
+    xs = [log(n) for n in sizes]
+    ys = [log(max(t, 1e-12)) for t in times]
+    mx, my = fmean(xs), fmean(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    return sxy / sxx if sxx else 0.0
+
+
+def model_exponent(model, sizes):
+    """
+        model
+            : str
+            : a key of MODELS
+
+        returns
+            > float
+            > exponent a model shows over these sizes
+            > (eg) 'n log n' over 10k - 640k -> ~1.09, never told from 'n' by
+            > a noisy fit
+    """
+    return exponent(sizes, [MODELS[model](n) for n in sizes])
+
+
+def fit(sizes, times):
+    """
+        sizes
+            : list[int]
+
+        times
+            : list[float]
+            : same length as sizes, at least 2 entries
+
+        returns
+            > dict
+            > {'model': 'n^2', 'exponent': 1.99, 'models': {name: {...}}}
+            > each model -> {'coef': c, 'residual': r} for t ~ c * f(n)
+
+        least squares on relative error so small n count as much as large n
+        residual -> root mean square relative error
+    """
+    models = {}
+    for name, f in MODELS.items():
+        fs = [f(n) for n in sizes]
+        num = sum(fi / t for fi, t in zip(fs, times) if t > 0)
+        den = sum((fi / t) ** 2 for fi, t in zip(fs, times) if t > 0)
+        coef = num / den if den else 0.0
+        errs = [(coef * fi - t) / t for fi, t in zip(fs, times) if t > 0]
+        residual = fmean(e * e for e in errs) ** 0.5 if errs else 0.0
+        models[name] = {'coef': coef, 'residual': residual}
+
+    best = min(models, key=lambda name: models[name]['residual'])
+    return {
+        'model': best,
+        'exponent': exponent(sizes, times),
+        'models': models,
+    }
+
+
+def print_fit(result):
+    """
+        result
+            : dict
+            : from sweep
+    """
+    print(f'{"n":>18}    {"ms":>10}')
+    for n, t in zip(result['sizes'], result['ms']):
+        print(f'{n:>18,}    {t:>10.3f}')
+
+    found = result['fit']
+    print()
+    print(f'  best fit -> {found["model"]:<8} exponent {found["exponent"]:.2f}')
+    print()
+    print(f'{"model":>15}    {"coef":>10}    {"residual":>10}')
+    for name, m in found['models'].items():
+        print(f'{name:>15}    {m["coef"]:>10.3e}    {m["residual"]:>10.4f}')
+
+
+def _clearly(fit, model, over, margin):
+    # model fits these times margin x better than over does
+    models = fit['models']
+    return models[over]['residual'] > margin * models[model]['residual']
+
+
+def compare_sweeps(base, head, tolerance=0.25, margin=3.0):
+    """
+        base, head
+            : dict
+            : run records from klab.store -> their 'sweeps'
+
+        tolerance
+            : float
+            : exponent change allowed before flagging
+
+        margin
+            : float
+            : a change of best model alone is flagged only when head's
+            : times fit the new model margin x better than the old one
+
+        returns
+            > list[dict]
+            > {'name', 'base', 'head', 'verdict'} for sweeps in both runs
+            > verdict 'regression' when the exponent grew past tolerance
+            > or head clearly fits a bigger model, 'improvement' the mirror
+
+        noise flips the best model between neighbours like 'n' and
+        'n log n' on unchanged code -> the model alone decides nothing
+    """
+    b_sweeps = base.get('sweeps', {})
+    h_sweeps = head.get('sweeps', {})
+    rows = []
+    for name in sorted(set(b_sweeps) & set(h_sweeps)):
+        b = b_sweeps[name]['fit']
+        h = h_sweeps[name]['fit']
+        grew = ORDER[h['model']] > ORDER[b['model']]
+        shrank = ORDER[h['model']] < ORDER[b['model']]
+        verdict = 'same'
+        if h['exponent'] > b['exponent'] + tolerance or \
+           grew and _clearly(h, h['model'], b['model'], margin):
+            verdict = 'regression'
+        elif h['exponent'] < b['exponent'] - tolerance or \
+             shrank and _clearly(h, h['model'], b['model'], margin):
+            verdict = 'improvement'
+        rows.append(dict(name=name, base=b, head=h, verdict=verdict))
+
+    return rows
+
+
+def print_sweep_comparison(rows):
+    """
+        rows
+            : list[dict]
+            : from compare_sweeps
+    """
+    for r in rows:
+        b, h = r['base'], r['head']
+        flag = '' if r['verdict'] == 'same' else r['verdict'].upper()
+        print(f'{r["name"]}    {b["model"]} ({b["exponent"]:.2f})'
+              f' -> {h["model"]} ({h["exponent"]:.2f})    {flag}')
+
+
+if __name__ == '__main__':
+    def setup(n):
+        return list(range(n))
+
+    def quadratic(xs):
+        for x in xs[:len(xs) // 10]:
+            xs.remove(len(xs) - 1)  # scans to the end every time
+
+    def linear(xs):
+        sum(xs)
+
+    result = sweep(setup, quadratic, geometric(500, 8_000))
+    print_fit(result)
+    assert result['fit']['model'] == 'n^2'
+
+    print()
+    result = sweep(setup, linear, geometric(10_000, 1_280_000))
+    print_fit(result)
+    assert result['fit']['model'] in ('n', 'n log n')
@@ -0,0 +1,296 @@
+"""
+    | teleorithm |
+
+    skip test modules whose sources have not changed since they passed
+
+    test module -> imports -> their imports -> ... -> source files
+    every file content-hashed -> stored next to pass / fail
+    same hashes and passed last time -> nothing to learn from running it
+
+    USAGE
+    ---------
+    cache = load()
+    suite, fresh = select(defaultTestLoader.discover('.'), cache)
+    result = Runner().run(suite)
+    record(cache, fresh, result, suite)
+    save(cache)
+    ---------
+    only files outside the stdlib and site-packages count as sources
+    -> upgrading parsimonious does not invalidate anything
+
+    passed -> every selected test of the module started, none failed
+        setUpClass / setUpModule errors count against their module
+        a run stopped early (failfast) leaves unstarted modules as they were
+"""
+import ast
+import hashlib
+import importlib.util
+import json
+import re
+import sys
+import sysconfig
+from pathlib import Path
+from unittest import TestSuite
+
+
+CACHE_FILE = '.ktest_cache.json'
+
+_installed = tuple(
+    str(Path(p).resolve()) for key in ('stdlib', 'platstdlib', 'purelib', 'platlib')
+    if (p := sysconfig.get_paths().get(key))
+)
+
+
+def _imported_names(tree, package):
+    """
+        tree
+            : ast.Module
+
+        package
+            : str
+            : package of the parsed module -> resolves relative imports
+
+        yields
+            -> str
+            -> dotted names that might be modules
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield alias.name
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ''
+            if node.level:
+                parts = package.split('.') if package else []
+                parts = parts[:len(parts) - node.level + 1]
+                base = '.'.join(p for p in parts + [base] if p)
+            if base:
+                yield base
+            for alias in node.names:
+                if alias.name != '*':
+                    yield f'{base}.{alias.name}' if base else alias.name
+
+
+def _source_of(name):
+    """
+        name
+            : str
+            : dotted module name
+
+        returns
+            > str or None
+            > resolved path of a project source file
+    """
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError, AttributeError):
+        return None
+    if spec is None or not spec.has_location or not spec.origin:
+        return None
+    if not spec.origin.endswith('.py'):
+        return None
+
+    origin = str(Path(spec.origin).resolve())
+    if origin.startswith(_installed):
+        return None
+    return origin
+
+
+def dependencies(path, package='', found=None):
+    """
+        path
+            : str
+            : python source file
+
+        package
+            : str
+            : package the file belongs to, '' for top level
+
+        returns
+            > set[str]
+            > path itself plus every project source it reaches by importing
+    """
+    found = set() if found is None else found
+    path = str(Path(path).resolve())
+    if path in found:
+        return found
+    found.add(path)
+
+    try:
+        with open(path, 'rb') as r:
+            tree = ast.parse(r.read(), path)
+    except (OSError, SyntaxError):
+        return found
+
+    for name in _imported_names(tree, package):
+        source = _source_of(name)
+        if source and source not in found:
+            if source.endswith('__init__.py'):
+                sub_package = name
+            else:
+                sub_package = name.rpartition('.')[0]
+            dependencies(source, sub_package, found)
+
+    return found
+
+
+def digest(path):
+    """
+        returns
+            > str
+            > sha256 of file contents, '' if unreadable
+    """
+    try:
+        with open(path, 'rb') as r:
+            return hashlib.sha256(r.read()).hexdigest()
+    except OSError:
+        return ''
+
+
+def load(path=CACHE_FILE):
+    """
+        returns
+            > dict
+            > {module: {'deps': {path: sha256}, 'passed': bool}}
+    """
+    try:
+        with open(path, 'rt') as r:
+            return json.load(r)
+    except (OSError, ValueError):
+        return {}
+
+
+def save(cache, path=CACHE_FILE):
+    with open(path, 'wt') as w:
+        json.dump(cache, w, indent=1, sort_keys=True)
+
+
+def _flatten(suite):
+    for t in suite:
+        if isinstance(t, TestSuite):
+            yield from _flatten(t)
+        else:
+            yield t
+
+
+def select(suite, cache):
+    """
+        suite
+            : unittest.TestSuite
+            : from discovery -> test modules already imported
+
+        cache
+            : dict
+            : from load
+
+        returns
+            > tuple[TestSuite, dict]
+            > tests still worth running
+            > {module: {path: sha256}} current hashes for every module seen
+    """
+    current = {}
+    keep = []
+    memo = {}
+    for t in _flatten(suite):
+        mod = type(t).__module__
+        if mod not in current:
+            module = sys.modules.get(mod)
+            source = getattr(module, '__file__', None)
+            if source is None or mod.startswith('unittest.'):
+                current[mod] = None  # failed import and such -> always run
+            else:
+                deps = dependencies(source, getattr(module, '__package__', ''))
+                current[mod] = {
+                    p: memo[p] if p in memo else memo.setdefault(p, digest(p))
+                    for p in sorted(deps)
+                }
+
+        before = cache.get(mod)
+        fresh = (
+            current[mod] is not None and before is not None
+            and before['passed'] and before['deps'] == current[mod]
+        )
+        if not fresh:
+            keep.append(t)
+
+    kept = TestSuite(keep)
+    kept._cleanup = False  # record walks it again after the run
+    return kept, current
+
+
+def module_of(test_id, modules):
+    """
+        test_id
+            : str
+            : (eg) 'test_x.T.test_y', or from an error holder
+            : 'setUpClass (test_x.T)', 'setUpModule (test_x)'
+
+        modules
+            : container of str
+
+        returns
+            > str or None
+            > longest dotted prefix found in modules
+    """
+    m = re.fullmatch(r'\w+ \((.+)\)', test_id)
+    name = m[1] if m else test_id
+    while name and name not in modules:
+        name = name.rpartition('.')[0]
+    return name or None
+
+
+def _ran(result, suite):
+    """
+        returns
+            > set[str]
+            > modules whose selected tests all started
+    """
+    expected = {}
+    for t in _flatten(suite):
+        expected.setdefault(type(t).__module__, set()).add(t.id())
+
+    timings = getattr(result, 'timings', None)
+    if timings is None:
+        # plain TestResult -> no record of what started, only of stopping
+        return set() if result.shouldStop else set(expected)
+
+    started = {t['id'] for t in timings}
+    return {mod for mod, ids in expected.items() if ids <= started}
+
+
+def record(cache, current, result, suite):
+    """
+        cache
+            : dict
+            : modified in place
+
+        current
+            : dict
+            : from select
+
+        result
+            : unittest.TestResult
+            : run of the selected suite, klab Result knows what started
+
+        suite
+            : unittest.TestSuite
+            : the selected suite, from select
+    """
+    bad = [t.id() for t, _ in result.failures + result.errors]
+    bad += [t.id() for t in result.unexpectedSuccesses]
+    failed = {module_of(i, current) for i in bad}
+    ran = _ran(result, suite)
+    for mod, deps in current.items():
+        if deps is None:
+            continue
+        if mod in failed:
+            cache[mod] = {'deps': deps, 'passed': False}
+        elif mod in ran:
+            cache[mod] = {'deps': deps, 'passed': True}
+        # else skipped as unchanged, or never reached -> entry left alone
+
+
+if __name__ == '__main__':
+    from pprint import pprint as P
+
+    P(sorted(dependencies(__file__, 'klab')))
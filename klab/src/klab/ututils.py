@@ -12,10 +12,39 @@
         given some condition (or whatever)
         --> when we do this then something else
 
+    Runner(jobs=4) -> one test module per worker process at a time
+    story output stays grouped per module, results merged into one Result
+
+    every test gets wall ms and cpu ms recorded
+    Runner(memory=True) -> tracemalloc peak too, allocation gets ~4x slower
+    Runner(slowest=10) -> table of the slowest tests after the run
+    Runner(report='out.json') or 'out.xml' -> json or junit report
+
+    @max_ms(50) on a test method -> fails when its body takes longer
+
+    inside a Spec ->
+    self.fast(lambda: load.tkml_string(src), 20)     best call under 20 ms
+    self.scales(count_nodes, sizes, 'n', setup=tree)  no worse than linear
+    self.alloc(lambda: load.gnml_string(src), 2**20)  peak under 1 MiB
+    self.no_leak(lambda: app.update_state_and_refresh(state, ['items']))
+
 """
+import gc
+import json
 import re
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import wraps
+from io import StringIO
 from textwrap import dedent
+from time import perf_counter, process_time
+from xml.etree import ElementTree as ET
 from unittest import main, TestCase, TextTestRunner, TextTestResult
+from unittest import defaultTestLoader, TestSuite
+from unittest.runner import _WritelnDecorator
+
+from klab import leaks, sweep
 
 def extract_names(s):
     """
@@ -75,8 +104,239 @@ class Spec(TestCase):
         self.rais = self.assertRaises
         self.subt = self.subTest
 
+    def fast(self, fn, max_ms, repeat=5):
+        """
+            fn
+                : callable
+                : no arguments
+
+            max_ms
+                : float
+                : budget for one call
+
+            loops calibrated so a sample lasts >= 10 ms -> timer noise drowns
+            best of repeat samples -> a busy machine only ever adds time
+        """
+        took = best_ms(fn, repeat)
+        if took > max_ms:
+            self.fail(f'best call took {took:.3f} ms, budget is {max_ms} ms')
+
+    def scales(self, fn, sizes, at_most='n log n', setup=None, repeat=5,
+               tolerance=0.3):
+        """
+            fn
+                : callable
+                : fn(state) -> timed, called many times on one state
+
+            sizes
+                : list[int]
+                : spread by 16x or more, (eg) sweep.geometric(250, 4_000)
+
+            at_most
+                : str
+                : a key of klab.sweep.MODELS
+
+            setup
+                : callable
+                : setup(n) -> state, not timed, default passes n itself
+
+            tolerance
+                : float
+                : exponent allowed above what at_most gives over sizes
+
+            each size timed like best_ms -> calibrated loops, gc and
+            tracemalloc off, best of repeat
+            fails on the fitted exponent, not the closest model
+            -> 'n' and 'n log n' are too close to tell apart reliably
+            a failing sweep is run once more and the fastest time per
+            size kept -> one noisy size cannot fail it
+        """
+        setup = setup or (lambda n: n)
+        allowed = sweep.model_exponent(at_most, sizes) + tolerance
+        ms = _calibrated(setup, fn, sizes, repeat)
+        if sweep.exponent(sizes, ms) > allowed:
+            again = _calibrated(setup, fn, sizes, repeat)
+            ms = [min(a, b) for a, b in zip(ms, again)]
+
+        found = sweep.exponent(sizes, ms)
+        if found > allowed:
+            times = ', '.join(f'{n:,}: {t:.3f}' for n, t in zip(sizes, ms))
+            self.fail(f'grows like n^{found:.2f} (best fit '
+                      f'{sweep.fit(sizes, ms)["model"]}), at most {at_most} '
+                      f'allowed -> n^{allowed:.2f} -> ms by n {{{times}}}')
+
+    def alloc(self, fn, max_bytes):
+        """
+            fn
+                : callable
+                : no arguments
+
+            max_bytes
+                : int
+                : budget for tracemalloc peak above what was already held
+
+            one untimed call first -> caches and lazy imports do not count
+        """
+        fn()
+        peak = peak_bytes(fn)
+        if peak > max_bytes:
+            self.fail(f'peak {peak:,} bytes, budget is {max_bytes:,} bytes')
+
+    def no_leak(self, fn, iterations=200, **kwargs):
+        """
+            fn
+                : callable
+                : no arguments, run iterations times
+
+            kwargs -> klab.leaks.leaks
+            fails when traced memory grows linearly with iterations
+        """
+        found = leaks.leaks(fn, iterations, **kwargs)
+        if found['leaking']:
+            out = StringIO()
+            leaks.print_leaks(found, out)
+            self.fail(f'{found["slope"]:,.1f} bytes kept per call\n'
+                      f'{out.getvalue()}')
+
+
+# set by Result while a test runs under tracemalloc -> {'base', 'peak'}
+_held = {}
+
+
+def _fold_peak():
+    # tracemalloc forgets its peak on reset_peak or stop -> keep it first
+    if _held:
+        peak = tracemalloc.get_traced_memory()[1] - _held['base']
+        _held['peak'] = max(_held['peak'], peak)
+
+
+@contextmanager
+def quiet():
+    """
+        gc and tracemalloc off inside the block -> timings without them
+        the running test's memory peak survives the pause
+    """
+    collecting = gc.isenabled()
+    gc.disable()
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        _fold_peak()
+        frames = tracemalloc.get_traceback_limit()
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    try:
+        yield
+    finally:
+        if tracing:
+            tracemalloc.start(frames)
+            if _held:
+                _held['base'] -= held  # traced memory restarts from 0
+        if collecting:
+            gc.enable()
+
+
+def best_ms(fn, repeat=5, min_sample_ms=10):
+    """
+        fn
+            : callable
+            : no arguments
+
+        returns
+            > float
+            > ms per call, best of repeat calibrated samples
+            > timed inside quiet -> like timeit, gc off
+    """
+    with quiet():
+        number = 1
+        while True:
+            start = perf_counter()
+            for _ in range(number):
+                fn()
+            took = (perf_counter() - start) * 1000
+            if took >= min_sample_ms:
+                break
+            number *= 10 if took < min_sample_ms / 10 else 2
+
+        best = took / number
+        for _ in range(repeat - 1):
+            start = perf_counter()
+            for _ in range(number):
+                fn()
+            best = min(best, (perf_counter() - start) * 1000 / number)
+    return best
+
+
+def _calibrated(setup, fn, sizes, repeat):
+    # one state per size, best_ms loops fn over it
+    ms = []
+    for n in sizes:
+        state = setup(n)
+        ms.append(best_ms(lambda: fn(state), repeat))
+    return ms
+
+
+def peak_bytes(fn):
+    """
+        fn
+            : callable
+            : no arguments
+
+        returns
+            > int
+            > tracemalloc peak during one call, above memory held before it
+    """
+    traced = tracemalloc.is_tracing()
+    if traced:
+        _fold_peak()  # Result's per-test peak
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        return max(tracemalloc.get_traced_memory()[1] - base, 0)
+    finally:
+        if not traced:
+            tracemalloc.stop()
+
+
+def max_ms(limit):
+    """
+        limit
+            : float
+            : wall time budget in ms for the test method body
+
+        returns
+            > decorator
+            > test fails when the body runs longer than limit
+            > setUp and tearDown are not counted
+    """
+    def decorate(method):
+        @wraps(method)
+        def budgeted(self, *args, **kwargs):
+            start = perf_counter()
+            out = method(self, *args, **kwargs)
+            took = (perf_counter() - start) * 1000
+            if took > limit:
+                self.fail(f'took {took:.1f} ms, budget is {limit} ms')
+            return out
+
+        budgeted.max_ms = limit
+        return budgeted
+
+    return decorate
+
 
 class Result(TextTestResult):
+    # tracemalloc slows allocation -> Runner(memory=True) to opt in
+    trace_memory = False
+    slowest = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = []
+        self._timing = None
+
     def startTest(self, t):
         """
             t
@@ -106,11 +366,341 @@ class Result(TextTestResult):
 
         self.stream.write(output)
 
+        method = getattr(t, getattr(t, '_testMethodName', ''), None)
+        self._timing = {
+            'id': t.id(),
+            'module': mod,
+            'outcome': 'success',
+            'text': None,
+            'budget_ms': getattr(method, 'max_ms', None),
+        }
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                self._traced = False
+            else:
+                tracemalloc.start()
+                self._traced = True
+            _held.update(base=tracemalloc.get_traced_memory()[0], peak=0)
+        self._cpu_start = process_time()
+        self._wall_start = perf_counter()
+
+    def stopTest(self, t):
+        wall_ms = (perf_counter() - self._wall_start) * 1000
+        cpu_ms = (process_time() - self._cpu_start) * 1000
+
+        timing = self._timing
+        timing['wall_ms'] = wall_ms
+        timing['cpu_ms'] = cpu_ms
+        timing['peak_KiB'] = None
+        if self.trace_memory:
+            _fold_peak()
+            timing['peak_KiB'] = max(_held.pop('peak'), 0) / 1024
+            _held.clear()
+            if self._traced:
+                tracemalloc.stop()
+
+        self.timings.append(timing)
+        super().stopTest(t)
+
+    def _mark(self, outcome, text=None):
+        # worst outcome of a test wins -> subtests may fail several times
+        if self._timing and self._timing['outcome'] in ('success', 'skipped'):
+            self._timing['outcome'] = outcome
+            self._timing['text'] = text
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._mark('failure', self.failures[-1][1])
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._mark('error', self.errors[-1][1])
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._mark('skipped', reason)
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            failed = issubclass(err[0], test.failureException)
+            outcome, found = ('failure', self.failures) if failed \
+                else ('error', self.errors)
+            self._mark(outcome, found[-1][1])
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._mark('unexpected success')
+
+    def printErrors(self):
+        if self.slowest:
+            print_slowest(self.timings, self.slowest, self.stream)
+        super().printErrors()
+
+
+def print_slowest(timings, n, stream):
+    """
+        timings
+            : list[dict]
+            : Result.timings
+
+        n
+            : int
+            : rows in table
+    """
+    rows = sorted(timings, key=lambda t: t['wall_ms'], reverse=True)[:n]
+    stream.writeln()
+    stream.writeln(f'slowest {len(rows)} tests')
+    stream.writeln(f'{"wall ms":>10}  {"cpu ms":>10}  {"peak KiB":>10}  test')
+    for t in rows:
+        peak = f'{t["peak_KiB"]:>10,.0f}' if t['peak_KiB'] is not None else f'{"-":>10}'
+        stream.writeln(f'{t["wall_ms"]:>10,.1f}  {t["cpu_ms"]:>10,.1f}  {peak}  {t["id"]}')
+    stream.flush()
+
+
+def write_report(timings, path):
+    """
+        timings
+            : list[dict]
+            : Result.timings
+
+        path
+            : str
+            : ends in .xml -> junit, anything else -> json
+    """
+    if not str(path).endswith('.xml'):
+        summary = {}
+        for t in timings:
+            summary[t['outcome']] = summary.get(t['outcome'], 0) + 1
+        with open(path, 'wt') as w:
+            json.dump({'summary': summary, 'tests': timings}, w, indent=2)
+        return
+
+    root = ET.Element('testsuites')
+    modules = {}
+    for t in timings:
+        modules.setdefault(t['module'], []).append(t)
+
+    for mod, tests in modules.items():
+        suite = ET.SubElement(root, 'testsuite', name=mod)
+        counts = {'failure': 0, 'error': 0, 'skipped': 0}
+        for t in tests:
+            classname, _, name = t['id'].rpartition('.')
+            case = ET.SubElement(
+                suite, 'testcase', classname=classname, name=name,
+                time=f'{t["wall_ms"] / 1000:.6f}'
+            )
+            outcome = t['outcome']
+            if outcome == 'unexpected success':
+                outcome = 'failure'
+            if outcome in counts:
+                counts[outcome] += 1
+                tag = 'skipped' if outcome == 'skipped' else outcome
+                detail = ET.SubElement(case, tag)
+                if t['text']:
+                    detail.set('message', t['text'].strip().splitlines()[-1])
+                    if tag != 'skipped':
+                        detail.text = t['text']
+
+        suite.set('tests', str(len(tests)))
+        suite.set('failures', str(counts['failure']))
+        suite.set('errors', str(counts['error']))
+        suite.set('skipped', str(counts['skipped']))
+        suite.set('time', f'{sum(t["wall_ms"] for t in tests) / 1000:.6f}')
+
+    ET.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+
+
+class Remote:
+    """
+        stands in for a test that ran in a worker process
+        enough of the TestCase api for printErrors and friends
+    """
+    def __init__(self, description, test_id):
+        self.description = description
+        self.test_id = test_id
+
+    def __str__(self):
+        return self.description
+
+    def id(self):
+        return self.test_id
+
+    def shortDescription(self):
+        return None
+
+
+def _flatten(suite):
+    """
+        suite
+            : unittest.TestSuite
+            : nested suites of tests
+
+        yields
+            -> unittest.TestCase
+    """
+    for t in suite:
+        if isinstance(t, TestSuite):
+            yield from _flatten(t)
+        else:
+            yield t
+
+
+def _run_shard(ids, failfast, buffer, trace_memory, plain=False):
+    """
+        ids
+            : list[str]
+            : test ids from one module
+
+        plain
+            : bool
+            : dots like unittest's own result, not the story
+
+        returns
+            > dict
+            > story output plus picklable outcome lists
+    """
+    stream = _WritelnDecorator(StringIO())
+    result = TextTestResult(stream, True, 1) if plain else Result(stream, True, 0)
+    result.failfast = failfast
+    result.buffer = buffer
+    result.trace_memory = trace_memory
+
+    defaultTestLoader.loadTestsFromNames(ids)(result)
+
+    def remote(pairs):
+        return [(str(t), t.id(), text) for t, text in pairs]
+
+    return {
+        'output': stream.getvalue(),
+        'testsRun': result.testsRun,
+        'failures': remote(result.failures),
+        'errors': remote(result.errors),
+        'skipped': remote(result.skipped),
+        'expectedFailures': remote(result.expectedFailures),
+        'unexpectedSuccesses': [(str(t), t.id()) for t in result.unexpectedSuccesses],
+        'timings': getattr(result, 'timings', []),
+    }
+
+
+class Sharded:
+    """
+        callable like a TestSuite -> suite(result)
+        runs each test module in a worker and merges into result
+        result not a klab Result -> workers print unittest's dots instead
+    """
+    def __init__(self, suite, jobs):
+        """
+            suite
+                : unittest.TestSuite
+
+            jobs
+                : int
+                : worker processes
+        """
+        self.suite = suite
+        self.jobs = jobs
+
+    def countTestCases(self):
+        return self.suite.countTestCases()
+
+    def __call__(self, result):
+        modules = {}
+        local = []
+        for t in _flatten(self.suite):
+            mod = type(t).__module__
+            if mod.startswith('unittest.'):
+                # failed imports and such -> cannot be found again by id
+                local.append(t)
+            else:
+                modules.setdefault(mod, []).append(t.id())
+
+        # biggest first -> stragglers are small
+        shards = sorted(modules.values(), key=len, reverse=True)
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [
+                pool.submit(
+                    _run_shard, ids, result.failfast, result.buffer,
+                    getattr(result, 'trace_memory', False),
+                    not isinstance(result, Result),
+                )
+                for ids in shards
+            ]
+            for f in as_completed(futures):
+                self.merge(result, f.result())
+
+        TestSuite(local)(result)
+        return result
+
+    @staticmethod
+    def merge(result, shard):
+        """
+            result
+                : unittest.TestResult
+
+            shard
+                : dict
+                : from _run_shard
+        """
+        result.stream.write(shard['output'])
+        result.stream.flush()
+        result.testsRun += shard['testsRun']
+        for name in ('failures', 'errors', 'skipped', 'expectedFailures'):
+            getattr(result, name).extend(
+                (Remote(desc, test_id), text)
+                for desc, test_id, text in shard[name]
+            )
+        result.unexpectedSuccesses.extend(
+            Remote(desc, test_id)
+            for desc, test_id in shard['unexpectedSuccesses']
+        )
+        if hasattr(result, 'timings'):
+            result.timings.extend(shard['timings'])
+
 
 class Runner(TextTestRunner):
+    def __init__(self, *args, jobs=1, slowest=0, report=None, memory=False,
+                 **kwargs):
+        """
+            jobs
+                : int
+                : > 1 -> test modules spread over a process pool
+
+            slowest
+                : int
+                : > 0 -> print that many slowest tests after the run
+
+            report
+                : str
+                : path -> .xml writes junit, otherwise json
+
+            memory
+                : bool
+                : record tracemalloc peak per test, off by default
+                : tracing skews timing -> Spec.scales and friends suffer
+        """
+        super().__init__(*args, **kwargs)
+        self.jobs = jobs
+        self.slowest = slowest
+        self.report = report
+        self.memory = memory
+
     def _makeResult(self):
         # verbosity -> 0
-        return Result(self.stream, self.descriptions, 0)
+        result = Result(self.stream, self.descriptions, 0)
+        result.slowest = self.slowest
+        result.trace_memory = self.memory
+        return result
+
+    def run(self, test):
+        if self.jobs > 1:
+            test = Sharded(test, self.jobs)
+        result = super().run(test)
+        if self.report:
+            write_report(result.timings, self.report)
+        return result
 
 
 class TestInitialData(Spec):
@@ -124,15 +714,26 @@ class TestInitialData(Spec):
             1/0
         # TODO: example of using self.subt
 
+    def test_to_FinalData_quickly(self):
+        self.fast(lambda: sorted(range(1000)), 5)
+        self.scales(sorted, sweep.geometric(10_000, 160_000), 'n log n',
+                    setup=lambda n: list(range(n, 0, -1)))
+        self.alloc(lambda: [0] * 1000, 64 * 1024)
+        self.no_leak(lambda: [0] * 1000)
+
 
 class TestBladderSystem(TestCase):
     def test_1_fill_ball_with_oil(self):
         self.assertTrue(1)
 
+    @max_ms(50)
+    def test_1_fill_ball_quickly(self):
+        self.assertTrue(1)
+
     def test_2_drop_ball_filled_with_oil(self):
         self.assertTrue(1)
 
 
 if __name__ == '__main__':
-    main(testRunner=Runner)
+    main(testRunner=Runner(slowest=3))
 
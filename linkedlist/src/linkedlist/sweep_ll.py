@@ -0,0 +1,51 @@
+"""
+    | teleorithm |
+
+    delete_key walks the list from the head -> quadratic to empty a list
+    deque.remove does the same scan -> also quadratic, smaller constant
+
+    $ python sweep_ll.py
+
+    algo_ll delete_key    best fit -> n^2      exponent 1.98
+    deque_ll delete_key   best fit -> n^2      exponent 1.97
+"""
+from klab.sweep import sweep, geometric, print_fit
+
+from linkedlist.algo_ll import new_ll, append, delete_key
+from linkedlist.deque_ll import LinkedList
+
+
+def filled_algo_ll(n):
+    ll = new_ll(n)
+    for k in range(n):
+        append(k, ll)
+    return n, ll
+
+
+def filled_deque_ll(n):
+    ll = LinkedList()
+    for k in range(n):
+        ll.append(k)
+    return n, ll
+
+
+def delete_from_tail_algo_ll(state):
+    n, ll = state
+    for k in reversed(range(n)):
+        delete_key(k, ll)
+
+
+def delete_from_tail_deque_ll(state):
+    n, ll = state
+    for k in reversed(range(n)):
+        ll.delete_key(k)
+
+
+sizes = geometric(250, 4_000)
+
+print('algo_ll delete_key')
+print_fit(sweep(filled_algo_ll, delete_from_tail_algo_ll, sizes, repeat=3))
+
+print()
+print('deque_ll delete_key')
+print_fit(sweep(filled_deque_ll, delete_from_tail_deque_ll, sizes, repeat=3))
@@ -0,0 +1,35 @@
+"""
+    | teleorithm |
+
+    files replaced whole or not at all
+
+    USAGE
+    ---------
+    write_bytes('kb.gnml.idx', marshal.dumps(index))
+    ---------
+    temp file in the same directory -> os.replace is atomic on one filesystem
+    readers see the old file or the new one, never half of either
+    any error -> temp file removed, target untouched
+"""
+import os
+import tempfile
+
+
+def write_bytes(path, data):
+    """
+        path
+            : str or Path
+            : its directory must exist
+
+        data
+            : bytes
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as w:
+            w.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
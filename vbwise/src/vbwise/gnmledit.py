@@ -0,0 +1,228 @@
+"""
+    | teleorithm |
+
+    gnml edits -> only the touched ### NODE blocks parsed again
+
+    USAGE
+    ---------
+    doc = GnmlDoc(text)
+    doc.nodes -> [node, ...], same dicts as gnml_string(text)
+
+    changes = doc.edit(offset, removed, inserted)
+    changes -> {'added': [id, ...], 'changed': [id, ...], 'removed': [id, ...]}
+
+    doc.text, doc.spans -> whole text, [(start, end), ...] per block
+    ---------
+    span -> ### NODE line start through ### ENDNODE\\n end
+
+    gnml has no context across blocks -> parsing stays local to the edit
+        window -> from the end of the last block before the edit
+                  to the start of the first block after it
+        blocks outside the window -> same node dicts, left in place
+
+    text kept as chunks -> leading gap, then one block plus its gap each
+        edit -> window chunks rebuilt, nothing else copied
+    chunk starts after the edit move by one pending step
+        -> (first index, delta) added on read, like editors keep line starts
+        -> folded into the list only between two edit points
+    a keystroke costs its block, not the document
+
+    bad edit -> ValueError with the offset in the new text, doc unchanged
+    changes compare the window only -> ids repeated elsewhere not looked at
+"""
+from io import StringIO
+
+from vbwise import gnmllines
+
+
+def blocks(text, offset=0):
+    """
+        text
+            : str
+            : gnml, from the start of a line
+
+        offset
+            : int
+            : added to spans and error offsets
+
+        yields
+            -> tuple
+            -> (node, start, end)
+
+        raises
+            ! ValueError
+    """
+    at = {'line': offset, 'end': offset, 'start': offset}
+
+    def lines():
+        for line in StringIO(text):
+            at['line'] = at['end']
+            at['end'] += len(line)
+            if gnmllines.NODE_START.fullmatch(line.rstrip('\n')):
+                at['start'] = at['line']  # only valid between nodes
+            yield line
+
+    for node in gnmllines.iter_nodes(lines(), offset):
+        yield node, at['start'], at['end']
+
+
+class GnmlDoc:
+    """
+        GnmlDoc
+            : parsed gnml text that takes edits
+            : nodes -> list, spliced in place by edit
+    """
+
+    def __init__(self, text):
+        """
+            text
+                : str
+                : gnml source
+
+            raises
+                ! ValueError
+        """
+        self.nodes = []
+        self._chunks = []  # chunk k + 1 -> block k and the gap after it
+        self._block = []  # block length at the head of each chunk
+        self._starts = []  # chunk starts, _step added from _step_from on
+        self._step_from = 0
+        self._step = 0
+        self._splice(0, 0, text, 0, 0)
+        self._len = len(text)
+
+    def __len__(self):
+        return self._len
+
+    @property
+    def text(self):
+        return ''.join(self._chunks)
+
+    @property
+    def spans(self):
+        return [
+            (self._start(k), self._start(k) + self._block[k])
+            for k in range(1, len(self._chunks))
+        ]
+
+    def _start(self, k):
+        return self._starts[k] + (self._step if k >= self._step_from else 0)
+
+    def _move_step(self, k):
+        # same starts on read, pending step now begins at chunk k
+        starts, step = self._starts, self._step
+        if step:
+            for m in range(self._step_from, min(k, len(starts))):
+                starts[m] += step
+            for m in range(k, self._step_from):
+                starts[m] -= step
+        self._step_from = k
+
+    def _chunk_at(self, offset):
+        # last chunk starting at or before offset
+        lo, hi = 0, len(self._chunks) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._start(mid) <= offset:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def _splice(self, a, d, window, w0, head):
+        """
+            chunks a through d - 1 replaced by head chars of chunk a plus
+            the parsed window at w0 -> returns the new nodes
+        """
+        found = list(blocks(window, w0))
+        prefix = self._chunks[a][:head] if a < len(self._chunks) else ''
+        cut = [start - w0 for _, start, _ in found] + [len(window)]
+
+        chunks = [prefix + window[:cut[0]]]
+        lengths = [head]
+        starts = [w0 - head]
+        for m, (_, start, end) in enumerate(found):
+            chunks.append(window[cut[m]:cut[m + 1]])
+            lengths.append(end - start)
+            starts.append(start)
+
+        self._chunks[a:d] = chunks
+        self._block[a:d] = lengths
+        self._starts[a:d] = starts
+        nodes = [node for node, _, _ in found]
+        self.nodes[a:max(a, d - 1)] = nodes
+        return nodes
+
+    def edit(self, offset, removed, inserted):
+        """
+            offset
+                : int
+                : where the edit starts in the current text
+
+            removed
+                : int
+                : chars taken out from offset on
+
+            inserted
+                : str
+                : put in their place
+
+            returns
+                > dict
+                > {'added', 'changed', 'removed'} -> node ids
+
+            raises
+                ! ValueError
+        """
+        edit_end = offset + removed
+        if offset < 0 or removed < 0 or edit_end > self._len:
+            raise ValueError('edit outside the text', offset, removed)
+
+        # window -> from chunk a after its block through the end of chunk d
+        c = self._chunk_at(offset)
+        a = c - 1 if offset < self._start(c) + self._block[c] else c
+        d = self._chunk_at(edit_end)
+        w0 = self._start(a) + self._block[a]
+        old = ''.join([self._chunks[a][self._block[a]:]] + self._chunks[a + 1:d + 1])
+        window = old[:offset - w0] + inserted + old[edit_end - w0:]
+        delta = len(inserted) - removed
+
+        # nothing changes before blocks parses -> a bad edit leaves doc as is
+        self._move_step(d + 1)
+        before = self.nodes[a:d]
+        count = len(self._chunks)
+        new = self._splice(a, d + 1, window, w0, self._block[a])
+        self._step_from += len(self._chunks) - count
+        self._step += delta
+        self._len += delta
+
+        old_ids = {node['id']: node for node in before}
+        new_ids = {node['id']: node for node in new}
+        return {
+            'added': [k for k in new_ids if k not in old_ids],
+            'changed': [k for k in new_ids if k in old_ids and new_ids[k] != old_ids[k]],
+            'removed': [k for k in old_ids if k not in new_ids],
+        }
+
+
+if __name__ == '__main__':
+    from vbwise.gnmlgrammar import EXAMPLE_SOURCE
+    from vbwise.load import gnml_string
+
+    doc = GnmlDoc(EXAMPLE_SOURCE)
+    assert doc.nodes == gnml_string(EXAMPLE_SOURCE)
+    assert doc.text == EXAMPLE_SOURCE
+
+    second = doc.nodes[1]['id']
+    at = EXAMPLE_SOURCE.index('return x**2') + len('return x**')
+    changes = doc.edit(at, 1, '3')
+    assert changes == {'added': [], 'changed': [second], 'removed': []}
+    assert doc.nodes == gnml_string(doc.text)
+    assert doc.spans == GnmlDoc(doc.text).spans
+
+    try:
+        doc.edit(0, 0, 'stray')
+    except ValueError as e:
+        assert e.args[1] == 0
+    else:
+        raise AssertionError('accepted stray text')
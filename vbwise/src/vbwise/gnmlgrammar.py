@@ -6,7 +6,7 @@
 from parsimonious.grammar import Grammar
 from parsimonious.nodes import Node
 
-from vbwise.igrammar import IGrammar
+from vbwise.igrammar import IGrammar, compiled
 
 
 GNML_GRAMMAR = r'''
@@ -80,7 +80,7 @@ def gnml_tree(source):
             ! ValueError
 
     """
-    tree = IGrammar(GNML_GRAMMAR).parse(source)
+    tree = compiled(GNML_GRAMMAR).parse(source)
     return tree
 
 
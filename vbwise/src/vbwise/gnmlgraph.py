@@ -0,0 +1,300 @@
+"""
+    | teleorithm |
+
+    gnml node list -> graph of next / prev links, walked by integer
+
+    USAGE
+    ---------
+    graph = GnmlGraph(load.gnml_file('kb.gnml'))
+
+    graph.neighbors('a.b')  # ['a.c', ...] -> 'next', 'prev' or 'both'
+    list(graph.bfs('a.b')), list(graph.dfs('a.b', 'prev'))
+    graph.reachable('a.b', 'x.y') -> bool
+    graph.shortest_path('a.b', 'x.y') -> ['a.b', ..., 'x.y'] or None
+    graph.node('a.b') -> the node dict, None for an id only linked to
+    ---------
+    ids interned -> graph.index[id] is the node's position in the list
+        linked ids with no node of their own come after, first seen first
+        from next lists, then from prev lists
+    a link u -> v is declared by v in u's next list, u in v's prev list
+        or both -> either side is enough, a link on both sides is not doubled
+    CSR per direction -> offsets[i]:offsets[i + 1] slices targets
+        'next' -> the node's next list in link order, then nodes whose
+            prev list alone names it, in node order
+        'prev' -> the node's prev list in link order, then nodes whose
+            next list alone names it, in node order
+        'both' joins the two
+        array('q') -> 8 bytes a slot, no object per link
+
+    both columns interned with map, links keyed as v * size + u
+        -> a set per side finds links the other side lacks, no loop per link
+        -> prev lists that mirror the next lists splice nothing
+    one-sided links sorted by owner and spliced into the other direction's
+        CSR a run of owners at a time, built with the graph
+
+    duplicate node id -> ValueError
+"""
+from array import array
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate, chain, filterfalse, repeat
+from operator import add, floordiv, mod, mul
+
+
+def _offsets(lists, size):
+    # one adjacency list per node, in node order -> no sort needed
+    offsets = array('q', accumulate(map(len, lists), initial=0))
+    offsets.extend(repeat(offsets[-1], size - len(lists)))
+    return offsets
+
+
+def _owners(lists, step):
+    # list position of each link, times step -> one column, no loop
+    starts = range(0, len(lists) * step, step)
+    return chain.from_iterable(map(repeat, starts, map(len, lists)))
+
+
+def _merged(offsets, targets, extra, size):
+    # extra -> sorted owner * size + target, links only the other side
+    # declared -> each owner's go after its own, spliced in run by run
+    if not extra:
+        return offsets, targets
+    owners = list(map(floordiv, extra, repeat(size)))
+    linked = array('q', map(mod, extra, repeat(size)))
+    counts = [0] * len(offsets)
+    merged = array('q')
+    end = j = 0
+    while j < len(owners):
+        owner = owners[j]
+        k = bisect_right(owners, owner, j)
+        merged += targets[end:offsets[owner + 1]]
+        merged += linked[j:k]
+        counts[owner + 1] = k - j
+        end = offsets[owner + 1]
+        j = k
+    merged += targets[end:]
+    return array('q', map(add, offsets, accumulate(counts))), merged
+
+
+class GnmlGraph:
+    """
+        GnmlGraph
+            : read-only next / prev links of a gnml node list
+    """
+
+    def __init__(self, nodes):
+        """
+            nodes
+                : list
+                : gnml node dicts, (eg) from load.gnml_file
+
+            raises
+                ! ValueError -> duplicate node id
+        """
+        self.nodes = nodes
+        self.ids = [node['id'] for node in nodes]
+        self.index = dict(zip(self.ids, range(len(self.ids))))
+        if len(self.index) != len(self.ids):
+            seen = set()
+            for node_id in self.ids:
+                if node_id in seen:
+                    raise ValueError('duplicate node id', node_id)
+                seen.add(node_id)
+
+        nexts = [node['next'] for node in nodes]
+        prevs = [node['prev'] for node in nodes]
+        next_targets = self._intern(list(chain.from_iterable(nexts)))
+        prev_targets = self._intern(list(chain.from_iterable(prevs)))
+        size = len(self.ids)
+
+        # link u -> v as one int v * size + u, whichever side declared it
+        by_next = list(map(add, map(mul, next_targets, repeat(size)), _owners(nexts, 1)))
+        by_prev = list(map(add, _owners(prevs, size), prev_targets))
+        only_next = sorted(filterfalse(set(by_prev).__contains__, by_next))
+        only_prev = filterfalse(set(by_next).__contains__, by_prev)
+        only_prev = sorted(k % size * size + k // size for k in only_prev)
+
+        self._next = _merged(_offsets(nexts, size), next_targets, only_prev, size)
+        self._prev = _merged(_offsets(prevs, size), prev_targets, only_next, size)
+
+    def _intern(self, linked):
+        # one dict lookup per link, the rare miss -> dangling id interned
+        found = list(map(self.index.get, linked))
+        if None in found:
+            for k in [k for k, i in enumerate(found) if i is None]:
+                found[k] = self.index.setdefault(linked[k], len(self.ids))
+                if found[k] == len(self.ids):
+                    self.ids.append(linked[k])
+        return array('q', found)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, node_id):
+        return node_id in self.index
+
+    def node(self, node_id):
+        """
+            node_id
+                : str
+
+            returns
+                > dict or None
+                > None for an id that is only linked to
+
+            raises
+                ! KeyError
+        """
+        i = self.index[node_id]
+        return self.nodes[i] if i < len(self.nodes) else None
+
+    def _adjacent(self, i, direction):
+        if direction == 'both':
+            return chain(self._adjacent(i, 'next'), self._adjacent(i, 'prev'))
+        if direction == 'next':
+            offsets, targets = self._next
+        elif direction == 'prev':
+            offsets, targets = self._prev
+        else:
+            raise ValueError('unknown direction', direction)
+        return targets[offsets[i]:offsets[i + 1]]
+
+    def neighbors(self, node_id, direction='next'):
+        """
+            node_id
+                : str
+
+            direction
+                : str
+                : 'next' -> linked to, 'prev' -> linked from, 'both'
+
+            returns
+                > list[str]
+
+            raises
+                ! KeyError
+        """
+        ids = self.ids
+        return [ids[j] for j in self._adjacent(self.index[node_id], direction)]
+
+    def _bfs(self, start, direction):
+        # yields (index, parent index) -> parent -1 for start
+        seen = bytearray(len(self.ids))
+        seen[start] = 1
+        queue = deque([(start, -1)])
+        while queue:
+            i, parent = queue.popleft()
+            yield i, parent
+            for j in self._adjacent(i, direction):
+                if not seen[j]:
+                    seen[j] = 1
+                    queue.append((j, i))
+
+    def bfs(self, node_id, direction='next'):
+        """
+            node_id
+                : str
+
+            direction
+                : str
+                : see neighbors
+
+            yields
+                -> str
+                -> ids nearest first, node_id first
+
+            raises
+                ! KeyError
+        """
+        ids = self.ids
+        for i, _ in self._bfs(self.index[node_id], direction):
+            yield ids[i]
+
+    def dfs(self, node_id, direction='next'):
+        """
+            node_id
+                : str
+
+            direction
+                : str
+                : see neighbors
+
+            yields
+                -> str
+                -> ids in preorder, neighbors in link order
+
+            raises
+                ! KeyError
+        """
+        ids = self.ids
+        seen = bytearray(len(ids))
+        stack = [self.index[node_id]]
+        while stack:
+            i = stack.pop()
+            if seen[i]:
+                continue
+            seen[i] = 1
+            yield ids[i]
+            stack.extend(reversed(self._adjacent(i, direction)))
+
+    def reachable(self, node_id, target, direction='next'):
+        """
+            node_id, target
+                : str
+
+            direction
+                : str
+                : see neighbors
+
+            returns
+                > bool
+
+            raises
+                ! KeyError
+        """
+        goal = self.index[target]
+        return any(i == goal for i, _ in self._bfs(self.index[node_id], direction))
+
+    def shortest_path(self, node_id, target, direction='next'):
+        """
+            node_id, target
+                : str
+
+            direction
+                : str
+                : see neighbors
+
+            returns
+                > list[str] or None
+                > fewest links, both ends included -> None when unreachable
+
+            raises
+                ! KeyError
+        """
+        goal = self.index[target]
+        parents = {}
+        for i, parent in self._bfs(self.index[node_id], direction):
+            parents[i] = parent
+            if i == goal:
+                path = []
+                while i != -1:
+                    path.append(self.ids[i])
+                    i = parents[i]
+                return path[::-1]
+        return None
+
+
+if __name__ == '__main__':
+    from vbwise.gnmlgrammar import EXAMPLE_SOURCE
+    from vbwise.load import gnml_string
+
+    nodes = gnml_string(EXAMPLE_SOURCE)
+    graph = GnmlGraph(nodes)
+    first = nodes[0]['id']
+    assert graph.node(first) is nodes[0]
+    assert graph.neighbors(first) == nodes[0]['next']
+    assert graph.shortest_path(first, first) == [first]  # links to itself
+    assert graph.shortest_path(first, 'first.branch2.1') == [first, 'first.branch2.1']
+    assert graph.neighbors('first.branch2.1', 'prev') == [first]  # next turned around
+    assert graph.neighbors('first.branch.20') == [first]  # prev turned around
+    assert graph.node('first.branch2.1') is None
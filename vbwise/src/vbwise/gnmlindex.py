@@ -0,0 +1,247 @@
+"""
+    | teleorithm |
+
+    one node by id without parsing the whole kb
+
+    USAGE
+    ---------
+    with GnmlStore('kb.gnml') as store:
+        node = store['first.branch.22']  # parses that block only
+        source = store.text('first.branch.22')
+        'x.y' in store, len(store), list(store)  # ids in file order
+
+    OR
+
+    index = load_index('kb.gnml')  # {id: (byte_offset, length)}
+    ---------
+    index -> built in one pass of gnmllines.iter_nodes over the file bytes
+          -> block runs from its ### NODE line through its ### ENDNODE\\n
+    sidecar -> kb.gnml.idx next to the file, marshal, atomic.write_bytes
+            -> kept while mtime_ns and size still match, else rebuilt
+    store -> mmap of the file, blocks parsed on demand
+          -> LRU of parsed nodes, cache_size of them
+
+    lines split on \\n, \\r\\n read as \\n, utf-8
+    -> same nodes as gnml_file except for old mac \\r-only line ends
+    duplicate id -> ValueError, one id one block
+"""
+import marshal
+import mmap
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from vbwise import atomic, gnmllines
+
+
+INDEX_VERSION = 1
+
+
+def sidecar_path(path):
+    """ kb.gnml -> kb.gnml.idx """
+    path = Path(path)
+    return path.with_name(path.name + '.idx')
+
+
+def build_index(path):
+    """
+        path
+            : str or Path
+            : gnml file
+
+        returns
+            > dict
+            > {id: (byte_offset, length)} in file order
+
+        raises
+            ! ValueError
+            ! (eg) for a bad line, offset in bytes
+    """
+    index = {}
+    at = {'line': 0, 'end': 0, 'start': 0, 'done': False}
+
+    def lines(r):
+        for raw in r:
+            at['line'] = at['end']
+            at['end'] += len(raw)
+            line = raw.decode('utf-8')
+            if line.endswith('\r\n'):
+                line = line[:-2] + '\n'
+            if gnmllines.NODE_START.fullmatch(line.rstrip('\n')):
+                at['start'] = at['line']  # only valid between nodes
+            yield line
+        at['done'] = True
+
+    with open(path, 'rb') as r:
+        try:
+            for node in gnmllines.iter_nodes(lines(r)):
+                if node['id'] in index:
+                    raise ValueError('duplicate node id', node['id'], at['start'])
+                index[node['id']] = (at['start'], at['end'] - at['start'])
+        except ValueError as e:
+            if len(e.args) == 2:
+                raise ValueError(e.args[0], at['end'] if at['done'] else at['line'])
+            raise
+    return index
+
+
+def save_index(path, index):
+    """
+        path
+            : str or Path
+            : gnml file the index was built from -> its stat goes in too
+
+        index
+            : dict
+            : from build_index
+    """
+    st = os.stat(path)
+    side = sidecar_path(path)
+    data = {
+        'version': INDEX_VERSION,
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+        'index': index,
+    }
+    atomic.write_bytes(side, marshal.dumps(data))
+
+
+def load_index(path):
+    """
+        path
+            : str or Path
+            : gnml file
+
+        returns
+            > dict
+            > {id: (byte_offset, length)}, from the sidecar while it is fresh
+
+        raises
+            ! ValueError
+    """
+    st = os.stat(path)
+    try:
+        with open(sidecar_path(path), 'rb') as r:
+            data = marshal.load(r)
+    except FileNotFoundError:
+        data = None
+    except (EOFError, ValueError, TypeError):
+        data = None  # broken sidecar -> rebuilt and rewritten
+
+    if (
+        isinstance(data, dict)
+        and data.get('version') == INDEX_VERSION
+        and data.get('mtime_ns') == st.st_mtime_ns
+        and data.get('size') == st.st_size
+    ):
+        return data['index']
+
+    index = build_index(path)
+    try:
+        save_index(path, index)
+    except OSError:
+        pass  # read-only directory -> index still returned
+    return index
+
+
+class GnmlStore:
+    """
+        GnmlStore
+            : read-only mapping of node id -> node dict over one gnml file
+            : returned nodes are shared with the cache -> do not mutate
+    """
+
+    def __init__(self, path, cache_size=1024):
+        """
+            path
+                : str or Path
+
+            cache_size
+                : int
+                : parsed nodes kept, least recently used dropped first
+
+            raises
+                ! ValueError
+        """
+        self.path = Path(path)
+        self.cache_size = cache_size
+        self.index = load_index(self.path)
+        self._cache = OrderedDict()
+        self._file = open(self.path, 'rb')
+        if os.fstat(self._file.fileno()).st_size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = b''  # an empty file cannot be mapped
+
+    def text(self, node_id):
+        """
+            node_id
+                : str
+
+            returns
+                > str
+                > source of that one node, \\r\\n read as \\n
+
+            raises
+                ! KeyError
+        """
+        offset, length = self.index[node_id]
+        raw = self._map[offset:offset + length]
+        return raw.decode('utf-8').replace('\r\n', '\n')
+
+    def __getitem__(self, node_id):
+        node = self._cache.get(node_id)
+        if node is not None:
+            self._cache.move_to_end(node_id)
+            return node
+
+        node = gnmllines.node_from_text(self.text(node_id))
+        self._cache[node_id] = node
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return node
+
+    def get(self, node_id, default=None):
+        try:
+            return self[node_id]
+        except KeyError:
+            return default
+
+    def __contains__(self, node_id):
+        return node_id in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    from tempfile import TemporaryDirectory
+
+    from vbwise.gnmlgrammar import EXAMPLE_SOURCE
+    from vbwise.load import gnml_string
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'kb.gnml'
+        path.write_text(EXAMPLE_SOURCE)
+
+        with GnmlStore(path, cache_size=1) as store:
+            assert [store[i] for i in store] == gnml_string(EXAMPLE_SOURCE)
+            assert sidecar_path(path).exists()
+            assert len(store._cache) == 1
+
+        # sidecar reused while the file is unchanged
+        assert load_index(path) == build_index(path)
@@ -0,0 +1,209 @@
+"""
+    | teleorithm |
+
+    gnml one line at a time -> one node dict at a time
+
+    USAGE
+    ---------
+    with open('kb.gnml', 'rt') as r:
+        for node in iter_nodes(r):
+            node -> {'id', 'meta', 'tags', 'next', 'prev',
+                     'text_lines', 'code_lines'}
+
+    OR
+
+    for node in load.iter_gnml('kb.gnml'):
+        pass
+
+    node = node_from_text(one_node_source)
+    ---------
+    same language as GNML_GRAMMAR, same dicts as GNMLVisitor.visit_node_def
+        between nodes -> lines of space, tab, \\r only
+        ### NODE, then the id line straight after
+        first content line and ### ENDNODE may be indented, others not
+        T1> or C1> content -> leading spaces and tabs dropped
+        every line ends in \\n, the last ### ENDNODE too
+
+    each line type is one regex with possessive quantifiers
+    -> no backtracking, like the PEG it mirrors
+
+    bad line -> ValueError with the offset of that line
+    nodes before it were already yielded
+"""
+import re
+from io import StringIO
+
+
+S = r'[ \t]*+'
+ID = r'[a-zA-Z0-9_]++'
+CID = rf'{ID}(?:\.{ID})*+'
+KV = rf'({ID}){S}={S}({CID})'
+
+BLANK = re.compile(r'[\r\t ]*+')
+NODE_START = re.compile(rf'[\r\t ]*+### NODE{S}')
+ID_LINE = re.compile(rf'{S}---{S}id{S}:{S}({CID}){S}')
+NODE_END = re.compile(rf'{S}### ENDNODE{S}')
+
+META_LINE = re.compile(
+    rf'---{S}meta{S}:{S}((?:{ID}{S}={S}{CID})(?:{S},{S}{ID}{S}={S}{CID})*+)?+{S}'
+)
+TAGS_LINE = re.compile(rf'---{S}tags{S}:{S}({ID}(?:{S},{S}{ID})*+)?+{S}')
+NEXT_LINE = re.compile(rf'---{S}next{S}:{S}({CID}(?:{S},{S}{CID})*+)?+{S}')
+PREV_LINE = re.compile(rf'---{S}prev{S}:{S}({CID}(?:{S},{S}{CID})*+)?+{S}')
+TEXT_LINE = re.compile(rf'(T[1-3])>{S}([^\n]*+)')
+CODE_LINE = re.compile(rf'(C[1-3])>{S}([^\n]*+)')
+
+_kv = re.compile(KV)
+_id = re.compile(ID)
+_cid = re.compile(CID)
+
+
+def new_node(node_id):
+    """ same keys, same order as GNMLVisitor.visit_node_def """
+    return {
+        'id': node_id,
+        'meta': {},
+        'tags': [],
+        'next': [],
+        'prev': [],
+        'text_lines': [],
+        'code_lines': [],
+    }
+
+
+def add_line(node, body):
+    """
+        node
+            : dict
+            : from new_node, filled in place
+
+        body
+            : str
+            : one content line without its \\n
+
+        returns
+            > bool
+            > False when body is no content line
+    """
+    if body.startswith('---'):
+        m = META_LINE.fullmatch(body)
+        if m:
+            if m[1]:
+                node['meta'].update(_kv.findall(m[1]))
+            return True
+        for key, pattern, found in (
+            ('tags', TAGS_LINE, _id),
+            ('next', NEXT_LINE, _cid),
+            ('prev', PREV_LINE, _cid),
+        ):
+            m = pattern.fullmatch(body)
+            if m:
+                if m[1]:
+                    node[key].extend(found.findall(m[1]))
+                return True
+        return False
+
+    m = TEXT_LINE.fullmatch(body)
+    if m:
+        node['text_lines'].append({'level': m[1], 'content': m[2]})
+        return True
+    m = CODE_LINE.fullmatch(body)
+    if m:
+        node['code_lines'].append({'level': m[1], 'content': m[2]})
+        return True
+    return False
+
+
+def iter_nodes(lines, offset=0):
+    """
+        lines
+            : iterable of str
+            : each ending in \\n except maybe the last -> (eg) an open file
+
+        offset
+            : int
+            : added to offsets in errors -> where lines start in the source
+
+        yields
+            -> dict
+            -> one node, same shape as GNMLVisitor.visit_node_def
+
+        raises
+            ! ValueError
+    """
+    node = None
+    first = False  # next line is the first content line -> may be indented
+    expect_id = False
+
+    for line in lines:
+        complete = line.endswith('\n')
+        body = line[:-1] if complete else line
+
+        if expect_id:
+            m = ID_LINE.fullmatch(body)
+            if not (m and complete):
+                raise ValueError('no valid path for this source', offset)
+            node = new_node(m[1])
+            expect_id = False
+            first = True
+
+        elif node is None:
+            if BLANK.fullmatch(body):
+                pass
+            elif complete and NODE_START.fullmatch(body):
+                expect_id = True
+            else:
+                raise ValueError('no valid path for this source', offset)
+
+        elif not complete:
+            raise ValueError('no valid path for this source', offset)
+
+        elif NODE_END.fullmatch(body):
+            yield node
+            node = None
+
+        else:
+            if first:
+                body = body.lstrip(' \t')
+                first = False
+            if not add_line(node, body):
+                raise ValueError('no valid path for this source', offset)
+
+        offset += len(line)
+
+    if node is not None or expect_id:
+        raise ValueError('no valid path for this source', offset)
+
+
+def node_from_text(text):
+    """
+        text
+            : str
+            : ### NODE through ### ENDNODE\\n of exactly one node
+
+        returns
+            > dict
+
+        raises
+            ! ValueError
+    """
+    found = list(iter_nodes(StringIO(text)))
+    if len(found) != 1:
+        raise ValueError('expected exactly one node', len(found))
+    return found[0]
+
+
+if __name__ == '__main__':
+    from vbwise.gnmlgrammar import EXAMPLE_SOURCE
+    from vbwise.load import gnml_string
+
+    nodes = list(iter_nodes(StringIO(EXAMPLE_SOURCE)))
+    assert nodes == gnml_string(EXAMPLE_SOURCE)
+    assert nodes[1]['code_lines'][1] == {'level': 'C1', 'content': 'return x**2'}
+
+    try:
+        list(iter_nodes(StringIO(EXAMPLE_SOURCE + 'stray\n')))
+    except ValueError as e:
+        assert e.args[1] == len(EXAMPLE_SOURCE)
+    else:
+        raise AssertionError('accepted stray line')
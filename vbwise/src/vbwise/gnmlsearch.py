@@ -0,0 +1,330 @@
+"""
+    | teleorithm |
+
+    full-text search over text_lines and code_lines, ranked by BM25
+
+    USAGE
+    ---------
+    index = GnmlSearch(load.gnml_file('kb.gnml'))
+
+    index.search('moon stars')  # [(id, score), ...] best first
+    index.search('"return x"', levels='C')  # phrase, code lines only
+    index.search('truth', levels=['T1', 'C1'], limit=5)
+
+    index.update(node), index.remove('x.y')  # as nodes change
+
+    index.save('kb.search')
+    index = GnmlSearch.load('kb.search')  # no re-tokenizing
+    ---------
+    tokens -> runs of word chars, casefolded
+    postings -> term -> {slot: (code, ...)}
+        code -> position << 3 | level number, one int per occurrence
+        positions count through the node's lines, one gap after each
+        line -> a phrase never spans two lines
+        next word of a phrase -> code + 8 -> same line, same level
+    query -> every word and "quoted phrase" must match -> AND
+          -> levels 'T', 'C', 'T1' .. 'C3' or a list of them, None -> all
+          -> rarest term first, the others only looked up per candidate
+    score -> BM25 over the query's terms, k1 = 1.2, b = 0.75
+          -> tf and length counted in the chosen levels only
+          -> idf over every level
+
+    save -> marshal, atomic.write_bytes, FORMAT checked on load
+         -> tuples of ints, no object per level -> reopen beats a rebuild
+"""
+import marshal
+import re
+from heapq import nsmallest
+from itertools import chain
+from math import log
+
+from vbwise import atomic
+
+
+FORMAT = 1
+LEVELS = ('T1', 'T2', 'T3', 'C1', 'C2', 'C3')
+CODE = {level: k for k, level in enumerate(LEVELS)}
+K1 = 1.2
+B = 0.75
+
+TOKEN = re.compile(r'\w+')
+PHRASE = re.compile(r'"([^"]*)"')
+
+
+def tokens(text):
+    """ 'Return x**2' -> ['return', 'x', '2'] """
+    return [t.casefold() for t in TOKEN.findall(text)]
+
+
+def levels_of(levels):
+    """
+        levels
+            : None, str or iterable of str
+            : 'T' -> T1 to T3, 'C' -> C1 to C3, 'T2' -> T2
+
+        returns
+            > tuple
+            > matching entries of LEVELS
+
+        raises
+            ! ValueError
+    """
+    if levels is None:
+        return LEVELS
+    if isinstance(levels, str):
+        levels = [levels]
+    chosen = set()
+    for spec in levels:
+        found = [level for level in LEVELS if level.startswith(spec)] if spec else []
+        if not found:
+            raise ValueError('unknown level', spec)
+        chosen.update(found)
+    return tuple(level for level in LEVELS if level in chosen)
+
+
+class GnmlSearch:
+    """
+        GnmlSearch
+            : positional inverted index of gnml node content
+    """
+
+    def __init__(self, nodes=()):
+        """
+            nodes
+                : iterable of dict
+                : gnml nodes, (eg) from load.gnml_file
+
+            raises
+                ! ValueError -> duplicate node id
+        """
+        self._slot = {}
+        self._ids = []  # slot -> id, None while free
+        self._free = []
+        self._postings = {}
+        self._lengths = {}  # slot -> tokens per level number
+        self._totals = [0] * len(LEVELS)
+        self._terms = {}  # slot -> terms it was posted under
+
+        for node in nodes:
+            if node['id'] in self._slot:
+                raise ValueError('duplicate node id', node['id'])
+            self._put(node)
+
+    def __len__(self):
+        return len(self._slot)
+
+    def __contains__(self, node_id):
+        return node_id in self._slot
+
+    def _put(self, node):
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot] = node['id']
+        else:
+            slot = len(self._ids)
+            self._ids.append(node['id'])
+        self._slot[node['id']] = slot
+
+        own = {}  # term -> codes in this node
+        lengths = [0] * len(LEVELS)
+        position = 0
+        for line in chain(node['text_lines'], node['code_lines']):
+            code = CODE[line['level']]
+            words = tokens(line['content'])
+            for word in words:
+                own.setdefault(word, []).append(position << 3 | code)
+                position += 1
+            position += 1  # gap -> phrases stay inside one line
+            lengths[code] += len(words)
+
+        postings = self._postings
+        for term, codes in own.items():
+            docs = postings.get(term)
+            if docs is None:
+                docs = postings[term] = {}
+            docs[slot] = tuple(codes)
+        self._terms[slot] = tuple(own)
+        self._lengths[slot] = tuple(lengths)
+        self._totals = [a + b for a, b in zip(self._totals, lengths)]
+
+    def update(self, node):
+        """
+            node
+                : dict
+                : gnml node -> replaces the indexed node with its id
+        """
+        if node['id'] in self._slot:
+            self.remove(node['id'])
+        self._put(node)
+
+    def remove(self, node_id):
+        """
+            node_id
+                : str
+
+            raises
+                ! KeyError
+        """
+        slot = self._slot.pop(node_id)
+        for term in self._terms.pop(slot):
+            docs = self._postings[term]
+            del docs[slot]
+            if not docs:
+                del self._postings[term]
+        lengths = self._lengths.pop(slot)
+        self._totals = [a - b for a, b in zip(self._totals, lengths)]
+        self._ids[slot] = None
+        self._free.append(slot)
+
+    def _has_phrase(self, slot, phrase, mask):
+        found = [self._postings[term][slot] for term in phrase]
+        later = [(8 * k, set(codes)) for k, codes in enumerate(found[1:], 1)]
+        return any(
+            mask >> (start & 7) & 1 and all(start + step in codes for step, codes in later)
+            for start in found[0]
+        )
+
+    def search(self, query, levels=None, limit=10):
+        """
+            query
+                : str
+                : words and "quoted phrases", all must match
+
+            levels
+                : None, str or iterable of str
+                : see levels_of
+
+            limit
+                : int
+                : best results kept, None -> all
+
+            returns
+                > list[tuple]
+                > (id, score) best first, ties in slot order
+
+            raises
+                ! ValueError -> unknown level
+        """
+        picked = [CODE[level] for level in levels_of(levels)]
+        mask = sum(1 << code for code in picked)
+        every = len(picked) == len(LEVELS)
+        phrases = [tokens(p) for p in PHRASE.findall(query)]
+        words = tokens(PHRASE.sub(' ', query))
+        terms = list(dict.fromkeys(words + [t for p in phrases for t in p]))
+        if not terms or not self._slot:
+            return []
+
+        # rarest term first -> fewest candidates carried along
+        postings = self._postings
+        terms.sort(key=lambda t: len(postings.get(t, ())))
+        tfs = {}
+        candidates = None
+        for term in terms:
+            docs = postings.get(term, {})
+            if candidates is None:
+                found = docs.items()
+            else:
+                found = [(slot, docs[slot]) for slot in candidates if slot in docs]
+            if every:
+                tf = {slot: len(codes) for slot, codes in found}
+            else:
+                tf = {}
+                for slot, codes in found:
+                    f = sum(mask >> (c & 7) & 1 for c in codes)
+                    if f:
+                        tf[slot] = f
+            if not tf:
+                return []
+            tfs[term] = tf
+            candidates = tf.keys()
+
+        for phrase in phrases:
+            if len(phrase) > 1:
+                candidates = [s for s in candidates if self._has_phrase(s, phrase, mask)]
+
+        n = len(self._slot)
+        avgdl = sum(self._totals[code] for code in picked) / n or 1.0
+        norm = {}
+        for slot in candidates:
+            lengths = self._lengths[slot]
+            dl = sum(lengths) if every else sum(lengths[code] for code in picked)
+            norm[slot] = K1 * (1 - B + B * dl / avgdl)
+        scores = dict.fromkeys(norm, 0.0)
+        for term, tf in tfs.items():
+            df = len(postings[term])
+            idf = log(1 + (n - df + 0.5) / (df + 0.5))
+            for slot in norm:
+                f = tf[slot]
+                scores[slot] += idf * f * (K1 + 1) / (f + norm[slot])
+
+        rank = lambda slot: (-scores[slot], slot)
+        if limit is None:
+            ranked = sorted(scores, key=rank)
+        else:
+            ranked = nsmallest(limit, scores, key=rank)
+        return [(self._ids[slot], scores[slot]) for slot in ranked]
+
+    def save(self, path):
+        """
+            path
+                : str or Path
+                : its directory must exist
+        """
+        data = {
+            'format': FORMAT,
+            'ids': self._ids,
+            'free': self._free,
+            'postings': self._postings,
+            'lengths': self._lengths,
+            'totals': self._totals,
+            'terms': self._terms,
+        }
+        atomic.write_bytes(path, marshal.dumps(data))
+
+    @classmethod
+    def load(cls, path):
+        """
+            path
+                : str or Path
+                : written by save
+
+            returns
+                > GnmlSearch
+
+            raises
+                ! ValueError -> other FORMAT or not an index
+        """
+        with open(path, 'rb') as r:
+            blob = r.read()  # marshal.load on a file reads in small pieces
+        try:
+            data = marshal.loads(blob)
+        except (EOFError, TypeError, ValueError) as e:
+            raise ValueError('not a search index', str(path)) from e
+        if not isinstance(data, dict) or data.get('format') != FORMAT:
+            raise ValueError('not a search index', str(path))
+
+        index = cls()
+        index._ids = data['ids']
+        index._free = data['free']
+        index._postings = data['postings']
+        index._lengths = data['lengths']
+        index._totals = data['totals']
+        index._terms = data['terms']
+        index._slot = {
+            node_id: slot for slot, node_id in enumerate(index._ids)
+            if node_id is not None
+        }
+        return index
+
+
+if __name__ == '__main__':
+    from vbwise.gnmlgrammar import EXAMPLE_SOURCE
+    from vbwise.load import gnml_string
+
+    nodes = gnml_string(EXAMPLE_SOURCE)
+    index = GnmlSearch(nodes)
+    code_node = nodes[1]['id']
+    assert [i for i, _ in index.search('"return x"', levels='C')] == [code_node]
+    assert index.search('"return x"', levels='T') == []
+    assert index.search('"x return"') == []
+    assert [i for i, _ in index.search('TRUTH')] == [nodes[0]['id']]
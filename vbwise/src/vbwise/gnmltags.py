@@ -0,0 +1,306 @@
+"""
+    | teleorithm |
+
+    tags and meta -> node ids, boolean queries without scanning nodes
+
+    USAGE
+    ---------
+    index = GnmlTagIndex(load.gnml_file('kb.gnml'))
+
+    hits = index.tag('a') & index.tag('b') & index.meta('author', 'kDoSE')
+    hits.ids() -> ['x.y', ...], len(hits) -> count
+
+    index.tag('a') | index.tag('b'), ~index.tag('a'), hits - index.tag('c')
+    index.meta_prefix('author', 'kD')
+    index.meta_range('version', '1.2', '1.10')  # 1.2 <= v < 1.10
+    index.all()
+
+    index.update(node)  # added, or replaces the node with that id
+    index.remove('x.y')
+    ---------
+    slot -> small int per live node, freed slots reused
+    postings -> ('tag', t) or ('meta', k, v) -> set of slots
+    queries -> python int bitmaps, bit n for slot n
+        & | ~ -> one pass over n / 64 words in C
+        bitmaps of dense terms cached, patched by updates
+        -> cached when one in 64 slots or more -> no bigger than an array
+    ids -> bitmap spelled out by bin, picked by itertools.compress
+
+    range -> natural order, dotted or _ parts compared as numbers when
+             digits -> 1.2.10 after 1.2.9
+    prefix -> plain string prefix of the value
+"""
+import re
+from bisect import bisect_left, insort
+from itertools import chain, compress
+
+
+ONES = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def natural(value):
+    """ '1.2.10' -> ((0, 1), (0, 2), (0, 10)) """
+    return tuple(
+        (0, int(part)) if part.isdigit() else (1, part)
+        for part in re.split(r'[._]', value)
+    )
+
+
+class Hits:
+    """
+        Hits
+            : set of nodes as a bitmap over an index's slots
+    """
+
+    __slots__ = ('index', 'bits')
+
+    def __init__(self, index, bits):
+        self.index = index
+        self.bits = bits
+
+    def __and__(self, other):
+        return Hits(self.index, self.bits & other.bits)
+
+    def __or__(self, other):
+        return Hits(self.index, self.bits | other.bits)
+
+    def __sub__(self, other):
+        return Hits(self.index, self.bits & ~other.bits)
+
+    def __invert__(self):
+        return Hits(self.index, self.index._alive & ~self.bits)
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __iter__(self):
+        return iter(self.ids())
+
+    def ids(self):
+        """
+            returns
+                > list[str]
+                > in slot order
+        """
+        flags = bin(self.bits)[:1:-1].encode().translate(ONES)
+        return list(compress(self.index._ids, flags))
+
+
+class GnmlTagIndex:
+    """
+        GnmlTagIndex
+            : inverted index of tags and meta over gnml node dicts
+    """
+
+    def __init__(self, nodes=()):
+        """
+            nodes
+                : iterable of dict
+                : gnml nodes, (eg) from load.gnml_file
+
+            raises
+                ! ValueError -> duplicate node id
+        """
+        self._slot = {}
+        self._ids = []  # slot -> id, None while free
+        self._free = []
+        self._terms = {}  # slot -> terms it was posted under
+        self._postings = {}
+        self._bits = {}
+        self._values = {}  # meta key -> sorted values
+        self._natural = {}  # meta key -> sorted (natural(value), value)
+
+        for node in nodes:
+            if node['id'] in self._slot:
+                raise ValueError('duplicate node id', node['id'])
+            self._put(node, bulk=True)
+        for key, values in self._values.items():
+            values.sort()
+            self._natural[key] = sorted((natural(v), v) for v in values)
+        self._alive = (1 << len(self._ids)) - 1
+
+    def __len__(self):
+        return len(self._slot)
+
+    def __contains__(self, node_id):
+        return node_id in self._slot
+
+    def _put(self, node, bulk=False):
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot] = node['id']
+        else:
+            slot = len(self._ids)
+            self._ids.append(node['id'])
+        self._slot[node['id']] = slot
+
+        terms = [('tag', tag) for tag in dict.fromkeys(node['tags'])]
+        terms += [('meta', k, v) for k, v in node['meta'].items()]
+        self._terms[slot] = terms
+        for term in terms:
+            slots = self._postings.get(term)
+            if slots is None:
+                slots = self._postings[term] = set()
+                if term[0] == 'meta':
+                    self._new_value(term[1], term[2], bulk)
+            slots.add(slot)
+            if term in self._bits:
+                self._bits[term] |= 1 << slot
+        return slot
+
+    def _new_value(self, key, value, bulk):
+        if bulk:
+            self._values.setdefault(key, []).append(value)
+        else:
+            insort(self._values.setdefault(key, []), value)
+            insort(self._natural.setdefault(key, []), (natural(value), value))
+
+    def update(self, node):
+        """
+            node
+                : dict
+                : gnml node -> replaces the indexed node with its id
+        """
+        if node['id'] in self._slot:
+            self.remove(node['id'])
+        slot = self._put(node)
+        self._alive |= 1 << slot
+
+    def remove(self, node_id):
+        """
+            node_id
+                : str
+
+            raises
+                ! KeyError
+        """
+        slot = self._slot.pop(node_id)
+        for term in self._terms.pop(slot):
+            slots = self._postings[term]
+            slots.discard(slot)
+            if not slots:
+                del self._postings[term]
+                self._bits.pop(term, None)
+                if term[0] == 'meta':
+                    values = self._values[term[1]]
+                    del values[bisect_left(values, term[2])]
+                    pairs = self._natural[term[1]]
+                    del pairs[bisect_left(pairs, (natural(term[2]), term[2]))]
+            elif term in self._bits:
+                self._bits[term] &= ~(1 << slot)
+        self._ids[slot] = None
+        self._free.append(slot)
+        self._alive &= ~(1 << slot)
+
+    def _bitmap(self, slots):
+        buf = bytearray((len(self._ids) + 7) // 8)
+        for slot in slots:
+            buf[slot >> 3] |= 1 << (slot & 7)
+        return int.from_bytes(buf, 'little')
+
+    def _term(self, term):
+        bits = self._bits.get(term)
+        if bits is not None:
+            return Hits(self, bits)
+        slots = self._postings.get(term, ())
+        bits = self._bitmap(slots)
+        if len(slots) * 64 >= len(self._ids):
+            self._bits[term] = bits
+        return Hits(self, bits)
+
+    def all(self):
+        """
+            returns
+                > Hits
+                > every indexed node
+        """
+        return Hits(self, self._alive)
+
+    def tag(self, tag):
+        """
+            tag
+                : str
+
+            returns
+                > Hits
+        """
+        return self._term(('tag', tag))
+
+    def meta(self, key, value):
+        """
+            key, value
+                : str
+
+            returns
+                > Hits
+                > nodes whose meta has key = value
+        """
+        return self._term(('meta', key, value))
+
+    def _union(self, key, values):
+        # dense values -> their bitmaps, the rest -> one bitmap of all slots
+        bits = 0
+        sparse = []
+        for value in values:
+            term = ('meta', key, value)
+            slots = self._postings[term]
+            if term in self._bits or len(slots) * 64 >= len(self._ids):
+                bits |= self._term(term).bits
+            else:
+                sparse.append(slots)
+        return Hits(self, bits | self._bitmap(chain.from_iterable(sparse)))
+
+    def meta_prefix(self, key, prefix):
+        """
+            key, prefix
+                : str
+
+            returns
+                > Hits
+                > nodes whose value for key starts with prefix
+        """
+        values = self._values.get(key, [])
+        start = bisect_left(values, prefix)
+        end = start
+        while end < len(values) and values[end].startswith(prefix):
+            end += 1
+        return self._union(key, values[start:end])
+
+    def meta_range(self, key, lo=None, hi=None):
+        """
+            key
+                : str
+
+            lo, hi
+                : str or None
+                : lo <= value < hi in natural order, None -> open end
+
+            returns
+                > Hits
+        """
+        pairs = self._natural.get(key, [])
+        start = 0 if lo is None else bisect_left(pairs, (natural(lo),))
+        end = len(pairs) if hi is None else bisect_left(pairs, (natural(hi),))
+        return self._union(key, (v for _, v in pairs[start:end]))
+
+
+if __name__ == '__main__':
+    from vbwise.gnmlgrammar import EXAMPLE_SOURCE
+    from vbwise.load import gnml_string
+
+    nodes = gnml_string(EXAMPLE_SOURCE)
+    index = GnmlTagIndex(nodes)
+    for node in nodes:
+        for tag in node['tags']:
+            assert node['id'] in index.tag(tag).ids()
+        for key, value in node['meta'].items():
+            assert node['id'] in index.meta(key, value).ids()
+            assert node['id'] in index.meta_prefix(key, value[:1]).ids()
+            assert node['id'] in index.meta_range(key, value).ids()
+            assert node['id'] not in index.meta_range(key, None, value).ids()
+
+    first = nodes[0]['id']
+    index.remove(first)
+    assert first not in index.all().ids()
+    index.update(nodes[0])
+    assert len(index.all()) == len(nodes)
@@ -1,11 +1,38 @@
 """
     | teleorithm |
+
+    building a Grammar parses its PEG definition -> milliseconds every time
+    compiled(definition) builds once per process, once per machine if asked
+
+    USAGE
+    ---------
+    grammar = compiled(TKML_GRAMMAR)  # same object on every call
+    tree = grammar.parse(source)
+
+    igrammar.ARTIFACT_DIR = '.vbwise_grammars'  # or VBWISE_GRAMMAR_CACHE=dir
+    ---------
+    process -> dict keyed by the definition text, always on
+    machine -> pickled artifact in ARTIFACT_DIR, named by sha256 of the
+               definition plus parsimonious and python versions
+               -> a changed grammar or upgrade never loads a stale one
+    ARTIFACT_DIR = None -> process cache only (default)
+    artifact code imports hashlib, pickle, importlib.metadata and tempfile
+    itself -> ~25 ms each import vbwise.load would pay for an opt-in
 """
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+from parsimonious import expressions
 from parsimonious.grammar import Grammar
 from parsimonious.exceptions import ParseError
 from parsimonious.nodes import Node
 
 
+ARTIFACT_DIR = os.environ.get('VBWISE_GRAMMAR_CACHE') or None
+
+
 class IGrammar(Grammar):
     """
         Grammar
@@ -47,6 +74,128 @@ class IGrammar(Grammar):
         else:
             return tree
 
+    def __reduce__(self):
+        # OrderedDict pickles by calling the class without arguments
+        return _restore, (list(self.items()), self.default_rule)
+
+
+def _restore(items, default_rule):
+    grammar = IGrammar.__new__(IGrammar)
+    OrderedDict.__init__(grammar, items)
+    grammar.default_rule = default_rule
+
+    # unpickled patterns are new objects -> swap in the module's cached ones
+    # so trees compare equal to trees from a freshly built grammar
+    re = expressions.re
+    passed = re.I | re.L | re.M | re.S | re.X | re.A
+    stack = [expr for _, expr in items]
+    seen = set()
+    while stack:
+        expr = stack.pop()
+        if id(expr) in seen:
+            continue
+        seen.add(id(expr))
+        if isinstance(expr, expressions.Regex):
+            expr.re = re.compile(expr.re.pattern, expr.re.flags & passed)
+            expr.identity_tuple = expr.identity_tuple[:1] + (expr.re,)
+        stack.extend(getattr(expr, 'members', ()))
+    return grammar
+
+
+def artifact_path(definition, directory):
+    """
+        definition
+            : str
+
+        directory
+            : str or Path
+
+        returns
+            > Path
+            > (eg) <directory>/3f9a...-parsimonious0.11.0-py312.pickle
+    """
+    import hashlib
+    from importlib.metadata import version
+
+    digest = hashlib.sha256(definition.encode()).hexdigest()[:24]
+    py = f'{sys.version_info[0]}{sys.version_info[1]}'
+    name = f'{digest}-parsimonious{version("parsimonious")}-py{py}.pickle'
+    return Path(directory) / name
+
+
+def save(grammar, path):
+    """
+        grammar
+            : IGrammar
+
+        path
+            : str or Path
+            : parent directories made as needed
+    """
+    import pickle
+    from vbwise import atomic
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic.write_bytes(path, pickle.dumps(grammar, pickle.HIGHEST_PROTOCOL))
+
+
+def load(path):
+    """
+        path
+            : str or Path
+            : written by save -> trusted, it is a pickle
+
+        returns
+            > IGrammar
+    """
+    import pickle
+
+    with open(path, 'rb') as r:
+        return pickle.load(r)
+
+
+_compiled = {}
+
+
+def compiled(definition):
+    """
+        definition
+            : str
+            : defines PEG grammar
+
+        returns
+            > IGrammar
+            > one shared object per definition text -> do not mutate
+
+        raises
+            ! ValueError
+    """
+    grammar = _compiled.get(definition)
+    if grammar is not None:
+        return grammar
+
+    path = None
+    if ARTIFACT_DIR is not None:
+        path = artifact_path(definition, ARTIFACT_DIR)
+        try:
+            grammar = load(path)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            grammar = None  # stale or broken -> rebuilt and rewritten
+
+    if grammar is None:
+        grammar = IGrammar(definition)
+        if path is not None:
+            try:
+                save(grammar, path)
+            except OSError:
+                pass  # read-only home -> process cache still works
+
+    _compiled[definition] = grammar
+    return grammar
+
 
 EXAMPLE_GRAMMAR = r'''
 root = word / number
@@ -55,6 +204,8 @@ number = ~r'[0-9]+'
 '''
 
 if __name__ == '__main__':
+    import pickle
+
     grammar = IGrammar(EXAMPLE_GRAMMAR)
     assert isinstance(grammar, Grammar)
 
@@ -66,3 +217,8 @@ if __name__ == '__main__':
     assert node.full_text == '24'
     assert node.expr_name == 'root'
 
+    # one build per definition, artifact loads parse the same
+    assert compiled(EXAMPLE_GRAMMAR) is compiled(EXAMPLE_GRAMMAR)
+    restored = pickle.loads(pickle.dumps(grammar))
+    assert restored.parse('24') == grammar.parse('24')
+
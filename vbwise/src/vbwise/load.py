@@ -1,16 +1,29 @@
 """
     | teleorithm |
 """
+import io
 import json
+import os
 import tomllib
+from pathlib import Path
 
-from vbwise.tkmlgrammar import tkml_tree
+from vbwise import parsecache
+from vbwise.parsecache import digest
+
+from vbwise import tkmlfast
+from vbwise.tkmlgrammar import TKML_GRAMMAR, tkml_tree
 from vbwise.tkmlvisitor import TKMLVisitor
 
-from vbwise.gnmlgrammar import gnml_tree
+from vbwise import gnmllines
+from vbwise.gnmlgrammar import GNML_GRAMMAR, gnml_tree
 from vbwise.gnmlvisitor import GNMLVisitor
 
 
+def _text(data):
+    """ file bytes -> str, as open(path, 'rt') reads them """
+    return io.TextIOWrapper(io.BytesIO(data)).read()
+
+
 def json_string(s):
     """
         s
@@ -34,10 +47,12 @@ def json_file(path):
 
         returns
             > dict
-    """
-    with open(path, 'rt') as r:
-        d = json.load(r)
 
+        cached when parsecache.CACHE_DIR is set
+    """
+    d = parsecache.cached(
+        path, 'json', 'stdlib', lambda data: json.loads(_text(data))
+    )
     return d
 
 
@@ -60,37 +75,60 @@ def toml_file(path):
 
         returns
             > dict
+
+        cached when parsecache.CACHE_DIR is set, unless it holds datetimes
     """
-    with open(path, 'rb') as r:
-        d = tomllib.load(r)
+    d = parsecache.cached(
+        path, 'toml', 'stdlib', lambda data: tomllib.load(io.BytesIO(data))
+    )
     return d
 
 
-def tkml_string(s):
+def tkml_string(s, engine='parsimonious'):
     """
         s
             : str
 
+        engine
+            : str
+            : 'parsimonious' -> Node tree walked by TKMLVisitor
+            : 'fast' -> vbwise.tkmlfast, same dicts without the tree
+
         returns
             > dict
+
+        raises
+            ! ValueError
     """
+    if engine == 'fast':
+        return tkmlfast.parse(s)
+    if engine != 'parsimonious':
+        raise ValueError('unknown tkml engine', engine)
+
     t = tkml_tree(s)
     d = TKMLVisitor().visit(t)
     return d
 
 
-def tkml_file(path):
+def tkml_file(path, engine='parsimonious'):
     """
         path
             : str
 
+        engine
+            : str
+            : see tkml_string
+
         returns
             > dict
-    """
-    with open(path, 'rt') as r:
-        s = r.read()
 
-    return tkml_string(s)
+        cached when parsecache.CACHE_DIR is set
+    """
+    d = parsecache.cached(
+        path, f'tkml.{engine}', digest(TKML_GRAMMAR),
+        lambda data: tkml_string(_text(data), engine)
+    )
+    return d
 
 
 def gnml_string(s):
@@ -113,11 +151,119 @@ def gnml_file(path):
 
         returns
             > list
+
+        cached when parsecache.CACHE_DIR is set
+    """
+    l = parsecache.cached(
+        path, 'gnml', digest(GNML_GRAMMAR),
+        lambda data: gnml_string(_text(data))
+    )
+    return l
+
+
+def iter_gnml(path):
+    """
+        path
+            : str
+
+        yields
+            -> dict
+            -> one gnml node at a time, file read line by line
+
+        raises
+            ! ValueError at the first bad line, earlier nodes already yielded
     """
     with open(path, 'rt') as r:
-        s = r.read()
+        yield from gnmllines.iter_nodes(r)
+
+
+def _gnml_job(paths):
+    # worker side -> ValueError carries the file along
+    parsed = []
+    for path in paths:
+        try:
+            parsed.append(gnml_file(path))
+        except ValueError as e:
+            raise ValueError(*e.args, str(path)) from None
+    return parsed
+
+
+def iter_gnml_dir(path, workers=None):
+    """
+        path
+            : str
+            : directory, .gnml files below it at any depth
+
+        workers
+            : int
+            : processes, default os.cpu_count() -> 1 parses in this process
 
-    return gnml_string(s)
+        yields
+            -> tuple
+            -> (file, nodes) as each batch of files finishes, not path order
+
+        raises
+            ! ValueError -> (message, offset, file) for the first bad file
+    """
+    files = sorted(Path(path).rglob('*.gnml'))
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(files) < 2:
+        for f in files:
+            yield f, _gnml_job([f])[0]
+        return
+
+    # imported here -> ~24 ms of multiprocessing only for callers of the pool
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    # one task per file spends more on the pool than on small files
+    # -> 8 batches per worker, dealt out by size so they weigh the same
+    order = sorted(files, key=lambda f: f.stat().st_size, reverse=True)
+    b = min(len(order), workers * 8)
+    batches = [order[k::b] for k in range(b)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_gnml_job, batch): batch for batch in batches}
+        try:
+            for done in as_completed(futures):
+                yield from zip(futures[done], done.result())
+        except BaseException:
+            # error, or the caller stopped early -> pending batches dropped
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def gnml_dir(path, workers=None):
+    """
+        path
+            : str
+            : directory, .gnml files below it at any depth
+
+        workers
+            : int
+            : processes, default os.cpu_count() -> 1 parses in this process
+
+        returns
+            > tuple
+            > (nodes, duplicates)
+            > nodes -> one list, files in sorted path order
+            > duplicates -> {id: [file, ...]} for ids found more than once
+
+        raises
+            ! ValueError -> (message, offset, file) for the first bad file
+
+        waits for every file -> iter_gnml_dir to use nodes as they arrive
+    """
+    parsed = dict(iter_gnml_dir(path, workers))
+
+    nodes = []
+    seen = {}
+    for f in sorted(parsed):
+        for node in parsed[f]:
+            seen.setdefault(node['id'], []).append(str(f))
+        nodes.extend(parsed[f])
+    duplicates = {k: v for k, v in seen.items() if len(v) > 1}
+    return nodes, duplicates
 
 
 def python_string(s):
@@ -0,0 +1,178 @@
+"""
+    | teleorithm |
+
+    parsed *_file results kept on disk -> like __pycache__ for markup
+
+    USAGE
+    ---------
+    parsecache.CACHE_DIR = '.vbwise_cache'  # or VBWISE_PARSE_CACHE=dir
+    load.tkml_file('app.tkml')  # parsed, then written to the cache
+    load.tkml_file('app.tkml')  # same bytes -> read back, no parsing
+    ---------
+    CACHE_DIR = None -> off, every call parses (default)
+
+    entry -> <CACHE_DIR>/<sha256>.marshal
+        key -> loader name, its grammar version, python version, FORMAT
+               and the file bytes -> an edited file or grammar misses
+    miss -> parsed, written with atomic.write_bytes
+         -> unmarshallable results (eg) toml datetimes -> parsed, not kept
+    hit -> mtime touched, so mtime is last use
+    eviction -> after a write, oldest used entries go until MAX_BYTES fit
+
+    FORMAT -> bump when a visitor's output changes for the same grammar
+
+    hashlib and atomic (-> tempfile) imported on first use, not with load
+"""
+import marshal
+import os
+import sys
+from pathlib import Path
+
+
+CACHE_DIR = os.environ.get('VBWISE_PARSE_CACHE') or None
+MAX_BYTES = 64 * 2**20
+FORMAT = 1
+
+SUFFIX = '.marshal'
+
+
+def digest(text):
+    """ short sha256 of text -> grammar versions """
+    import hashlib
+
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def entry_path(directory, loader, version, data):
+    """
+        directory
+            : str or Path
+
+        loader
+            : str
+            : (eg) 'tkml.fast'
+
+        version
+            : str
+            : changes whenever the loader's output could
+
+        data
+            : bytes
+            : file contents
+
+        returns
+            > Path
+    """
+    import hashlib
+
+    h = hashlib.sha256()
+    py = f'{sys.version_info[0]}.{sys.version_info[1]}'
+    for part in (loader, version, py, str(FORMAT)):
+        h.update(part.encode())
+        h.update(b'\0')
+    h.update(data)
+    return Path(directory) / (h.hexdigest() + SUFFIX)
+
+
+def write(path, result):
+    """
+        path
+            : Path
+
+        result
+            : marshal-able
+
+        raises
+            ! ValueError -> result cannot be marshalled
+    """
+    from vbwise import atomic
+
+    blob = marshal.dumps(result)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic.write_bytes(path, blob)
+
+
+def evict(directory, max_bytes):
+    """
+        directory
+            : str or Path
+
+        max_bytes
+            : int
+            : entries least recently used removed until the rest fit
+
+        returns
+            > int
+            > entries removed
+    """
+    entries = []
+    for p in Path(directory).glob('*' + SUFFIX):
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue  # evicted by another process
+        entries.append((st.st_mtime_ns, st.st_size, p))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, p in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            p.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def cached(path, loader, version, parse):
+    """
+        path
+            : str or Path
+            : file to load
+
+        loader
+            : str
+
+        version
+            : str
+
+        parse
+            : callable
+            : parse(data) -> result, data the file bytes
+
+        returns
+            > result of parse, or an equal copy from the cache
+
+        raises
+            ! whatever parse raises -> errors are not cached
+    """
+    with open(path, 'rb') as r:
+        data = r.read()
+    if CACHE_DIR is None:
+        return parse(data)
+
+    entry = entry_path(CACHE_DIR, loader, version, data)
+    try:
+        with open(entry, 'rb') as r:
+            result = marshal.load(r)
+    except FileNotFoundError:
+        pass
+    except (EOFError, ValueError, TypeError):
+        pass  # broken entry -> parsed and rewritten
+    else:
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return result
+
+    result = parse(data)
+    try:
+        write(entry, result)
+    except (OSError, ValueError):
+        return result  # read-only dir or unmarshallable -> not kept
+    evict(CACHE_DIR, MAX_BYTES)
+    return result
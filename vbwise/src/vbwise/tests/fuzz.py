@@ -0,0 +1,246 @@
+"""
+    | teleorithm |
+
+    random inputs for checking one implementation against another
+
+    USAGE
+    ---------
+    import fuzz  # tests/ itself is on sys.path under ktest and pytest
+
+    for source in fuzz.valid(fuzz.tkml_source):
+        assert fuzz.outcome(fast, source) == fuzz.outcome(slow, source)
+
+    for source in fuzz.broken(fuzz.tkml_source, fuzz.TKML_ALPHABET, edits=3):
+        ...
+
+    nodes = {f'n{k}': fuzz.tagged_node(rng, f'n{k}') for k in range(200)}
+    for step in fuzz.churn(rng, index, nodes, fuzz.tagged_node, 260):
+        ...
+    ---------
+    fixed seeds -> a failing case comes back on every run
+    outcome -> ValueError itself when rejected, so accept / reject compares too
+    no test_ prefix -> a helper, never collected as tests
+"""
+from random import Random
+
+from vbwise.gnmllines import new_node
+from vbwise.strings import valid_strings
+
+
+def outcome(fn, source):
+    """
+        returns
+            > fn(source), or ValueError when fn raises it
+    """
+    try:
+        return fn(source)
+    except ValueError:
+        return ValueError
+
+
+def valid(generate, count=300, seed=42):
+    """
+        generate
+            : callable
+            : generate(rng) -> source
+
+        yields
+            -> str
+            -> count sources, same ones every run
+    """
+    rng = Random(seed)
+    for _ in range(count):
+        yield generate(rng)
+
+
+def broken(generate, alphabet, edits=2, count=600, seed=7):
+    """
+        alphabet
+            : str
+            : characters that matter to the grammar
+
+        edits
+            : int
+            : 1 to edits deletions, insertions or swaps per source
+
+        yields
+            -> str
+            -> count valid sources, each a few characters off
+    """
+    rng = Random(seed)
+    for _ in range(count):
+        yield mutated(rng, generate(rng), alphabet, edits)
+
+
+def mutated(rng, source, alphabet, edits=2):
+    chars = list(source)
+    for _ in range(rng.randrange(1, edits + 1)):
+        i = rng.randrange(len(chars) + 1)
+        op = rng.randrange(3)
+        if op == 0 and i < len(chars):
+            del chars[i]
+        elif op == 1:
+            chars.insert(i, rng.choice(alphabet))
+        elif i < len(chars):
+            chars[i] = rng.choice(alphabet)
+    return ''.join(chars)
+
+
+NAMES = ['a', 'b_2', 'node', '22', 'first.branch.22', 'x.y']
+GNML_ALPHABET = '#-:.,= \t\r\nTC13>NODEa_'
+
+
+def gnml_source(rng):
+    """ valid gnml -> random spacing, indentation and line kinds """
+    def sp():
+        return rng.choice(['', '', ' ', '  ', '\t', ' \t '])
+
+    def names(pool):
+        return (sp() + ',' + sp()).join(
+            rng.choice(pool) for _ in range(rng.randrange(1, 4))
+        )
+
+    def content_line():
+        kind = rng.randrange(6)
+        if kind == 0:
+            kvs = (sp() + ',' + sp()).join(
+                f'{rng.choice(["k", "key1", "v_2"])}{sp()}={sp()}{rng.choice(NAMES)}'
+                for _ in range(rng.randrange(1, 4))
+            )
+            return f'---{sp()}meta{sp()}:{sp()}{rng.choice([kvs, kvs, ""])}{sp()}'
+        if kind == 1:
+            pool = ['t1', 'tag', '9']
+            return f'---{sp()}tags{sp()}:{sp()}{rng.choice([names(pool), ""])}{sp()}'
+        if kind in (2, 3):
+            key = 'next' if kind == 2 else 'prev'
+            return f'---{sp()}{key}{sp()}:{sp()}{rng.choice([names(NAMES), ""])}{sp()}'
+        level = rng.choice('TC') + rng.choice('123')
+        text = rng.choice(['', 'a truth', '  indented', 'x = {1: 2}  ', '### NODE',
+                           '--- id: q', '\tdef f(x):'])
+        return f'{level}>{sp()}{text}'
+
+    out = [rng.choice(['', '\n', ' \n', '\r\n\t'])]
+    for _ in range(rng.randrange(4)):
+        lines = [f'{sp()}### NODE{sp()}',
+                 f'{sp()}---{sp()}id{sp()}:{sp()}{rng.choice(NAMES)}{sp()}']
+        body = [content_line() for _ in range(rng.randrange(5))]
+        if body:
+            body[0] = sp() + body[0]
+        lines += body
+        lines.append(f'{sp()}### ENDNODE{sp()}')
+        out.append('\n'.join(lines) + '\n' + rng.choice(['', '\n', '\n\n', ' \t\n']))
+    return ''.join(out)
+
+
+IDENTIFIERS = [
+    'Frame', 'a', 'dotted.name', 'x.1.y', '<Return>', '<Button-1>', '-',
+    '0', '31', '-7', '1_000', '23.529', '1.2.A.B', '1e3', 'inf', 'nan',
+    '1000.xyz', 'a..b', 'type', 'props', 'parts',
+]
+GAPS = ['', ' ', '\n', '  \t', ' # comment\n', '\n# #AA1122x\n', ' ']
+TKML_ALPHABET = '{}:,#"\'\\ \n.-<>aZ09\x1c '
+
+
+def tkml_source(rng, depth=0):
+    """ valid tkml -> random layout, comments, commas, every value kind """
+    def gap():
+        return rng.choice(GAPS[1:]) if rng.random() < 0.7 else ' '
+
+    def value(d):
+        kind = rng.randrange(4 if d < 2 else 3)
+        if kind == 0:
+            return rng.choice(IDENTIFIERS)
+        if kind == 1:
+            return rng.choice(valid_strings)
+        if kind == 2:
+            return rng.choice(['#AA1122', '#123abc'])
+        entries = [f'{rng.choice(IDENTIFIERS)}{gap()}:{gap()}{value(d + 1)}'
+                   for _ in range(rng.randrange(3))]
+        return '{' + gap() + (rng.choice([',', ' ', ', ']) + gap()).join(entries) + gap() + '}'
+
+    members = []
+    for _ in range(rng.randrange(5)):
+        if depth < 3 and rng.random() < 0.3:
+            members.append(tkml_source(rng, depth + 1))
+        else:
+            members.append(f'{rng.choice(IDENTIFIERS)}{gap()}:{gap()}{value(0)}')
+    sep = rng.choice([gap(), ',' + gap()])
+    return f'{rng.choice(IDENTIFIERS)}{gap()}{{{gap()}{sep.join(members)}{gap()}}}'
+
+
+TAGS = ['a', 'b', 'c', 'draft']
+AUTHORS = ['kDoSE', 'kD', 'other', 'x_1']
+VERSIONS = ['1.2', '1.2.9', '1.2.10', '1.10', '2', '0_9']
+
+
+def tagged_node(rng, node_id):
+    """ node with a few of TAGS, maybe an author and a version """
+    node = new_node(node_id)
+    node['tags'] = [rng.choice(TAGS) for _ in range(rng.randrange(4))]
+    if rng.random() < 0.8:
+        node['meta']['author'] = rng.choice(AUTHORS)
+    if rng.random() < 0.6:
+        node['meta']['version'] = rng.choice(VERSIONS)
+    return node
+
+
+WORDS = ['moon', 'star', 'return', 'x', 'truth', 'def', 'sun', 'Moon']
+
+
+def worded_node(rng, node_id):
+    """ node with text and code lines made of WORDS, any level """
+    node = new_node(node_id)
+    for _ in range(rng.randrange(4)):
+        line = ' '.join(rng.choice(WORDS) for _ in range(rng.randrange(1, 5)))
+        node['text_lines'].append({'level': f'T{rng.randrange(1, 4)}', 'content': line})
+    for _ in range(rng.randrange(3)):
+        line = '('.join(rng.choice(WORDS) for _ in range(rng.randrange(1, 4)))
+        node['code_lines'].append({'level': f'C{rng.randrange(1, 4)}', 'content': line})
+    return node
+
+
+def churn(rng, index, nodes, make, ids, steps=300):
+    """
+        index
+            : anything with update(node) and remove(node_id)
+
+        nodes
+            : dict
+            : {id: node} the index holds now -> kept in step with it
+
+        make
+            : callable
+            : make(rng, node_id) -> node, (eg) tagged_node
+
+        ids
+            : int
+            : ids drawn from n0 .. n{ids - 1} -> some new, some replaced
+
+        yields
+            -> int
+            -> step, after each update or remove
+    """
+    for step in range(steps):
+        node_id = f'n{rng.randrange(ids)}'
+        if node_id in nodes and rng.random() < 0.4:
+            index.remove(node_id)
+            del nodes[node_id]
+        else:
+            nodes[node_id] = make(rng, node_id)
+            index.update(nodes[node_id])
+        yield step
+
+
+def misuse(index_type):
+    """
+        index_type
+            : class
+            : built from nodes, has remove(node_id)
+
+        yields
+            -> tuple
+            -> (error, call) -> call() must raise error
+    """
+    index = index_type([new_node('a')])
+    yield KeyError, lambda: index.remove('b')
+    yield ValueError, lambda: index_type([new_node('a'), new_node('a')])
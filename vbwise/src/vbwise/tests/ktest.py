@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 from unittest import defaultTestLoader, TextTestRunner
-from klab.ututils import Runner
+from klab.ututils import Runner, Sharded
+from klab import testcache
 
 import sys
 
@@ -8,13 +9,48 @@ import sys
 def main(args):
     file_name, *options = args
 
+    # -j N -> test modules run N at a time in worker processes
+    jobs = 1
+    if '-j' in options:
+        jobs = int(options[options.index('-j') + 1])
+
+    # --slowest N -> table of the N slowest tests
+    slowest = 0
+    if '--slowest' in options:
+        slowest = int(options[options.index('--slowest') + 1])
+
+    # --report out.json or out.xml -> per-test timings, junit for .xml
+    report = None
+    if '--report' in options:
+        report = options[options.index('--report') + 1]
+
+    # --memory -> tracemalloc peak per test, slows the whole run
+    memory = '--memory' in options
+
     suite = defaultTestLoader.discover('.')
+
+    # modules that passed with unchanged sources are skipped
+    # --all -> run everything anyway
+    cache = {} if '--all' in options else testcache.load()
+    total = suite.countTestCases()
+    suite, current = testcache.select(suite, cache)
+    unchanged = total - suite.countTestCases()
+    if unchanged:
+        print(f'{unchanged} tests skipped, sources unchanged since they passed')
+
+    # -q -> plain unittest output, still spread over -j workers
     if '-q' in options:
         runner = TextTestRunner()
+        tests = Sharded(suite, jobs) if jobs > 1 else suite
     else:
-        runner = Runner()
+        runner = Runner(jobs=jobs, slowest=slowest, report=report, memory=memory)
+        tests = suite
+
+    result = runner.run(tests)
 
-    runner.run(suite)
+    cache = testcache.load() if '--all' in options else cache
+    testcache.record(cache, current, result, suite)
+    testcache.save(cache)
 
 if __name__ == '__main__':
     sys.exit(main(sys.argv))
@@ -0,0 +1,43 @@
+"""
+    | teleorithm |
+"""
+from unittest import main, TestCase
+from klab.ututils import Spec, Runner
+
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from vbwise import atomic
+
+
+class test_write_bytes(Spec):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'out.bin'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_then_replaces(self):
+        atomic.write_bytes(self.path, b'one')
+        atomic.write_bytes(str(self.path), b'two')
+        self.equa(self.path.read_bytes(), b'two')
+        self.equa(os.listdir(self.tmp.name), ['out.bin'])
+
+    def test_failed_write_leaves_old_file_and_no_temp(self):
+        atomic.write_bytes(self.path, b'old')
+        with mock.patch('os.replace', side_effect=OSError('disk full')):
+            with self.rais(OSError):
+                atomic.write_bytes(self.path, b'new')
+        self.equa(self.path.read_bytes(), b'old')
+        self.equa(os.listdir(self.tmp.name), ['out.bin'])
+
+    def test_missing_directory_raises(self):
+        with self.rais(FileNotFoundError):
+            atomic.write_bytes(self.path.parent / 'nope' / 'out.bin', b'')
+
+
+if __name__ == '__main__':
+    main(testRunner=Runner)
@@ -0,0 +1,114 @@
+"""
+    | teleorithm |
+"""
+from unittest import main, TestCase
+from klab.ututils import Spec, Runner
+
+from random import Random
+
+from vbwise import load
+from vbwise.gnmledit import GnmlDoc
+from vbwise.gnmlgrammar import EXAMPLE_SOURCE
+
+import fuzz
+
+
+PIECES = [
+    '', 'a', ' ', '\n', '2', '#', 'T1> more\n', '--- tags: t\n',
+    '### NODE\n--- id: fresh\n### ENDNODE\n', '### ENDNODE\n', '### NODE\n',
+]
+
+
+def random_edit(rng, text):
+    offset = rng.randrange(len(text) + 1)
+    removed = rng.randrange(min(len(text) - offset, 30) + 1) if rng.random() < 0.5 else 0
+    return offset, removed, rng.choice(PIECES)
+
+
+def from_scratch(text, offset, removed, inserted):
+    """ whole text parsed again, ValueError when the grammar rejects it """
+    text = text[:offset] + inserted + text[offset + removed:]
+    try:
+        nodes = load.gnml_string(text)
+    except ValueError:
+        return ValueError
+    return text, nodes
+
+
+class test_edits_against_full_parse(Spec):
+    def test_nodes_are_gnml_string_nodes_and_spans_cover_blocks(self):
+        doc = GnmlDoc(EXAMPLE_SOURCE)
+        self.equa(doc.nodes, load.gnml_string(EXAMPLE_SOURCE))
+        self.equa(doc.text, EXAMPLE_SOURCE)
+        for start, end in doc.spans:
+            self.asrt(EXAMPLE_SOURCE[start:end].lstrip().startswith('### NODE'))
+            self.asrt(EXAMPLE_SOURCE[start:end].endswith('### ENDNODE\n'))
+
+    def test_random_edit_chains(self):
+        rng = Random(11)
+        for _ in range(150):
+            doc = GnmlDoc(fuzz.gnml_source(rng))
+            for _ in range(10):
+                text = doc.text
+                ids = {n['id'] for n in doc.nodes}
+                edit = random_edit(rng, text)
+                expected = from_scratch(text, *edit)
+                with self.subt(text=text, edit=edit):
+                    try:
+                        changes = doc.edit(*edit)
+                    except ValueError:
+                        self.asrt(expected is ValueError)
+                        self.equa(doc.text, text)
+                        continue
+                    self.asrt(expected is not ValueError)
+                    self.equa((doc.text, doc.nodes), expected)
+                    self.equa(doc.spans, GnmlDoc(doc.text).spans)
+
+                    new_ids = {n['id'] for n in doc.nodes}
+                    self.asrt(new_ids - ids <= set(changes['added']))
+                    self.asrt(ids - new_ids <= set(changes['removed']))
+
+    def test_changes_name_the_edited_node(self):
+        doc = GnmlDoc(EXAMPLE_SOURCE)
+        first, second = (n['id'] for n in doc.nodes)
+        kept = doc.nodes[0]
+
+        at = EXAMPLE_SOURCE.index('return x**2') + len('return x**')
+        changes = doc.edit(at, 1, '3')
+        self.equa(changes, {'added': [], 'changed': [second], 'removed': []})
+        self.asrt(doc.nodes[0] is kept)
+
+        start, end = doc.spans[0]
+        after = doc.spans[1][0]
+        changes = doc.edit(start, end - start, '')
+        self.equa(changes, {'added': [], 'changed': [], 'removed': [first]})
+        self.equa(doc.spans[0][0], after - (end - start))
+
+        changes = doc.edit(len(doc), 0, '### NODE\n--- id: fresh\n### ENDNODE\n')
+        self.equa(changes, {'added': ['fresh'], 'changed': [], 'removed': []})
+
+    def test_bad_edit_raises_ValueError_and_keeps_doc(self):
+        doc = GnmlDoc(EXAMPLE_SOURCE)
+        with self.rais(ValueError) as caught:
+            doc.edit(len(EXAMPLE_SOURCE), 0, 'stray\n')
+        self.equa(caught.exception.args[1], len(EXAMPLE_SOURCE))
+        self.equa((doc.text, doc.nodes), (EXAMPLE_SOURCE, load.gnml_string(EXAMPLE_SOURCE)))
+
+        with self.rais(ValueError):
+            doc.edit(len(EXAMPLE_SOURCE), 1, '')
+
+    def test_keystroke_reparses_only_its_node(self):
+        node = '### NODE\n--- id: n{i}\nT1> text {i}\n### ENDNODE\n\n'
+        doc = GnmlDoc(''.join(node.format(i=i) for i in range(2_000)))
+        before = list(doc.nodes)
+        at = doc.spans[1_000][0] + len('### NODE\n--- id: n')
+
+        changes = doc.edit(at, 0, '7')
+        self.equa(changes, {'added': ['n71000'], 'changed': [], 'removed': ['n1000']})
+        # every other node is the same object -> the edit did not touch it
+        replaced = [k for k, n in enumerate(doc.nodes) if n is not before[k]]
+        self.equa(replaced, [1_000])
+
+
+if __name__ == '__main__':
+    main(testRunner=Runner)
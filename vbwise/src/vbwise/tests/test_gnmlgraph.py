@@ -0,0 +1,135 @@
+"""
+    | teleorithm |
+"""
+from unittest import main, TestCase
+from klab.ututils import Spec, Runner
+
+from collections import deque
+from itertools import chain
+from random import Random
+
+from vbwise.gnmlgraph import GnmlGraph
+from vbwise.gnmllines import new_node
+
+
+def graph_nodes(links):
+    """ {id: (next, prev)} -> gnml node dicts """
+    nodes = []
+    for node_id, (nxt, prv) in links.items():
+        node = new_node(node_id)
+        node['next'] = list(nxt)
+        node['prev'] = list(prv)
+        nodes.append(node)
+    return nodes
+
+
+def scanned_links(links):
+    """ {id: (next, prev)} -> same shape, each link added to the side missing it """
+    union = {u: (list(nxt), list(prv)) for u, (nxt, prv) in links.items()}
+    for i in chain.from_iterable(chain(nxt, prv) for nxt, prv in links.values()):
+        union.setdefault(i, ([], []))
+    none = ((), ())
+    for v, (_, prv) in links.items():
+        for u in prv:
+            if v not in links.get(u, none)[0]:
+                union[u][0].append(v)
+    for u, (nxt, _) in links.items():
+        for v in nxt:
+            if u not in links.get(v, none)[1]:
+                union[v][1].append(u)
+    return union
+
+
+def scanned_distance(union, start, target):
+    """ bfs over the dicts themselves -> what GnmlGraph replaces """
+    seen = {start: 0}
+    queue = deque([start])
+    while queue:
+        node_id = queue.popleft()
+        if node_id == target:
+            return seen[node_id]
+        for j in union[node_id][0]:
+            if j not in seen:
+                seen[j] = seen[node_id] + 1
+                queue.append(j)
+    return None
+
+
+class test_gnml_graph(Spec):
+    def setUp(self):
+        self.nodes = graph_nodes({
+            'a': (['b', 'c'], []),
+            'b': (['d'], ['a']),
+            'c': (['d', 'ghost'], ['a']),
+            'd': ([], ['lone']),  # lone -> d, declared on d's side only
+            'lone': ([], []),
+        })
+        self.graph = GnmlGraph(self.nodes)
+
+    def test_ids_intern_to_list_positions_then_dangling(self):
+        self.equa(self.graph.ids, ['a', 'b', 'c', 'd', 'lone', 'ghost'])
+        self.equa(self.graph.index['d'], 3)
+        self.asrt(self.graph.node('c') is self.nodes[2])
+        self.asrt(self.graph.node('ghost') is None)
+        self.equa(len(self.graph), 6)
+
+    def test_neighbors_in_link_order_per_direction(self):
+        self.equa(self.graph.neighbors('c'), ['d', 'ghost'])
+        self.equa(self.graph.neighbors('d', 'prev'), ['lone', 'b', 'c'])
+        self.equa(self.graph.neighbors('ghost', 'prev'), ['c'])
+        self.equa(self.graph.neighbors('lone'), ['d'])
+        self.equa(self.graph.neighbors('lone', 'prev'), [])
+        self.equa(self.graph.neighbors('b', 'both'), ['d', 'a'])
+        self.equa(self.graph.neighbors('ghost'), [])
+
+    def test_link_declared_on_both_sides_counts_once(self):
+        self.equa(self.graph.neighbors('a'), ['b', 'c'])
+        self.equa(self.graph.neighbors('b', 'prev'), ['a'])
+
+    def test_walks(self):
+        self.equa(list(self.graph.bfs('a')), ['a', 'b', 'c', 'd', 'ghost'])
+        self.equa(list(self.graph.dfs('a')), ['a', 'b', 'd', 'c', 'ghost'])
+        self.equa(list(self.graph.bfs('d', 'prev')), ['d', 'lone', 'b', 'c', 'a'])
+        self.asrt(self.graph.reachable('a', 'ghost'))
+        self.asrt(not self.graph.reachable('d', 'a'))
+        self.asrt(self.graph.reachable('d', 'a', 'prev'))
+        self.equa(self.graph.shortest_path('a', 'd'), ['a', 'b', 'd'])
+        self.equa(self.graph.shortest_path('a', 'a'), ['a'])
+        self.asrt(self.graph.shortest_path('a', 'lone') is None)
+        self.equa(self.graph.shortest_path('lone', 'd'), ['lone', 'd'])
+
+    def test_errors(self):
+        with self.rais(KeyError):
+            self.graph.neighbors('nope')
+        with self.rais(ValueError):
+            self.graph.neighbors('a', 'sideways')
+        with self.rais(ValueError):
+            GnmlGraph(self.nodes + graph_nodes({'b': ([], [])}))
+
+    def test_random_graphs_match_a_scan_of_the_dicts(self):
+        rng = Random(4)
+        for _ in range(30):
+            names = [f'n{k}' for k in range(40)]
+            pick = lambda: [rng.choice(names + ['x', 'y']) for _ in range(rng.randrange(3))]
+            links = {name: (pick(), pick()) for name in names}
+            union = scanned_links(links)
+            graph = GnmlGraph(graph_nodes(links))
+            for _ in range(20):
+                start = rng.choice(names)
+                target = rng.choice(names + [k for k in 'xy' if k in graph])
+                path = graph.shortest_path(start, target)
+                with self.subt(start=start, target=target):
+                    distance = scanned_distance(union, start, target)
+                    self.equa(None if path is None else len(path) - 1, distance)
+                    self.equa(graph.reachable(start, target), distance is not None)
+                    for u, v in zip(path or [], (path or [])[1:]):
+                        self.asrt(v in union[u][0])
+                    self.equa(sorted(graph.bfs(start)), sorted(graph.dfs(start)))
+            self.equa(sorted(graph.ids), sorted(union))
+            for name in graph.ids:
+                self.equa(graph.neighbors(name), union[name][0])
+                self.equa(graph.neighbors(name, 'prev'), union[name][1])
+
+
+if __name__ == '__main__':
+    main(testRunner=Runner)
@@ -0,0 +1,109 @@
+"""
+    | teleorithm |
+"""
+from unittest import main, TestCase
+from klab.ututils import Spec, Runner
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from vbwise import load
+from vbwise.gnmlgrammar import EXAMPLE_SOURCE
+from vbwise.gnmlindex import GnmlStore, build_index, load_index, sidecar_path
+
+import fuzz
+
+
+def renamed(source, k):
+    """ EXAMPLE_SOURCE ids made unique per copy """
+    return source.replace('--- id: ', f'--- id: copy{k}.')
+
+
+class test_gnml_index(Spec):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'kb.gnml'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_blocks_parse_to_the_same_nodes_as_gnml_file(self):
+        self.path.write_text(''.join(renamed(EXAMPLE_SOURCE, k) for k in range(3)))
+        with GnmlStore(self.path) as store:
+            self.equa([store[i] for i in store], load.gnml_file(self.path))
+
+    def test_random_sources_with_unique_ids(self):
+        for source in fuzz.valid(fuzz.gnml_source, count=200, seed=3):
+            nodes = load.gnml_string(source)
+            if len({n['id'] for n in nodes}) != len(nodes):
+                continue
+            with self.subt(source=source):
+                self.path.write_text(source)
+                with GnmlStore(self.path, cache_size=2) as store:
+                    self.equa([store[n['id']] for n in nodes], nodes)
+
+    def test_offsets_are_bytes_and_crlf_reads_as_lf(self):
+        source = '### NODE\n--- id: a\nT1> ünïcode\n### ENDNODE\n'
+        self.path.write_bytes(('\n' + source + source.replace('id: a', 'id: b'))
+                              .replace('\n', '\r\n').encode())
+        index = build_index(self.path)
+        self.equa(index['a'], (2, len(source.encode()) + 4))
+        with GnmlStore(self.path) as store:
+            self.equa(store['b']['text_lines'], [{'level': 'T1', 'content': 'ünïcode'}])
+            self.equa(store.text('a'), source)
+
+    def test_sidecar_reused_until_file_changes(self):
+        self.path.write_text(EXAMPLE_SOURCE)
+        first = load_index(self.path)
+        stamp = sidecar_path(self.path).stat().st_mtime_ns
+        self.equa(load_index(self.path), first)
+        self.equa(sidecar_path(self.path).stat().st_mtime_ns, stamp)
+
+        self.path.write_text('\n' + EXAMPLE_SOURCE)
+        moved = load_index(self.path)
+        self.equa(moved['first.branch.22'][0], first['first.branch.22'][0] + 1)
+
+    def test_broken_sidecar_is_rebuilt(self):
+        self.path.write_text(EXAMPLE_SOURCE)
+        sidecar_path(self.path).write_bytes(b'\x00broken')
+        self.equa(load_index(self.path), build_index(self.path))
+
+    def test_lru_keeps_cache_size_nodes(self):
+        self.path.write_text(EXAMPLE_SOURCE)
+        with GnmlStore(self.path, cache_size=1) as store:
+            a, b = list(store)
+            self.asrt(store[a] is store[a])
+            store[b]
+            self.equa(list(store._cache), [b])
+
+    def test_missing_id_raises_KeyError(self):
+        self.path.write_text(EXAMPLE_SOURCE)
+        with GnmlStore(self.path) as store:
+            self.asrt('nope' not in store)
+            self.asrt(store.get('nope') is None)
+            with self.rais(KeyError):
+                store['nope']
+
+    def test_empty_file_is_an_empty_store(self):
+        self.path.write_text('')
+        with GnmlStore(self.path) as store:
+            self.equa(len(store), 0)
+
+    def test_duplicate_ids_and_bad_lines_raise_ValueError(self):
+        self.path.write_text(EXAMPLE_SOURCE * 2)
+        with self.rais(ValueError):
+            build_index(self.path)
+
+        self.path.write_text('é\n' + EXAMPLE_SOURCE)
+        with self.rais(ValueError) as caught:
+            build_index(self.path)
+        self.equa(caught.exception.args[1], 0)
+
+        self.path.write_text(EXAMPLE_SOURCE + 'stray\n')
+        with self.rais(ValueError) as caught:
+            build_index(self.path)
+        self.equa(caught.exception.args[1], len(EXAMPLE_SOURCE.encode()))
+
+
+if __name__ == '__main__':
+    main(testRunner=Runner)
@@ -0,0 +1,79 @@
+"""
+    | teleorithm |
+"""
+from unittest import main, TestCase
+from klab.ututils import Spec, Runner
+
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from vbwise import load
+from vbwise.gnmlgrammar import EXAMPLE_SOURCE
+from vbwise.gnmllines import iter_nodes, node_from_text
+
+import fuzz
+
+
+def streamed(source):
+    return list(iter_nodes(StringIO(source)))
+
+
+class test_streamed_gnml_against_GNMLVisitor(Spec):
+    def check(self, source):
+        with self.subt(source=source):
+            self.equa(fuzz.outcome(streamed, source),
+                      fuzz.outcome(load.gnml_string, source))
+
+    def test_EXAMPLE_SOURCE_gives_identical_nodes(self):
+        self.equa(list(iter_nodes(StringIO(EXAMPLE_SOURCE))),
+                  load.gnml_string(EXAMPLE_SOURCE))
+
+    def test_only_first_content_line_may_be_indented(self):
+        self.check('### NODE\n--- id: a\n  T1> x\n### ENDNODE\n')
+        self.check('### NODE\n--- id: a\nT1> x\n  T1> y\n### ENDNODE\n')
+
+    def test_last_line_needs_its_newline(self):
+        self.check('### NODE\n--- id: a\n### ENDNODE')
+        self.check('### NODE\n--- id: a\n### ENDNODE\n  ')
+
+    def test_random_valid_sources(self):
+        for source in fuzz.valid(fuzz.gnml_source):
+            self.asrt(fuzz.outcome(load.gnml_string, source) is not ValueError)
+            self.check(source)
+
+    def test_random_mutations_accepted_and_rejected_alike(self):
+        for source in fuzz.broken(fuzz.gnml_source, fuzz.GNML_ALPHABET):
+            self.check(source)
+
+
+class test_iter_gnml(Spec):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'kb.gnml'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_yields_same_nodes_as_gnml_file(self):
+        self.path.write_text(EXAMPLE_SOURCE * 3)
+        self.equa(list(load.iter_gnml(self.path)), load.gnml_file(self.path))
+
+    def test_bad_line_raises_ValueError_with_offset_after_good_nodes(self):
+        self.path.write_text(EXAMPLE_SOURCE + 'stray\n')
+        found = []
+        with self.rais(ValueError) as caught:
+            for node in load.iter_gnml(self.path):
+                found.append(node)
+        self.equa(len(found), 2)
+        self.equa(caught.exception.args[1], len(EXAMPLE_SOURCE))
+
+    def test_node_from_text_takes_exactly_one_node(self):
+        one = '### NODE\n--- id: a.b\n--- tags: t\n### ENDNODE\n'
+        self.equa(node_from_text(one)['tags'], ['t'])
+        with self.rais(ValueError):
+            node_from_text(one * 2)
+
+
+if __name__ == '__main__':
+    main(testRunner=Runner)
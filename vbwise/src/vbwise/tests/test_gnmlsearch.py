@@ -0,0 +1,142 @@
+"""
+    | teleorithm |
+"""
+from unittest import main, TestCase
+from klab.ututils import Spec, Runner
+
+import os
+import tempfile
+from random import Random
+
+from vbwise.gnmllines import new_node
+from vbwise.gnmlsearch import GnmlSearch, levels_of, tokens
+
+import fuzz
+from fuzz import WORDS, worded_node
+
+
+def scanned(nodes, words, phrases, levels):
+    """ ids whose chosen lines hold every word and phrase -> brute force """
+    found = []
+    for node in nodes:
+        lines = [
+            tokens(line['content'])
+            for line in node['text_lines'] + node['code_lines']
+            if line['level'] in levels
+        ]
+        flat = {t for line in lines for t in line}
+        has_phrase = lambda p: any(
+            line[k:k + len(p)] == p for line in lines for k in range(len(line))
+        )
+        if all(w in flat for w in words) and all(has_phrase(p) for p in phrases):
+            found.append(node['id'])
+    return sorted(found)
+
+
+class test_gnml_search(Spec):
+    def check(self, index, nodes, rng):
+        """ matches against a scan of the node dicts, scores best first """
+        for _ in range(40):
+            words = [rng.choice(WORDS).lower() for _ in range(rng.randrange(1, 3))]
+            phrases = [words[:]] if rng.random() < 0.3 else []
+            query = f'"{" ".join(words)}"' if phrases else ' '.join(words)
+            spec = rng.choice([None, 'T', 'C', 'T1', ['T2', 'C3']])
+            hits = index.search(query, levels=spec, limit=None)
+            with self.subt(query=query, levels=spec):
+                self.equa(
+                    sorted(i for i, _ in hits),
+                    scanned(nodes, words, phrases, levels_of(spec)),
+                )
+                scores = [s for _, s in hits]
+                self.equa(scores, sorted(scores, reverse=True))
+                self.equa(index.search(query, levels=spec, limit=3), hits[:3])
+        self.equa(len(index), len(nodes))
+
+    def test_tokens_and_levels(self):
+        self.equa(tokens('Return x**2'), ['return', 'x', '2'])
+        self.equa(levels_of('T'), ('T1', 'T2', 'T3'))
+        self.equa(levels_of(['C2', 'T1']), ('T1', 'C2'))
+        with self.rais(ValueError):
+            levels_of('Z')
+        with self.rais(ValueError):
+            levels_of('')
+
+    def test_phrases_stay_inside_a_line(self):
+        node = new_node('a')
+        node['text_lines'] = [
+            {'level': 'T1', 'content': 'the moon'},
+            {'level': 'T1', 'content': 'star light'},
+        ]
+        node['code_lines'] = [{'level': 'C1', 'content': 'moon.star()'}]
+        index = GnmlSearch([node])
+        self.equa(index.search('"moon star"', levels='T'), [])
+        self.equa([i for i, _ in index.search('"moon star"')], ['a'])
+        self.equa([i for i, _ in index.search('"star light"', levels='T1')], ['a'])
+        self.equa(index.search('"light star"'), [])
+        self.equa(index.search(''), [])
+
+    def test_bm25_prefers_frequent_terms_and_short_nodes(self):
+        lines = lambda *texts: [{'level': 'T1', 'content': t} for t in texts]
+        often, once, long = new_node('often'), new_node('once'), new_node('long')
+        often['text_lines'] = lines('moon moon moon sun')
+        once['text_lines'] = lines('moon sun sun sun')
+        long['text_lines'] = lines('moon sun sun sun', 'sun ' * 40)
+        rest = [new_node(f'pad{k}') for k in range(5)]
+        for node in rest:
+            node['text_lines'] = lines('truth')
+        index = GnmlSearch([long, once, often] + rest)
+        self.equa([i for i, _ in index.search('moon')], ['often', 'once', 'long'])
+
+    def test_matches_a_scan(self):
+        rng = Random(11)
+        nodes = [worded_node(rng, f'n{k}') for k in range(300)]
+        self.check(GnmlSearch(nodes), nodes, rng)
+
+    def test_updates_and_removes_match_a_fresh_index(self):
+        rng = Random(12)
+        nodes = {f'n{k}': worded_node(rng, f'n{k}') for k in range(150)}
+        index = GnmlSearch(nodes.values())
+        for _ in fuzz.churn(rng, index, nodes, worded_node, 200):
+            pass
+        self.check(index, list(nodes.values()), rng)
+
+        # scores depend on counts only -> same as built from scratch
+        fresh = GnmlSearch(nodes.values())
+        for query in ['moon', 'return x', '"star moon"', 'truth def sun']:
+            got = dict(index.search(query, limit=None))
+            want = dict(fresh.search(query, limit=None))
+            self.equa(got.keys(), want.keys())
+            for node_id in got:
+                self.asrt(abs(got[node_id] - want[node_id]) < 1e-9)
+
+    def test_save_and_load(self):
+        rng = Random(13)
+        nodes = [worded_node(rng, f'n{k}') for k in range(100)]
+        index = GnmlSearch(nodes)
+        index.remove('n5')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'kb.search')
+            index.save(path)
+            self.equa(os.listdir(tmp), ['kb.search'])
+            loaded = GnmlSearch.load(path)
+            for query in ['moon', '"return x"', 'star sun']:
+                self.equa(loaded.search(query, limit=None), index.search(query, limit=None))
+            self.asrt('n5' not in loaded)
+            loaded.update(nodes[5])
+            self.asrt('n5' in loaded)
+
+            with open(path, 'wb') as w:
+                w.write(b'junk')
+            with self.rais(ValueError):
+                GnmlSearch.load(path)
+
+    def test_errors(self):
+        for error, call in fuzz.misuse(GnmlSearch):
+            with self.rais(error):
+                call()
+        with self.rais(ValueError):
+            GnmlSearch([new_node('a')]).search('x', levels='Q')
+
+
+if __name__ == '__main__':
+    main(testRunner=Runner)
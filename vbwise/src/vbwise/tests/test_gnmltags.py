@@ -0,0 +1,85 @@
+"""
+    | teleorithm |
+"""
+from unittest import main, TestCase
+from klab.ututils import Spec, Runner
+
+from random import Random
+
+from vbwise.gnmllines import new_node
+from vbwise.gnmltags import GnmlTagIndex, natural
+
+import fuzz
+from fuzz import TAGS, tagged_node
+
+
+class test_gnml_tag_index(Spec):
+    def check(self, index, nodes):
+        """ every query kind against a scan of the node dicts """
+        live = list(nodes.values())
+        ids = lambda match: sorted(n['id'] for n in live if match(n))
+
+        for tag in TAGS + ['none']:
+            self.equa(sorted(index.tag(tag).ids()), ids(lambda n: tag in n['tags']))
+            self.equa(sorted((~index.tag(tag)).ids()), ids(lambda n: tag not in n['tags']))
+        self.equa(
+            sorted((index.tag('a') & index.tag('b') & index.meta('author', 'kDoSE')).ids()),
+            ids(lambda n: {'a', 'b'} <= set(n['tags']) and n['meta'].get('author') == 'kDoSE'),
+        )
+        self.equa(
+            sorted((index.tag('a') | index.tag('c') - index.tag('draft')).ids()),
+            ids(lambda n: 'a' in n['tags'] or ('c' in n['tags'] and 'draft' not in n['tags'])),
+        )
+        for prefix in ['k', 'kD', 'x', '', 'z']:
+            self.equa(
+                sorted(index.meta_prefix('author', prefix).ids()),
+                ids(lambda n: 'author' in n['meta'] and n['meta']['author'].startswith(prefix)),
+            )
+        for lo, hi in [('1.2', '1.10'), (None, '1.2.10'), ('1.2.9', None), ('0', '1')]:
+            def inside(n):
+                v = n['meta'].get('version')
+                return v is not None and (lo is None or natural(lo) <= natural(v)) \
+                    and (hi is None or natural(v) < natural(hi))
+            self.equa(sorted(index.meta_range('version', lo, hi).ids()), ids(inside))
+        self.equa(len(index.all()), len(live))
+        self.equa(len(index), len(live))
+
+    def test_natural_order(self):
+        self.asrt(natural('1.2.9') < natural('1.2.10') < natural('1.10'))
+        self.asrt(natural('0_9') < natural('1'))
+
+    def test_queries_match_a_scan(self):
+        rng = Random(9)
+        nodes = {f'n{k}': tagged_node(rng, f'n{k}') for k in range(300)}
+        self.check(GnmlTagIndex(nodes.values()), nodes)
+
+    def test_updates_and_removes_match_a_scan(self):
+        rng = Random(10)
+        nodes = {f'n{k}': tagged_node(rng, f'n{k}') for k in range(200)}
+        index = GnmlTagIndex(nodes.values())
+        for tag in TAGS:
+            index.tag(tag)  # dense -> cached, then patched
+        for step in fuzz.churn(rng, index, nodes, tagged_node, 260):
+            if step % 30 == 0:
+                with self.subt(step=step):
+                    self.check(index, nodes)
+        self.check(index, nodes)
+
+    def test_values_dropped_with_their_last_node(self):
+        node = new_node('only')
+        node['meta']['version'] = '7.1'
+        index = GnmlTagIndex([node])
+        index.remove('only')
+        self.equa(index.meta_range('version').ids(), [])
+        self.equa(index.meta_prefix('version', '7').ids(), [])
+        index.update(node)
+        self.equa(index.meta_range('version', '7').ids(), ['only'])
+
+    def test_errors(self):
+        for error, call in fuzz.misuse(GnmlTagIndex):
+            with self.rais(error):
+                call()
+
+
+if __name__ == '__main__':
+    main(testRunner=Runner)
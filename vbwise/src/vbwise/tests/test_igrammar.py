@@ -6,8 +6,11 @@ from parsimonious.grammar import Grammar
 from parsimonious.exceptions import ParseError
 
 from collections import OrderedDict
+from pathlib import Path
+from tempfile import TemporaryDirectory
 
-from vbwise.igrammar import IGrammar
+from vbwise import igrammar
+from vbwise.igrammar import IGrammar, compiled, artifact_path
 
 
 class test_calling_parsimonious_Grammar(Spec):
@@ -89,6 +92,56 @@ class test_calling_IGrammar_parse(Spec):
             node = self.grammar.parse(self.lousy_source)
 
 
+class test_calling_compiled(Spec):
+    def setUp(self):
+        self.definition = 'root = "23"  # test_calling_compiled'
+        self.lousy_def = 'root ! "23"'
+        self.tmp = TemporaryDirectory()
+        self.saved_dir = igrammar.ARTIFACT_DIR
+        igrammar.ARTIFACT_DIR = self.tmp.name
+        igrammar._compiled.pop(self.definition, None)
+
+    def tearDown(self):
+        igrammar._compiled.pop(self.definition, None)
+        igrammar.ARTIFACT_DIR = self.saved_dir
+        self.tmp.cleanup()
+
+    def test_returns_same_IGrammar_on_every_call(self):
+        grammar = compiled(self.definition)
+        self.asrt(isinstance(grammar, IGrammar))
+        self.asrt(compiled(self.definition) is grammar)
+
+    def test_writes_artifact_named_by_definition(self):
+        compiled(self.definition)
+        path = artifact_path(self.definition, self.tmp.name)
+        self.asrt(path.is_file())
+
+    def test_artifact_from_another_process_parses_the_same(self):
+        built = compiled(self.definition)
+        igrammar._compiled.pop(self.definition)  # as if a fresh process
+        loaded = compiled(self.definition)
+        self.asrt(loaded is not built)
+        self.equa(loaded.parse('23'), built.parse('23'))
+        with self.rais(ValueError):
+            loaded.parse('absent')
+
+    def test_broken_artifact_is_rebuilt(self):
+        path = artifact_path(self.definition, self.tmp.name)
+        path.write_bytes(b'not a pickle')
+        grammar = compiled(self.definition)
+        self.equa(grammar.parse('23').text, '23')
+        self.asrt(path.read_bytes() != b'not a pickle')
+
+    def test_without_ARTIFACT_DIR_writes_nothing(self):
+        igrammar.ARTIFACT_DIR = None
+        compiled(self.definition)
+        self.equa(list(Path(self.tmp.name).iterdir()), [])
+
+    def test_with_lousy_grammar_definition_raises_ValueError(self):
+        with self.rais(ValueError):
+            compiled(self.lousy_def)
+
+
 if __name__ == '__main__':
     main(testRunner=Runner)
 
@@ -4,6 +4,9 @@
 from unittest import main, TestCase
 from klab.ututils import Spec, Runner
 
+from multiprocessing import active_children
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from textwrap import dedent
 
 from vbwise import load
@@ -95,6 +98,62 @@ class test_load_gnml_string(Spec):
             ]
         )
 
+class test_load_gnml_dir(Spec):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        node = '### NODE\n--- id: {}\nT1> in {}\n### ENDNODE\n'
+        for k in range(6):
+            folder = self.root / f'part{k % 2}'
+            folder.mkdir(exist_ok=True)
+            ids = [f'n{k}.a', f'n{k}.b']
+            (folder / f'{k}.gnml').write_text(''.join(node.format(i, k) for i in ids))
+        (self.root / 'dup.gnml').write_text(node.format('n0.a', 'dup'))
+        (self.root / 'notes.txt').write_text('not gnml')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_pool_merges_like_one_process_in_path_order(self):
+        nodes, duplicates = load.gnml_dir(self.root, workers=3)
+        expected = []
+        for f in sorted(self.root.rglob('*.gnml')):
+            expected.extend(load.gnml_file(f))
+        self.equa(nodes, expected)
+        self.equa(load.gnml_dir(self.root, workers=1), (nodes, duplicates))
+
+    def test_iter_yields_every_file_once_as_batches_finish(self):
+        streamed = dict(load.iter_gnml_dir(self.root, workers=3))
+        files = sorted(self.root.rglob('*.gnml'))
+        self.equa(sorted(streamed), files)
+        for f in files:
+            self.equa(streamed[f], load.gnml_file(f))
+
+    def test_iter_stopped_early_leaves_no_pool_behind(self):
+        stream = load.iter_gnml_dir(self.root, workers=2)
+        f, nodes = next(stream)
+        stream.close()
+        self.asrt(f.suffix == '.gnml' and nodes)
+        self.equa(active_children(), [])  # workers joined, not left running
+
+    def test_duplicate_ids_name_their_files(self):
+        _, duplicates = load.gnml_dir(self.root, workers=2)
+        self.equa(duplicates, {
+            'n0.a': [str(self.root / 'dup.gnml'), str(self.root / 'part0' / '0.gnml')]
+        })
+
+    def test_bad_file_raises_ValueError_with_its_path(self):
+        bad = self.root / 'part1' / 'bad.gnml'
+        bad.write_text('stray\n')
+        with self.rais(ValueError) as caught:
+            load.gnml_dir(self.root, workers=2)
+        self.equa(caught.exception.args[1:], (0, str(bad)))
+
+    def test_empty_directory(self):
+        with TemporaryDirectory() as empty:
+            self.equa(load.gnml_dir(empty), ([], {}))
+
+
 class test_load_python_string(Spec):
     def setUp(self):
         self.s = dedent('''
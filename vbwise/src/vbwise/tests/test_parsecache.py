@@ -0,0 +1,121 @@
+"""
+    | teleorithm |
+"""
+from unittest import main, TestCase
+from klab.ututils import Spec, Runner
+
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from vbwise import load, parsecache
+from vbwise.gnmlgrammar import EXAMPLE_SOURCE
+from vbwise.tkmlgrammar import SOURCE
+
+
+class test_parse_cache(Spec):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.cache = self.dir / 'cache'
+        self.saved = parsecache.CACHE_DIR, parsecache.MAX_BYTES
+        parsecache.CACHE_DIR = self.cache
+        self.calls = 0
+
+    def tearDown(self):
+        parsecache.CACHE_DIR, parsecache.MAX_BYTES = self.saved
+        self.tmp.cleanup()
+
+    def parse(self, data):
+        self.calls += 1
+        return {'bytes': len(data)}
+
+    def file(self, name, text):
+        path = self.dir / name
+        path.write_text(text)
+        return path
+
+    def entries(self):
+        return sorted(self.cache.glob('*' + parsecache.SUFFIX))
+
+    def test_hit_skips_parsing(self):
+        path = self.file('a.txt', 'abc')
+        first = parsecache.cached(path, 'x', '1', self.parse)
+        second = parsecache.cached(path, 'x', '1', self.parse)
+        self.equa((first, second, self.calls), ({'bytes': 3}, {'bytes': 3}, 1))
+
+    def test_new_bytes_loader_or_version_miss(self):
+        path = self.file('a.txt', 'abc')
+        parsecache.cached(path, 'x', '1', self.parse)
+        parsecache.cached(path, 'y', '1', self.parse)
+        parsecache.cached(path, 'x', '2', self.parse)
+        path.write_text('abcd')
+        self.equa(parsecache.cached(path, 'x', '1', self.parse), {'bytes': 4})
+        self.equa((self.calls, len(self.entries())), (4, 4))
+
+    def test_off_by_default_writes_nothing(self):
+        parsecache.CACHE_DIR = None
+        path = self.file('a.txt', 'abc')
+        parsecache.cached(path, 'x', '1', self.parse)
+        parsecache.cached(path, 'x', '1', self.parse)
+        self.equa(self.calls, 2)
+        self.asrt(not self.cache.exists())
+
+    def test_broken_entry_is_parsed_and_rewritten(self):
+        path = self.file('a.txt', 'abc')
+        parsecache.cached(path, 'x', '1', self.parse)
+        self.entries()[0].write_bytes(b'\xff')
+        self.equa(parsecache.cached(path, 'x', '1', self.parse), {'bytes': 3})
+        self.equa(parsecache.cached(path, 'x', '1', self.parse), {'bytes': 3})
+        self.equa(self.calls, 2)
+
+    def test_least_recently_used_evicted_past_max_bytes(self):
+        paths = [self.file(f'{k}.txt', str(k)) for k in range(3)]
+        for k, path in enumerate(paths):
+            parsecache.cached(path, 'x', '1', self.parse)
+            entry = parsecache.entry_path(self.cache, 'x', '1', path.read_bytes())
+            os.utime(entry, ns=(k * 10**9, k * 10**9))
+        size = self.entries()[0].stat().st_size
+
+        parsecache.MAX_BYTES = 3 * size
+        parsecache.cached(paths[0], 'x', '1', self.parse)  # hit -> now newest
+        parsecache.cached(self.file('3.txt', '3'), 'x', '1', self.parse)
+
+        kept = {p.name for p in self.entries()}
+        first = parsecache.entry_path(self.cache, 'x', '1', b'0').name
+        second = parsecache.entry_path(self.cache, 'x', '1', b'1').name
+        self.equa(len(kept), 3)
+        self.asrt(first in kept and second not in kept)
+
+    def test_errors_and_unmarshallable_results_are_not_kept(self):
+        path = self.file('a.toml', 'when = 1979-05-27T07:32:00Z')
+        self.equa(load.toml_file(path)['when'].year, 1979)
+        self.equa(self.entries(), [])
+
+        with self.rais(ValueError):
+            load.tkml_file(self.file('bad.tkml', 'Block { key: }'))
+        self.equa(self.entries(), [])
+
+    def test_file_loaders_give_the_same_results_cold_and_warm(self):
+        cases = [
+            (load.tkml_file, self.file('a.tkml', SOURCE)),
+            (load.gnml_file, self.file('a.gnml', EXAMPLE_SOURCE)),
+            (load.toml_file, self.file('a.toml', '[t]\nk = "v"\nn = 1.5\n')),
+            (load.json_file, self.file('a.json', '{"k": [1, 2.5, null]}')),
+        ]
+        for loader, path in cases:
+            parsecache.CACHE_DIR = None
+            expected = loader(path)
+            parsecache.CACHE_DIR = self.cache
+            with self.subt(loader=loader.__name__):
+                self.equa(loader(path), expected)
+                self.equa(loader(path), expected)
+        self.equa(len(self.entries()), 4)
+
+        # engines are cached apart
+        self.equa(load.tkml_file(cases[0][1], engine='fast'), load.tkml_string(SOURCE))
+        self.equa(len(self.entries()), 5)
+
+
+if __name__ == '__main__':
+    main(testRunner=Runner)
@@ -3,6 +3,7 @@
 """
 from unittest import main, TestCase
 from klab.ututils import Spec, Runner
+from klab.sweep import geometric
 
 from parsimonious.nodes import Node
 from parsimonious.grammar import Grammar
@@ -40,6 +41,19 @@ class test_valid_strings_as_properties(Spec):
             node_qty = count_nodes(tree)
             self.equa(node_qty, 31)
 
+
+class test_node_iter_over_many_components(Spec):
+    @staticmethod
+    def tree(n):
+        rows = '\n'.join(f'Name{i} {{ prop: "x", other: 3 }}' for i in range(n))
+        return tkml_tree(f'Root {{\n{rows}\n}}')
+
+    def test_visits_every_node_once(self):
+        self.equa(count_nodes(self.tree(25)), 1315)
+
+    def test_time_grows_linearly(self):
+        self.scales(count_nodes, geometric(25, 400), 'n', setup=self.tree)
+
 if __name__ == '__main__':
     main(testRunner=Runner)
 
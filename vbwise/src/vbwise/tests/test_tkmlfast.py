@@ -0,0 +1,72 @@
+"""
+    | teleorithm |
+"""
+from unittest import main, TestCase
+from klab.ututils import Spec, Runner
+
+from vbwise import load
+from vbwise.strings import valid_strings
+from vbwise.tkmlfast import parse
+from vbwise.tkmlgrammar import SOURCE, tkml_tree
+from vbwise.tkmlvisitor import TKMLVisitor
+
+import fuzz
+
+
+def visited(source):
+    return TKMLVisitor().visit(tkml_tree(source))
+
+
+class test_fast_tkml_parser_against_TKMLVisitor(Spec):
+    def check(self, source):
+        # repr -> nan equals nan, and dict order counts
+        with self.subt(source=source):
+            self.equa(repr(fuzz.outcome(parse, source)),
+                      repr(fuzz.outcome(visited, source)))
+
+    def test_SOURCE_gives_identical_dicts(self):
+        self.equa(parse(SOURCE), TKMLVisitor().visit(tkml_tree(SOURCE)))
+
+    def test_every_valid_string_as_a_property(self):
+        for s in valid_strings:
+            self.check(f'Name {{ prop: {s} }}')
+
+    def test_non_string_block_types_merge_into_props(self):
+        self.check('Root { 0 { a: 1 } Frame { b: 2 } 1.5 {} }')
+
+    def test_color_then_text_is_a_comment(self):
+        self.check('Root { c: #AA1122x\n d: 1 }')
+        self.check('Root { c: #AA1122#note\n}')
+        self.check('Root { #AA1122 }')
+
+    def test_ascii_separators_follow_the_grammar(self):
+        self.check('Root {\x1c}')
+        self.check('Root { a: 1}')
+
+    def test_random_valid_sources(self):
+        for source in fuzz.valid(fuzz.tkml_source):
+            self.asrt(fuzz.outcome(visited, source) is not ValueError)
+            self.check(source)
+
+    def test_random_mutations_accepted_and_rejected_alike(self):
+        for source in fuzz.broken(fuzz.tkml_source, fuzz.TKML_ALPHABET, edits=3):
+            self.check(source)
+
+
+class test_load_tkml_string_engine(Spec):
+    def test_fast_engine_matches_default(self):
+        self.equa(load.tkml_string(SOURCE, engine='fast'),
+                  load.tkml_string(SOURCE))
+
+    def test_bad_source_raises_ValueError_with_offset(self):
+        with self.rais(ValueError) as caught:
+            load.tkml_string('Block { key: }', engine='fast')
+        self.equa(caught.exception.args[1], 13)
+
+    def test_unknown_engine_raises_ValueError(self):
+        with self.rais(ValueError):
+            load.tkml_string(SOURCE, engine='other')
+
+
+if __name__ == '__main__':
+    main(testRunner=Runner)
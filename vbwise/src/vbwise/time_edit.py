@@ -0,0 +1,43 @@
+"""
+    | teleorithm |
+
+    one keystroke in a growing gnml document -> edit vs parse
+
+    $ python time_edit.py
+"""
+from klab.ututils import best_ms
+
+from vbwise import gnmledit
+
+
+NODE = '''\
+### NODE
+--- id: kb.branch.{i}
+--- tags: tag1, tag2
+--- next: kb.branch.{n}
+T1> a truth about node {i}
+C1> def some_func(x):
+C1>     return x**{i}
+### ENDNODE
+
+'''
+
+for n in (1_000, 10_000, 100_000):
+    text = ''.join(NODE.format(i=i, n=i + 1) for i in range(n))
+    doc = gnmledit.GnmlDoc(text)
+    at = text.index(f'node {n // 2}\n') + len('node')
+
+    def keystroke():
+        doc.edit(at, 0, 'x')
+        doc.edit(at, 1, '')
+
+    full = best_ms(lambda: gnmledit.GnmlDoc(text[:at] + 'x' + text[at:]), repeat=3)
+    one = best_ms(keystroke) / 2
+    print(f'{n:>18,}      nodes')
+    print(f'{full:>18,.3f}      parse (ms)')
+    print(f'{one:>18,.3f}      edit (ms)')
+
+# parse grows with the document, edit does not
+#              1,000      nodes ->     16.4 ms vs 0.029 ms
+#             10,000      nodes ->    220.4 ms vs 0.033 ms
+#            100,000      nodes ->  2,917.0 ms vs 0.044 ms
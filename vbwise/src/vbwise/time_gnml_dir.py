@@ -0,0 +1,51 @@
+"""
+    | teleorithm |
+
+    many small gnml files -> gnml_dir throughput by worker count
+
+    $ python time_gnml_dir.py 2000      # files written to a temp dir
+"""
+import os
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from klab.lab import measure
+
+from vbwise import load
+
+
+NODE = '''\
+### NODE
+--- id: kb.f{f}.n{i}
+--- tags: tag1, tag2
+--- next: kb.f{f}.n{n}
+T1> a truth about node {i}
+C1> def some_func(x):
+C1>     return x**{i}
+### ENDNODE
+
+'''
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+cores = os.cpu_count()
+
+with TemporaryDirectory() as tmp:
+    for f in range(n):
+        folder = Path(tmp) / f'part{f % 20}'
+        folder.mkdir(exist_ok=True)
+        (folder / f'{f}.gnml').write_text(
+            ''.join(NODE.format(f=f, i=i, n=i + 1) for i in range(10))
+        )
+    print(f'{n:>18,}      files, {cores} cores')
+
+    for workers in sorted({1, 2, 4, cores}):
+        r = {'t_python_ms': 0, 'peak_mem_MiB': 0}
+        with measure(r):
+            nodes, _ = load.gnml_dir(tmp, workers=workers)
+        print(f'{n / r["t_python_ms"] * 1000:>18,.0f}      files per second, {workers} workers')
+
+# 2,000 files on a 1 core machine -> 226, 164, 203 files per second
+# for 1, 2, 4 workers, within run to run noise of each other
+# -> no speedup possible there, the pool costs little on top
+# parsing is per file with no shared state -> expect ~linear in cores
@@ -0,0 +1,109 @@
+"""
+    | teleorithm |
+
+    GnmlSearch over 100k nodes vs a scan of the node dicts, reopen vs rebuild
+
+    $ python time_gnmlsearch.py 100000
+"""
+import os
+import sys
+import tempfile
+from functools import cache
+from itertools import accumulate
+from random import Random
+
+from klab.lab import measure
+from klab.sweep import geometric, print_fit, sweep
+from klab.ututils import best_ms
+
+from vbwise.gnmllines import new_node
+from vbwise.gnmlsearch import GnmlSearch, tokens
+
+
+vocabulary = [f'w{k}' for k in range(20_000)]
+weights = list(accumulate(1 / (k + 1) for k in range(len(vocabulary))))  # zipf-ish
+
+
+def worded(rng, i):
+    node = new_node(f'kb.n{i}')
+    for level in ['T1', 'T2', 'T3']:
+        words = rng.choices(vocabulary, cum_weights=weights, k=8)
+        node['text_lines'].append({'level': level, 'content': ' '.join(words)})
+    words = rng.choices(vocabulary, cum_weights=weights, k=6)
+    node['code_lines'].append({'level': 'C1', 'content': '(' + ', '.join(words) + ')'})
+    return node
+
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+rng = Random(0)
+nodes = [worded(rng, i) for i in range(n)]
+print(f'{n:>18,}      nodes')
+
+r = {'t_python_ms': 0, 'peak_mem_MiB': 0}
+with measure(r):
+    index = GnmlSearch(nodes)
+print(f'{r["t_python_ms"]:>18,.1f}      build (ms)')
+print(f'{r["peak_mem_MiB"]:>18,.1f}      build peak (MiB)')
+
+
+def scan(words):
+    return [
+        node['id'] for node in nodes
+        if all(
+            w in {t for line in node['text_lines'] + node['code_lines']
+                  for t in tokens(line['content'])}
+            for w in words
+        )
+    ]
+
+
+print(f'{best_ms(lambda: scan(["w0", "w900"]), repeat=1):>18,.1f}      w0 w900, scan (ms)')
+print(f'{best_ms(lambda: index.search("w0 w900")):>18,.3f}      same, ranked (ms)')
+print(f'{best_ms(lambda: index.search("w0 w1")):>18,.3f}      w0 w1, both common (ms)')
+print(f'{best_ms(lambda: index.search("w3 w900", levels="C")):>18,.3f}      w3 w900, code only (ms)')
+print(f'{best_ms(lambda: index.search(chr(34) + "w0 w1" + chr(34))):>18,.3f}      "w0 w1" phrase (ms)')
+
+node = new_node('kb.n7')
+node['text_lines'] = [{'level': 'T1', 'content': 'an edited line'}]
+print(f'{best_ms(lambda: index.update(node)):>18,.3f}      update one node (ms)')
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, 'kb.search')
+    print(f'{best_ms(lambda: index.save(path), repeat=1):>18,.1f}      save (ms)')
+    print(f'{os.path.getsize(path) / 2**20:>18,.1f}      on disk (MiB)')
+    print(f'{best_ms(lambda: GnmlSearch.load(path), repeat=1):>18,.1f}      load (ms)')
+
+
+
+@cache
+def with_rare_term(n):
+    # built once per size -> sweep times the query only
+    rng = Random(n)
+    nodes = [worded(rng, i) for i in range(n)]
+    nodes[n // 2]['text_lines'].append({'level': 'T1', 'content': 'zebra w0'})
+    return GnmlSearch(nodes)
+
+
+def queries(index):
+    for _ in range(100):
+        index.search('zebra w0')  # w0 -> in most nodes
+
+
+# rarest term first -> common term looked up per candidate only
+print()
+print_fit(sweep(with_rare_term, queries, geometric(2_000, 128_000, 4)))
+
+# 100k nodes, 3 text lines of 8 words and 1 code line each, zipf words, slow vm ->
+#            5,670.2      build (ms)
+#              649.0      build peak (MiB)
+#            3,747.1      w0 w900, scan (ms)
+#              0.421      same, ranked (ms)
+#            176.000      w0 w1, both common (ms)  -> every node a candidate
+#              0.267      w3 w900, code only (ms)
+#            476.902      "w0 w1" phrase (ms)
+#              0.006      update one node (ms)
+#              866.9      save (ms)
+#               51.5      on disk (MiB)
+#            1,548.2      load (ms)  -> marshal.load on the file: 9.6 s
+# sweep, 100 rare term queries, 2k - 128k nodes ->
+#     0.858 ms .. 1.506 ms, exponent 0.16 -> near flat, w0 postings not scanned
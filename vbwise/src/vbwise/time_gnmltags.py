@@ -0,0 +1,89 @@
+"""
+    | teleorithm |
+
+    GnmlTagIndex queries over 1M nodes vs a scan of the node dicts
+
+    $ python time_gnmltags.py 1000000
+"""
+import sys
+from functools import cache
+from random import Random
+
+from klab.lab import measure
+from klab.sweep import geometric, print_fit, sweep
+from klab.ututils import best_ms
+
+from vbwise.gnmllines import new_node
+from vbwise.gnmltags import GnmlTagIndex
+
+
+def tagged(rng, i):
+    node = new_node(f'kb.n{i}')
+    node['tags'] = rng.sample(['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h'], 3)
+    node['meta'] = {
+        'author': rng.choice(['kDoSE', 'kdose2', 'other', 'someone']),
+        'version': f'1.{rng.randrange(40)}.{rng.randrange(40)}',
+    }
+    return node
+
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+rng = Random(0)
+nodes = [tagged(rng, i) for i in range(n)]
+print(f'{n:>18,}      nodes')
+
+r = {'t_python_ms': 0, 'peak_mem_MiB': 0}
+with measure(r):
+    index = GnmlTagIndex(nodes)
+print(f'{r["t_python_ms"]:>18,.1f}      build (ms)')
+
+a_and_b = lambda: index.tag('a') & index.tag('b') & index.meta('author', 'kDoSE')
+a_and_b()  # first use builds and caches the dense bitmaps
+
+scan = best_ms(lambda: [
+    node['id'] for node in nodes
+    if 'a' in node['tags'] and 'b' in node['tags'] and node['meta']['author'] == 'kDoSE'
+], repeat=1)
+print(f'{scan:>18,.1f}      a AND b AND author=kDoSE, scan (ms)')
+print(f'{best_ms(lambda: len(a_and_b())):>18,.3f}      same, count (ms)')
+print(f'{best_ms(lambda: a_and_b().ids()):>18,.3f}      same, ids (ms)')
+print(f'{best_ms(lambda: len(~index.tag("a") | index.tag("h"))):>18,.3f}      NOT a OR h, count (ms)')
+print(f'{best_ms(lambda: len(index.meta_prefix("author", "kD"))):>18,.3f}      author prefix kD (ms)')
+print(f'{best_ms(lambda: len(index.meta_range("version", "1.10", "1.12"))):>18,.3f}      version range (ms)')
+
+hits = a_and_b().ids()
+node = nodes[int(hits[0].split('n')[-1])]
+node['tags'] = ['c']
+print(f'{best_ms(lambda: index.update(node)):>18,.3f}      update one node (ms)')
+
+
+
+@cache
+def dense(n):
+    # built once per size -> sweep times the query only
+    rng = Random(n)
+    index = GnmlTagIndex(tagged(rng, i) for i in range(n))
+    index.tag('a'), index.tag('b'), index.meta('author', 'kDoSE')
+    return index
+
+
+def queries(index):
+    for _ in range(100):
+        len(index.tag('a') & index.tag('b') & ~index.meta('author', 'kDoSE'))
+
+
+# bitmap words -> n / 64, no per node python work
+print()
+print_fit(sweep(dense, queries, geometric(4_000, 256_000, 4)))
+
+# 1M nodes, 3 tags and 2 meta each, slow vm ->
+#            4,596.2      build (ms)
+#              136.7      a AND b AND author=kDoSE, scan (ms)
+#              0.083      same, count (ms)
+#             24.090      same, ids (ms)    -> spelling out 1M bits
+#              0.137      NOT a OR h, count (ms)
+#              0.302      author prefix kD (ms)
+#             13.914      version range (ms) -> 80 sparse values
+#              0.019      update one node (ms)
+# sweep, 100 dense queries, 4k - 256k nodes ->
+#     0.256 ms .. 5.730 ms, exponent 0.73 -> bitmap words, below linear
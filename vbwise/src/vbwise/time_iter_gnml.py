@@ -0,0 +1,69 @@
+"""
+    | teleorithm |
+
+    iter_gnml memory stays flat while the knowledge base grows
+
+    $ python time_iter_gnml.py 2        # GiB written to a temp dir, then read
+
+    peak memory is the process peak -> read sizes smallest first
+"""
+import os
+import sys
+from tempfile import TemporaryDirectory
+
+from klab.lab import measure
+
+from vbwise import load
+
+
+NODE = '''\
+### NODE
+--- id: kb.branch.{i}
+--- meta: author=kDoSE, version=0_2_{i}
+--- tags: tag1, tag2, tag3
+--- next: kb.branch.{n}
+T1> a truth about node {i}
+T3> between two lies
+C1> def some_func(x):
+C1>     return x**{i}
+### ENDNODE
+
+'''
+
+
+def write_kb(path, size):
+    """ at least size bytes of distinct nodes, written a chunk at a time """
+    i = 0
+    written = 0
+    with open(path, 'wt') as w:
+        while written < size:
+            chunk = ''.join(NODE.format(i=k, n=k + 1) for k in range(i, i + 10_000))
+            w.write(chunk)
+            written += len(chunk)
+            i += 10_000
+    return i
+
+
+gib = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+
+with TemporaryDirectory() as tmp:
+    for size in (gib / 16, gib / 4, gib):
+        path = os.path.join(tmp, f'kb-{size:g}.gnml')
+        nodes = write_kb(path, int(size * 2**30))
+        print(f'{os.path.getsize(path) / 2**20:>18,.0f}      file (MiB), {nodes:,} nodes')
+
+        r = {'t_python_ms': 0, 'peak_mem_MiB': 0}
+        with measure(r):
+            seen = sum(1 for _ in load.iter_gnml(path))
+        assert seen == nodes
+        mib_s = os.path.getsize(path) / 2**20 / (r['t_python_ms'] / 1000)
+        print(f'{r["peak_mem_MiB"]:>18,}      peak memory (MiB), {mib_s:,.1f} MiB/s')
+        os.remove(path)
+
+# 2 GiB ->
+#                129      file (MiB), 560,000 nodes
+#                 34      peak memory (MiB), 9.5 MiB/s
+#                513      file (MiB), 2,200,000 nodes
+#                 34      peak memory (MiB), 14.6 MiB/s
+#              2,049      file (MiB), 8,720,000 nodes
+#                 34      peak memory (MiB), 10.0 MiB/s
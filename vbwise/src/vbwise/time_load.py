@@ -0,0 +1,79 @@
+"""
+    | teleorithm |
+
+    parse throughput for many small tkml snippets
+
+    $ python time_load.py
+"""
+import tempfile
+
+from klab.lab import measure
+
+from vbwise import igrammar, load
+from vbwise.igrammar import IGrammar
+from vbwise.strings import valid_strings
+from vbwise.tkmlgrammar import SOURCE, TKML_GRAMMAR
+from vbwise.tkmlvisitor import TKMLVisitor
+
+
+n = 2_000
+shapes = [
+    'Label {{ text: {s} }}',
+    'Button {{ text: {s}, width: 12 }}',
+    'Frame {{ Label {{ text: {s} }} grid: {{ row: 0, column: 1 }} }}',
+]
+snippets = [
+    shape.format(s=s)
+    for shape in shapes
+    for s in valid_strings
+]
+snippets = (snippets * (n // len(snippets) + 1))[:n]
+print(f'n = {n} snippets')
+
+# n 2_000 -> ~200 per second, grammar rebuilt per parse as tkml_tree did
+r = {'t_python_ms': 0, 'peak_mem_MiB': 0}
+with measure(r):
+    for s in snippets:
+        TKMLVisitor().visit(IGrammar(TKML_GRAMMAR).parse(s))
+print(f'{n / r["t_python_ms"] * 1000:>18,.0f}      snippets per second, rebuilt')
+
+# n 2_000 -> ~2,800 to 4,300 per second, process-wide compiled grammar
+load.tkml_string(snippets[0])
+r = {'t_python_ms': 0, 'peak_mem_MiB': 0}
+with measure(r):
+    for s in snippets:
+        load.tkml_string(s)
+print(f'{n / r["t_python_ms"] * 1000:>18,.0f}      snippets per second, compiled')
+
+# n 2_000 -> ~35,000 per second
+# hand-written tokenizer and recursive descent, no Node tree
+r = {'t_python_ms': 0, 'peak_mem_MiB': 0}
+with measure(r):
+    for s in snippets:
+        load.tkml_string(s, engine='fast')
+print(f'{n / r["t_python_ms"] * 1000:>18,.0f}      snippets per second, fast')
+
+# whole SOURCE example, 1_000 times each -> 2,288 ms vs 241 ms
+r = {'t_python_ms': 0, 'peak_mem_MiB': 0}
+with measure(r):
+    for _ in range(1_000):
+        load.tkml_string(SOURCE)
+print(f'{r["t_python_ms"]:>18,.1f}      SOURCE x 1000, parsimonious (ms)')
+
+r = {'t_python_ms': 0, 'peak_mem_MiB': 0}
+with measure(r):
+    for _ in range(1_000):
+        load.tkml_string(SOURCE, engine='fast')
+print(f'{r["t_python_ms"]:>18,.1f}      SOURCE x 1000, fast (ms)')
+
+# cold start -> first grammar in a fresh process
+# 6.0 ms built from the definition
+with measure():
+    IGrammar(TKML_GRAMMAR)
+
+# 0.4 ms from the pickled artifact
+with tempfile.TemporaryDirectory() as tmp:
+    path = igrammar.artifact_path(TKML_GRAMMAR, tmp)
+    igrammar.save(IGrammar(TKML_GRAMMAR), path)
+    with measure():
+        igrammar.load(path)
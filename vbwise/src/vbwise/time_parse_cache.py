@@ -0,0 +1,75 @@
+"""
+    | teleorithm |
+
+    wisp22 demo spec loaded at startup -> cold vs warm parse cache
+
+    $ python time_parse_cache.py
+
+    each run is a fresh process -> imports plus the three *_file loads
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from vbwise.wisp22 import json_state, tkml_source_for_reference, toml_source
+
+
+CHILD = '''
+import sys
+from time import perf_counter
+
+start = perf_counter()
+from vbwise import load
+imported = perf_counter()
+load.tkml_file(sys.argv[1] + '/app.tkml')
+load.toml_file(sys.argv[1] + '/app.toml')
+load.json_file(sys.argv[1] + '/state.json')
+done = perf_counter()
+print((imported - start) * 1000, (done - imported) * 1000)
+'''
+
+
+def startup(spec_dir, cache_dir):
+    env = dict(os.environ)
+    env.pop('VBWISE_PARSE_CACHE', None)
+    env.pop('VBWISE_GRAMMAR_CACHE', None)  # grammars built in process each run
+    if cache_dir is not None:
+        env['VBWISE_PARSE_CACHE'] = str(cache_dir)
+    out = subprocess.run(
+        [sys.executable, '-c', CHILD, str(spec_dir)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return [float(x) for x in out.split()]
+
+
+def best(runs):
+    return [min(column) for column in zip(*runs)]
+
+
+with TemporaryDirectory() as tmp:
+    tmp = Path(tmp)
+    (tmp / 'app.tkml').write_text(tkml_source_for_reference)
+    (tmp / 'app.toml').write_text(toml_source)
+    (tmp / 'state.json').write_text(json_state)
+
+    startup(tmp, None)  # warm up -> .pyc files and page cache, nothing written
+
+    off = best([startup(tmp, None) for _ in range(5)])
+    cold = []
+    for k in range(5):
+        cold.append(startup(tmp, tmp / f'cold{k}'))
+    cold = best(cold)
+    warm = best([startup(tmp, tmp / 'cold0') for _ in range(5)])
+
+    for label, (imp, loads) in [('no cache', off), ('cold', cold), ('warm', warm)]:
+        print(f'{loads:>18,.2f}      {label}, loading the spec (ms)')
+        print(f'{imp:>18,.2f}      {label}, importing vbwise.load (ms)')
+
+# best of 5 ->
+#              15.59      no cache, loading the spec (ms)
+#              22.48      cold, loading the spec (ms)    parse + write
+#               4.72      warm, loading the spec (ms)    read back, no grammar built
+#             ~85         importing vbwise.load (ms), any run
+# -> import of parsimonious and the grammars now dominates startup
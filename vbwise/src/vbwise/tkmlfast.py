@@ -0,0 +1,203 @@
+"""
+    | teleorithm |
+
+    tkml source -> component dicts, no Node tree in between
+
+    USAGE
+    ---------
+    d = parse(source)
+    d -> {'type': 'Block', 'props': {...}, 'parts': [...]}
+
+    OR
+
+    load.tkml_string(source, engine='fast')
+    ---------
+    same language as TKML_GRAMMAR, same output as TKMLVisitor
+        identifiers -> int, else float, else str (block types and keys too)
+        strings -> quotes dropped, \\" or \\' then \\\\ unescaped
+        comment -> # not followed by a color and a delimiter
+
+    one regex splits the source into tokens, whitespace and comments dropped
+    recursive descent over the tokens builds the dicts directly
+
+    _ in the grammar sits between every pair of tokens
+    and token first chars never overlap -> tokens need no context
+    bad source -> ValueError with the offset, like IGrammar.parse
+"""
+import re
+from importlib.util import find_spec
+
+# parsimonious matches with regex when installed -> found, not imported
+if find_spec('regex') is None:
+    WS = r'\s'
+else:
+    WS = r'[^\S\x1c-\x1f]'  # regex \s leaves out ascii separators 1c to 1f
+
+
+TOKEN = re.compile('|'.join([
+    rf'(?P<ws>{WS}+)',
+    rf'(?P<comment>#(?![a-fA-F0-9]{{6}}(?:$|{WS}|,|\}}|#))[^\n]*)',
+    r'(?P<punct>[{}:,])',
+    r'(?P<string>"(?:[^"\\]|\\.)*"|' + r"'(?:[^'\\]|\\.)*')",
+    r'(?P<color>#[a-fA-F0-9]{6})',
+    r'(?P<identifier>[a-zA-Z0-9_<>-]+(?:\.[a-zA-Z0-9_<>.-]+)*)',
+    r'(?P<bad>[\s\S])',
+]))
+
+END = ('end', '')
+
+
+def tokens(source):
+    """
+        source
+            : str
+
+        returns
+            > list[tuple]
+            > (kind, text, offset) -> kind is the punct char itself for { } : ,
+            > ends with ('end', '', len(source))
+
+        raises
+            ! ValueError
+    """
+    out = []
+    for m in TOKEN.finditer(source):
+        kind = m.lastgroup
+        if kind == 'ws' or kind == 'comment':
+            continue
+        if kind == 'bad':
+            raise ValueError('no valid path for this source', m.start())
+        text = m.group()
+        out.append((text if kind == 'punct' else kind, text, m.start()))
+    out.append(('end', '', len(source)))
+    return out
+
+
+def identifier(t):
+    """ int, else float, else the text -> as TKMLVisitor.visit_identifier """
+    try:
+        return int(t)
+    except ValueError:
+        pass
+    try:
+        return float(t)
+    except ValueError:
+        return t
+
+
+def string(t):
+    """ quotes dropped, escapes undone -> as TKMLVisitor.visit_string """
+    if t[0] == '"':
+        return t[1:-1].replace(r'\"', '"').replace(r'\\', '\\')
+    return t[1:-1].replace(r"\'", "'").replace(r'\\', '\\')
+
+
+class _Parser:
+    def __init__(self, source):
+        self.toks = tokens(source)
+        self.i = 0
+
+    def fail(self):
+        raise ValueError('no valid path for this source', self.toks[self.i][2])
+
+    def expect(self, kind):
+        tok = self.toks[self.i]
+        if tok[0] != kind:
+            self.fail()
+        self.i += 1
+        return tok[1]
+
+    def tkml(self):
+        block = self.block()
+        if self.toks[self.i][0] != 'end':
+            self.fail()
+        return block
+
+    def block(self):
+        # block = identifier _ LBRACE _ block_member_list _ RBRACE
+        block_type = identifier(self.expect('identifier'))
+        self.expect('{')
+        toks = self.toks
+        props = {}
+        parts = []
+        while toks[self.i][0] == 'identifier':
+            after = toks[self.i + 1][0]
+            if after == '{':
+                member = self.block()
+                if isinstance(member['type'], str):
+                    parts.append(member)
+                else:
+                    props.update(member)
+            elif after == ':':
+                key = identifier(toks[self.i][1])
+                self.i += 2
+                props[key] = self.value()
+            else:
+                self.i += 1
+                self.fail()
+            if toks[self.i][0] == ',':
+                self.i += 1
+        self.expect('}')
+        return {'type': block_type, 'props': props, 'parts': parts}
+
+    def value(self):
+        # value = prop_group / identifier / string / color
+        kind, text, _ = self.toks[self.i]
+        self.i += 1
+        if kind == 'identifier':
+            return identifier(text)
+        if kind == 'string':
+            return string(text)
+        if kind == 'color':
+            return text
+        if kind == '{':
+            return self.prop_group()
+        self.i -= 1
+        self.fail()
+
+    def prop_group(self):
+        # prop_group = LBRACE _ prop_entry_list _ RBRACE, LBRACE taken
+        toks = self.toks
+        group = {}
+        while toks[self.i][0] == 'identifier':
+            key = identifier(toks[self.i][1])
+            self.i += 1
+            self.expect(':')
+            group[key] = self.value()
+            if toks[self.i][0] == ',':
+                self.i += 1
+        self.expect('}')
+        return group
+
+
+def parse(source):
+    """
+        source
+            : str
+            : tkml-compliant source text
+
+        returns
+            > dict
+            > root component, equal to TKMLVisitor().visit(tkml_tree(source))
+
+        raises
+            ! ValueError
+    """
+    return _Parser(source).tkml()
+
+
+if __name__ == '__main__':
+    from vbwise.tkmlgrammar import SOURCE, tkml_tree
+    from vbwise.tkmlvisitor import TKMLVisitor
+
+    assert parse(SOURCE) == TKMLVisitor().visit(tkml_tree(SOURCE))
+    assert parse('0 { 1 { x: 2 } }') == {
+        'type': 0, 'props': {'type': 1, 'props': {'x': 2}, 'parts': []},
+        'parts': []
+    }
+    try:
+        parse('Block { key: }')
+    except ValueError as e:
+        assert e.args[1] == 13
+    else:
+        raise AssertionError('accepted bad source')
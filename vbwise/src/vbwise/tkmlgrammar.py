@@ -6,7 +6,7 @@
 from parsimonious.grammar import Grammar
 from parsimonious.nodes import Node
 
-from vbwise.igrammar import IGrammar
+from vbwise.igrammar import IGrammar, compiled
 
 
 TKML_GRAMMAR = r"""
@@ -83,7 +83,7 @@ def tkml_tree(source):
             ! ValueError
 
     """
-    tree = IGrammar(TKML_GRAMMAR).parse(source)
+    tree = compiled(TKML_GRAMMAR).parse(source)
     return tree
 
 
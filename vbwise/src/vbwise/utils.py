@@ -17,12 +17,15 @@ def node_iter(root):
     stack = []
     stack.append(root)
     found = []
+    # ids, not Node.__eq__ -> that compares whole subtrees, quadratic overall
+    seen = set()
 
     while len(stack) > 0:
         node = stack.pop()
         if isinstance(node, Node):
             found.append(node)
-            stack.extend(n for n in node.children if not n in found)
+            seen.add(id(node))
+            stack.extend(n for n in node.children if id(n) not in seen)
 
     yield from found
 